@@ -0,0 +1,23 @@
+# analysis/_njit.py
+"""
+Optional Numba JIT support for numeric kernels.
+
+Exposes ``njit`` from Numba when it is installed; otherwise a no-op
+decorator so the decorated functions run as plain Python/NumPy.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable with or without arguments"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -2,6 +2,7 @@
 Abstract Exchange Interface
 """
 
+import uuid
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 
@@ -9,6 +10,9 @@ class TradeResult:
     """
     Result of a trade execution
     """
+    __slots__ = ('trade_id', 'symbol', 'side', 'price', 'quantity', 'timestamp',
+                 'success', 'message')
+    
     def __init__(self, trade_id: str, symbol: str, side: str, price: float, 
                  quantity: float, timestamp: int, success: bool, message: str = None):
         self.trade_id = trade_id
@@ -24,9 +28,13 @@ class TradingSignal:
     """
     Trading signal generated by a strategy
     """
+    __slots__ = ('symbol', 'side', 'quantity', 'price', 'take_profit', 'stop_loss',
+                 'signal_type', 'timeframe', 'client_order_id')
+    
     def __init__(self, symbol: str, side: str, quantity: float, price: Optional[float] = None,
                  take_profit: Optional[float] = None, stop_loss: Optional[float] = None,
-                 signal_type: str = "market", timeframe: str = "1h"):
+                 signal_type: str = "market", timeframe: str = "1h",
+                 client_order_id: Optional[str] = None):
         self.symbol = symbol
         self.side = side
         self.quantity = quantity
@@ -35,11 +43,14 @@ class TradingSignal:
         self.stop_loss = stop_loss
         self.signal_type = signal_type
         self.timeframe = timeframe
+        # Fixed for the signal's lifetime, so every submission of it is the same order
+        self.client_order_id = client_order_id or uuid.uuid4().hex
 
 class AbstractExchange(ABC):
     """
     Abstract exchange interface that all exchange implementations must follow
     """
+    __slots__ = ()
     
     @abstractmethod
     def initialize(self) -> bool:
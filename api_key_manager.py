@@ -20,6 +20,8 @@ class APIKeyManager:
         self.db = db
         self.encryption = encryption if encryption else Encryption()
         self.logger = logger
+        # Set by the application so key changes drop cached exchange instances
+        self.exchange_helper = None
         
     def add_api_keys(self, user_id: int, exchange: str, api_key: str, api_secret: str) -> bool:
         """
@@ -50,6 +52,9 @@ class APIKeyManager:
                 api_secret=encrypted_secret
             )
             
+            if result and self.exchange_helper:
+                self.exchange_helper.invalidate(user_id)
+            
             return result
         except Exception as e:
             logger.error(f"Failed to add API keys for user {user_id}: {str(e)}")
@@ -104,6 +109,9 @@ class APIKeyManager:
             # Delete keys
             result = user_repo.delete_api_keys(user_id, exchange)
             
+            if result and self.exchange_helper:
+                self.exchange_helper.invalidate(user_id)
+            
             return result
         except Exception as e:
             logger.error(f"Failed to delete API keys for user {user_id}: {str(e)}")
@@ -1,6 +1,6 @@
 import logging
 import uuid
-from typing import Optional
+from typing import Optional, Tuple
 from database.models.api_key import ApiKey
 from database.models.user import User
 
@@ -19,6 +19,8 @@ class ApiKeyRepository:
         """
         self.db = db_manager
         self.encryption = encryption_service
+        # Set by the application so key changes drop cached exchange instances
+        self.exchange_helper = None
         
     def save_api_key(self, user_id: int, exchange: str, api_key: str, api_secret: str) -> Optional[str]:
         """
@@ -64,6 +66,9 @@ class ApiKeyRepository:
                 user.api_key_id = key_id
                 session.commit()
                 
+            if self.exchange_helper:
+                self.exchange_helper.invalidate(user_id)
+                
             logger.info(f"API key saved for user {user_id}, exchange {exchange}")
             return key_id
         except Exception as e:
@@ -104,6 +109,26 @@ class ApiKeyRepository:
         finally:
             session.close()
             
+    def decrypt_credentials(self, encrypted_api_key: str, encrypted_api_secret: str) -> Optional[Tuple[str, str]]:
+        """
+        Decrypt an API key and secret fetched outside this repository
+        
+        Args:
+            encrypted_api_key: Encrypted API key
+            encrypted_api_secret: Encrypted API secret
+            
+        Returns:
+            Tuple of (api_key, api_secret) or None if decryption fails
+        """
+        try:
+            return (
+                self.encryption.decrypt(encrypted_api_key),
+                self.encryption.decrypt(encrypted_api_secret)
+            )
+        except Exception as e:
+            logger.error(f"Error decrypting API key: {str(e)}")
+            return None
+            
     def get_user_api_keys(self, user_id: int) -> list:
         """
         Get all API keys for a user
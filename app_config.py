@@ -9,6 +9,9 @@ from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Cached result of a get() for a key that is not configured
+_MISSING = object()
+
 class AppConfig:
     """
     Application configuration
@@ -30,6 +33,8 @@ class AppConfig:
     def __init__(self, config_file=None):
         self.config = {}
         self.config_file = config_file
+        # Dot-notation key -> resolved value, cleared whenever the config changes
+        self._cache: Dict[str, Any] = {}
         
         # Load configuration
         self._load_config()
@@ -41,6 +46,8 @@ class AppConfig:
         """
         Load configuration from file and environment
         """
+        self._cache.clear()
+        
         # Default configuration
         self.config = {
             "app": {
@@ -98,6 +105,9 @@ class AppConfig:
         
         # Validate admin wallet configuration
         self._validate_admin_wallet()
+        
+        # Lookups made while loading may have cached intermediate values
+        self._cache.clear()
     
     def _validate_admin_wallet(self):
         """
@@ -131,6 +141,7 @@ class AppConfig:
             
         # Set the value
         config[parts[-1]] = value
+        self._cache.clear()
     
     def _merge_config(self, target, source):
         """
@@ -218,14 +229,30 @@ class AppConfig:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING and key not in self._cache:
+            value = self._lookup(key)
+            self._cache[key] = value
+        
+        return default if value is _MISSING else value
+    
+    def _lookup(self, key):
+        """
+        Walk the configuration tree for a key
+        
+        Args:
+            key: Configuration key (dot notation)
+            
+        Returns:
+            Configuration value, or _MISSING if the key is not configured
+        """
         value = self.config
         
-        for k in keys:
+        for k in key.split('.'):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
-                return default
+                return _MISSING
                 
         return value
     
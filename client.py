@@ -7,11 +7,20 @@ import time
 import hmac
 import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Any
-import json
 import uuid
+from urllib.parse import urlencode
 import websocket
 import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback exposes the same loads()
+    import json as orjson
 
 from exchange.abstract_exchange import AbstractExchange, TradeResult, TradingSignal
 from security.api_key_manager import ApiKeyManager
@@ -19,30 +28,111 @@ from services.user_trading_manager import UserTradingManager
 
 logger = logging.getLogger(__name__)
 
+# Column layout of a Binance kline row (the trailing "ignore" field is dropped)
+KLINE_DTYPE = np.dtype([
+    ('timestamp', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+    ('close_time', 'i8'),
+    ('quote_volume', 'f8'),
+    ('trades', 'i8'),
+    ('taker_buy_base', 'f8'),
+    ('taker_buy_quote', 'f8')
+])
+KLINE_FIELDS = len(KLINE_DTYPE.names)
+
+# One process-wide pool for issuing independent REST calls concurrently
+# (e.g. balance + price in calculate_position_size), shared by all instances
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="binance_io")
+
 class BinanceExchange(AbstractExchange):
     """
     Binance Exchange API implementation
     """
+    __slots__ = ('api_key', 'api_secret', 'user', 'db', '_hmac_template', 'session',
+                 '_headers', '_form_headers',
+                 '_price_cache', '_balance_cache', 'ws', 'ws_thread', '_ws_closed', '_ws_request_id',
+                 '_ws_callback', '_ws_batch', 'running', 'initialized', 'logger')
     
     BASE_URL = "https://api.binance.com"
     BASE_URL_V3 = "https://api.binance.com/api/v3"
-    WS_URL = "wss://stream.binance.com:9443/ws"
     
-    def __init__(self, api_key: str, api_secret: str, user=None, db=None):
+    # Absolute URLs for the fixed set of REST paths, built once at class load
+    _PATHS = ('/api/v3/account', '/api/v3/order', '/api/v3/openOrders',
+              '/api/v3/ticker/price', '/api/v3/depth', '/api/v3/klines')
+    _ENDPOINTS = dict(zip(_PATHS, map(BASE_URL.__add__, _PATHS)))
+    WS_URL = "wss://stream.binance.com:9443"
+    
+    # Pre-encoded signed bodies are plain strings, so their type must be stated
+    FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+    
+    # Batched WebSocket delivery: flush after this many frames or seconds
+    WS_BATCH_SIZE = 64
+    WS_BATCH_INTERVAL = 0.010
+    # How often an idle batch flusher rechecks whether the stream has stopped
+    WS_IDLE_POLL = 1.0
+    
+    # Short-lived REST response caches (seconds)
+    PRICE_CACHE_TTL = 0.25
+    BALANCE_CACHE_TTL = 2.0
+    
+    def __init__(self, api_key: str, api_secret: str, user=None, db=None,
+                 session: Optional[requests.Session] = None):
         self.api_key = api_key
         self.api_secret = api_secret
         self.user = user
         self.db = db
-        self.session = requests.Session()
-        self.session.headers.update({
-            'X-MBX-APIKEY': self.api_key
-        })
+        # Keyed HMAC state; each signature copies it instead of re-keying
+        self._hmac_template = hmac.new(api_secret.encode('utf-8'), None, hashlib.sha256)
+        # The session may be shared with other users' instances, so the API key
+        # travels with each request rather than on the session
+        self.session = session or self.create_session()
+        self._headers = {'X-MBX-APIKEY': self.api_key}
+        self._form_headers = {**self.FORM_HEADERS, **self._headers}
+        # symbol -> (price, expiry) and (balances, expiry), on the monotonic clock
+        self._price_cache = {}
+        self._balance_cache = None
         self.ws = None
         self.ws_thread = None
+        # Set by on_close so shutdown can return as soon as the socket is down
+        self._ws_closed = threading.Event()
+        self._ws_request_id = 0
+        # Delivery settings of the running stream, which later calls share
+        self._ws_callback = None
+        self._ws_batch = False
         self.running = False
         self.initialized = False
         self.logger = logger
         
+    @classmethod
+    def create_session(cls, pool_maxsize: int = 32) -> requests.Session:
+        """
+        Create a keep-alive HTTP session configured for the Binance REST API
+        
+        Args:
+            pool_maxsize: Maximum pooled connections to the API host
+            
+        Returns:
+            Session that carries no credentials and can be shared between users
+        """
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_maxsize,
+            # Only idempotent methods are retried here. Binance accepts a
+            # filled order's client ID again, so a resent order could fill
+            # twice; _execute_live_trade reconciles failed submissions instead
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+        return session
+        
     def initialize(self) -> bool:
         """
         Initialize the exchange connection
@@ -89,8 +179,7 @@ class BinanceExchange(AbstractExchange):
             if self.ws:
                 self.running = False
                 self.ws.close()
-                if self.ws_thread:
-                    self.ws_thread.join(timeout=2)
+                self._wait_for_ws_close()
             logger.info("Binance exchange connection closed")
         except Exception as e:
             logger.error(f"Error closing Binance exchange connection: {str(e)}")
@@ -106,16 +195,26 @@ class BinanceExchange(AbstractExchange):
             logger.error("Binance exchange not initialized")
             return {}
         
+        cached = self._balance_cache
+        if cached and time.monotonic() < cached[1]:
+            return dict(cached[0])
+        
         try:
             result = self._make_request("GET", "/api/v3/account", {}, signed=True)
-            balances = {}
-            for asset in result.get('balances', []):
-                free = float(asset.get('free', 0))
-                locked = float(asset.get('locked', 0))
-                total = free + locked
-                if total > 0:
-                    balances[asset.get('asset')] = total
-            return balances
+            # Binance lists every asset (mostly zero); parse free/locked in one
+            # NumPy pass and only build Python floats for non-zero holdings
+            assets = result.get('balances', [])
+            amounts = np.array(
+                [(asset.get('free', 0), asset.get('locked', 0)) for asset in assets],
+                dtype=np.float64
+            ).reshape(-1, 2)
+            totals = amounts.sum(axis=1)
+            balances = {
+                assets[i].get('asset'): float(totals[i])
+                for i in np.flatnonzero(totals > 0)
+            }
+            self._balance_cache = (balances, time.monotonic() + self.BALANCE_CACHE_TTL)
+            return dict(balances)
         except Exception as e:
             logger.error(f"Error getting account balance: {str(e)}")
             return {}
@@ -130,16 +229,22 @@ class BinanceExchange(AbstractExchange):
         Returns:
             Current price or None if unavailable
         """
+        cached = self._price_cache.get(symbol)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        
         try:
             result = self._make_request("GET", "/api/v3/ticker/price", {'symbol': symbol})
             if 'price' in result:
-                return float(result['price'])
+                price = float(result['price'])
+                self._price_cache[symbol] = (price, time.monotonic() + self.PRICE_CACHE_TTL)
+                return price
             return None
         except Exception as e:
             logger.error(f"Error getting ticker price for {symbol}: {str(e)}")
             return None
     
-    def get_orderbook(self, symbol: str, limit: int = 100) -> Dict[str, List]:
+    def get_orderbook(self, symbol: str, limit: int = 100) -> Dict[str, np.ndarray]:
         """
         Get orderbook for a symbol
         
@@ -148,25 +253,26 @@ class BinanceExchange(AbstractExchange):
             limit: Number of price levels to retrieve
             
         Returns:
-            Orderbook with bids and asks
+            Orderbook with bids and asks as (N, 2) arrays of [price, quantity]
         """
         try:
             result = self._make_request("GET", "/api/v3/depth", {
                 'symbol': symbol,
                 'limit': limit
             })
+            # (N, 2) float64 arrays of [price, quantity], parsed in C
             return {
-                'bids': [[float(bid[0]), float(bid[1])] for bid in result.get('bids', [])],
-                'asks': [[float(ask[0]), float(ask[1])] for ask in result.get('asks', [])]
+                'bids': np.asarray(result.get('bids', []), dtype=np.float64).reshape(-1, 2),
+                'asks': np.asarray(result.get('asks', []), dtype=np.float64).reshape(-1, 2)
             }
         except Exception as e:
             logger.error(f"Error getting orderbook for {symbol}: {str(e)}")
-            return {'bids': [], 'asks': []}
+            return {'bids': np.empty((0, 2)), 'asks': np.empty((0, 2))}
     
     def get_historical_klines(self, symbol: str, interval: str, 
                              start_time: Optional[int] = None, 
                              end_time: Optional[int] = None,
-                             limit: int = 500) -> List[Dict]:
+                             limit: int = 500) -> np.ndarray:
         """
         Get historical candlestick data
         
@@ -178,7 +284,8 @@ class BinanceExchange(AbstractExchange):
             limit: Maximum number of candles
             
         Returns:
-            List of candlestick data
+            Structured array of candles (KLINE_DTYPE); columns are available
+            as e.g. klines['close'] and rows still support k['close']
         """
         try:
             params = {
@@ -194,26 +301,17 @@ class BinanceExchange(AbstractExchange):
                 
             result = self._make_request("GET", "/api/v3/klines", params)
             
-            # Convert to more usable format
-            klines = []
-            for k in result:
-                klines.append({
-                    'timestamp': k[0],
-                    'open': float(k[1]),
-                    'high': float(k[2]),
-                    'low': float(k[3]),
-                    'close': float(k[4]),
-                    'volume': float(k[5]),
-                    'close_time': k[6],
-                    'quote_volume': float(k[7]),
-                    'trades': k[8],
-                    'taker_buy_base': float(k[9]),
-                    'taker_buy_quote': float(k[10])
-                })
+            # Fill a preallocated array row by row; NumPy parses the string-encoded
+            # decimals and no intermediate list of tuples is materialized
+            klines = np.fromiter(
+                (tuple(k[:KLINE_FIELDS]) for k in result),
+                dtype=KLINE_DTYPE,
+                count=len(result)
+            )
             return klines
         except Exception as e:
             logger.error(f"Error getting klines for {symbol}: {str(e)}")
-            return []
+            return np.empty(0, dtype=KLINE_DTYPE)
     
     def execute_trade(self, signal):
         """Execute a trade based on the given signal"""
@@ -249,7 +347,7 @@ class BinanceExchange(AbstractExchange):
             order_id = f"paper-{uuid.uuid4()}"
             
             # Fetch current market price if no specific price provided
-            current_price = self.get_ticker_price(signal.symbol) if not hasattr(signal, 'price') or signal.price is None else signal.price
+            current_price = self.get_ticker_price(signal.symbol) if signal.price is None else signal.price
             
             # Create a mock trade result
             trade_result = TradeResult(
@@ -272,63 +370,117 @@ class BinanceExchange(AbstractExchange):
     def _execute_live_trade(self, signal):
         """Execute a live trade on Binance"""
         try:
-            # Prepare API request
-            endpoint = f"{self.BASE_URL}/api/v3/order"
-            timestamp = int(time.time() * 1000)
+            is_limit = signal.price is not None
             
-            # Order parameters
+            # Order parameters; optional fields are only added when set
             params = {
                 'symbol': signal.symbol.replace('/', ''),  # Remove / from trading pair
                 'side': signal.side.upper(),
-                'type': 'LIMIT' if hasattr(signal, 'price') and signal.price else 'MARKET',
-                'timeInForce': 'GTC' if hasattr(signal, 'price') and signal.price else None,
+                'type': ('MARKET', 'LIMIT')[is_limit],
                 'quantity': signal.quantity,
             }
             
-            # Add price for limit orders
-            if hasattr(signal, 'price') and signal.price:
+            # Limit orders carry a price and time-in-force
+            if is_limit:
+                params['timeInForce'] = 'GTC'
                 params['price'] = signal.price
             
-            # Add optional parameters if available
-            if hasattr(signal, 'stop_loss') and signal.stop_loss:
+            if signal.stop_loss is not None:
                 params['stopPrice'] = signal.stop_loss
             
-            if hasattr(signal, 'client_order_id') and signal.client_order_id:
-                params['newClientOrderId'] = signal.client_order_id
-            
-            # Add timestamp and generate signature
-            params['timestamp'] = timestamp
-            params['signature'] = self._generate_signature(params)
+            # One ID per signal, so a failed submission can be looked up
+            client_order_id = getattr(signal, 'client_order_id', None)
+            if not client_order_id:
+                client_order_id = signal.client_order_id = uuid.uuid4().hex
+            params['newClientOrderId'] = client_order_id
+            
+            # Sign and send through _make_request so the order reuses
+            # the pooled keep-alive connection and the API key header
+            try:
+                result = self._make_request("POST", "/api/v3/order", dict(params), signed=True)
+            except requests.exceptions.RequestException as e:
+                if not self._order_outcome_unknown(e):
+                    raise
+                # The order may have reached the matching engine; only resubmit
+                # once Binance confirms it has no order with this ID
+                result = self._find_order(params['symbol'], client_order_id)
+                if result is None:
+                    self.logger.warning(f"Order {client_order_id} not found after failed submission, resubmitting")
+                    result = self._make_request("POST", "/api/v3/order", dict(params), signed=True)
+            
+            # Create trade result
+            trade_result = TradeResult(
+                trade_id=str(result['orderId']),
+                symbol=result['symbol'],
+                side=result['side'],
+                price=float(result.get('price', 0)),
+                quantity=float(result['executedQty']),
+                # Order lookups report updateTime rather than transactTime
+                timestamp=result.get('transactTime') or result['updateTime'],
+                success=True
+            )
             
-            # Make API request
-            headers = {'X-MBX-APIKEY': self.api_key}
-            response = self.session.post(endpoint, headers=headers, data=params)
+            # Balances (and likely the price) moved; force fresh reads
+            self.invalidate_cache()
             
-            # Check response
-            if response.status_code == 200:
-                result = response.json()
-                
-                # Create trade result
-                trade_result = TradeResult(
-                    trade_id=str(result['orderId']),
-                    symbol=result['symbol'],
-                    side=result['side'],
-                    price=float(result.get('price', 0)),
-                    quantity=float(result['executedQty']),
-                    timestamp=result['transactTime'],
-                    success=True
-                )
-                
-                self.logger.info(f"Live trade executed: {signal.symbol} {signal.side} {signal.quantity}")
-                return trade_result
-            else:
-                self.logger.error(f"API error: {response.status_code} - {response.text}")
-                return None
+            self.logger.info(f"Live trade executed: {signal.symbol} {signal.side} {signal.quantity}")
+            return trade_result
         
         except Exception as e:
             self.logger.error(f"Error executing live trade: {e}")
             return None
     
+    @staticmethod
+    def _order_outcome_unknown(error: requests.exceptions.RequestException) -> bool:
+        """
+        Check whether a failed order submission may still have been executed
+        
+        Args:
+            error: Exception raised by the submission
+            
+        Returns:
+            True for timeouts, dropped connections and 5xx responses
+        """
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and error.response.status_code >= 500
+        return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+    
+    def _find_order(self, symbol: str, client_order_id: str) -> Optional[Dict]:
+        """
+        Look up an order by its client order ID
+        
+        Args:
+            symbol: Trading pair symbol, without the /
+            client_order_id: newClientOrderId the order was submitted with
+            
+        Returns:
+            The order, or None if Binance has no order with this ID
+            
+        Raises:
+            requests.exceptions.RequestException: If the lookup itself fails
+        """
+        try:
+            return self._make_request("GET", "/api/v3/order", {
+                'symbol': symbol,
+                'origClientOrderId': client_order_id
+            }, signed=True)
+        except requests.exceptions.HTTPError as e:
+            # -2013: Order does not exist
+            if e.response is not None and e.response.status_code == 400:
+                try:
+                    if orjson.loads(e.response.content).get('code') == -2013:
+                        return None
+                except ValueError:
+                    pass
+            raise
+    
+    def invalidate_cache(self) -> None:
+        """
+        Drop cached balances and ticker prices
+        """
+        self._balance_cache = None
+        self._price_cache.clear()
+    
     def cancel_order(self, symbol: str, order_id: str) -> bool:
         """
         Cancel an open order
@@ -394,23 +546,19 @@ class BinanceExchange(AbstractExchange):
             logger.error(f"Error getting order status: {str(e)}")
             return None
     
-    def _generate_signature(self, params: Dict) -> str:
+    def _generate_signature(self, query_string: bytes) -> str:
         """
         Generate signature for authenticated requests
         
         Args:
-            params: Request parameters
+            query_string: URL-encoded request parameters, exactly as sent
             
         Returns:
             HMAC SHA256 signature
         """
-        query_string = '&'.join([f"{key}={params[key]}" for key in sorted(params)])
-        signature = hmac.new(
-            self.api_secret.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        signer = self._hmac_template.copy()
+        signer.update(query_string)
+        return signer.hexdigest()
     
     def _make_request(self, method: str, endpoint: str, params: Dict, signed: bool = False) -> Dict:
         """
@@ -425,24 +573,34 @@ class BinanceExchange(AbstractExchange):
         Returns:
             Response JSON
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        url = self._ENDPOINTS.get(endpoint) or self.BASE_URL + endpoint
         
         if signed:
             params['timestamp'] = int(time.time() * 1000)
-            params['signature'] = self._generate_signature(params)
+            # Sort once and send the same ordered pairs that were signed;
+            # None values are dropped just as requests would drop them
+            query_string = urlencode(sorted(
+                (key, value) for key, value in params.items() if value is not None
+            ))
+            signature = self._generate_signature(query_string.encode('ascii'))
+            # Send the already-encoded string so requests does not re-encode it
+            params = f"{query_string}&signature={signature}"
             
         try:
             if method == "GET":
-                response = self.session.get(url, params=params)
+                response = self.session.get(url, params=params, headers=self._headers)
             elif method == "POST":
-                response = self.session.post(url, data=params)
+                if signed:
+                    response = self.session.post(url, data=params, headers=self._form_headers)
+                else:
+                    response = self.session.post(url, data=params, headers=self._headers)
             elif method == "DELETE":
-                response = self.session.delete(url, params=params)
+                response = self.session.delete(url, params=params, headers=self._headers)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
                 
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP error: {e.response.text}")
             raise
@@ -450,28 +608,93 @@ class BinanceExchange(AbstractExchange):
             logger.error(f"Request error: {str(e)}")
             raise
     
-    def start_websocket_stream(self, symbols: List[str], callback: Any):
+    def start_websocket_stream(self, symbols: List[str], callback: Any, batch: bool = False):
         """
         Start a WebSocket stream for given symbols
         
         Args:
             symbols: List of trading symbols to stream
             callback: Function to handle incoming WebSocket messages
+            batch: If True, callback receives lists of messages, flushed every
+                WS_BATCH_SIZE messages or WS_BATCH_INTERVAL seconds
+        
+        If a stream is already running, the symbols are subscribed on the
+        existing connection (and delivered to its callback) instead of
+        starting another socket and reader thread. A call with a different
+        callback or batch mode is rejected, since the connection has only one.
         """
+        if self.running and self.ws_thread and self.ws_thread.is_alive():
+            if callback != self._ws_callback or batch != self._ws_batch:
+                logger.error(
+                    f"Cannot stream {symbols}: WebSocket stream already running "
+                    f"with a different callback or batch mode"
+                )
+                return
+            self.subscribe_symbols(symbols)
+            return
+        
         try:
             # Prepare WebSocket connection
             self.running = True
+            self._ws_callback = callback
+            self._ws_batch = batch
             
-            # Create WebSocket streams for each symbol
+            # Multiplex every symbol over one combined-stream connection
             streams = [f"{symbol.lower()}@trade" for symbol in symbols]
-            stream_url = f"{self.WS_URL}/{'/'.join(streams)}"
+            stream_url = f"{self.WS_URL}/stream?streams={'/'.join(streams)}"
+            
+            pending = []
+            last_flush = [time.monotonic()]
+            # Set while pending holds messages, so the flusher sleeps when idle
+            has_pending = threading.Event()
+            # Shared by the reader and the flusher thread; held while the callback
+            # runs so batches are delivered one at a time and in order
+            pending_lock = threading.Lock()
+            
+            def flush():
+                """Hand buffered messages to the callback as one batch"""
+                with pending_lock:
+                    if pending:
+                        messages = pending[:]
+                        pending.clear()
+                        has_pending.clear()
+                        callback(messages)
+                    last_flush[0] = time.monotonic()
+            
+            def flush_idle():
+                """Flush a partial batch once the stream has been quiet for WS_BATCH_INTERVAL"""
+                while self.running and not self._ws_closed.is_set():
+                    if not has_pending.wait(self.WS_IDLE_POLL):
+                        continue
+                    # Let the batch fill until WS_BATCH_INTERVAL after the last flush
+                    delay = last_flush[0] + self.WS_BATCH_INTERVAL - time.monotonic()
+                    if delay > 0 and self._ws_closed.wait(delay):
+                        break
+                    try:
+                        flush()
+                    except Exception as e:
+                        logger.error(f"Error flushing WebSocket batch: {e}")
             
             def on_message(ws, message):
                 """Handle incoming WebSocket messages"""
                 if self.running:
                     try:
-                        data = json.loads(message)
-                        callback(data)
+                        data = orjson.loads(message)
+                        # Combined streams wrap payloads as {"stream": ..., "data": ...};
+                        # SUBSCRIBE acknowledgements carry no "data" and are skipped
+                        if 'data' not in data:
+                            return
+                        data = data['data']
+                        if not batch:
+                            callback(data)
+                            return
+                        
+                        with pending_lock:
+                            pending.append(data)
+                            has_pending.set()
+                            full = len(pending) >= self.WS_BATCH_SIZE
+                        if full or time.monotonic() - last_flush[0] >= self.WS_BATCH_INTERVAL:
+                            flush()
                     except Exception as e:
                         logger.error(f"Error processing WebSocket message: {e}")
             
@@ -484,12 +707,19 @@ class BinanceExchange(AbstractExchange):
                 """Handle WebSocket closure"""
                 logger.info("WebSocket connection closed")
                 self.running = False
+                try:
+                    flush()
+                except Exception as e:
+                    logger.error(f"Error flushing WebSocket batch on close: {e}")
+                finally:
+                    self._ws_closed.set()
             
             def on_open(ws):
                 """Handle WebSocket connection open"""
                 logger.info("WebSocket connection established")
             
             # Create and start WebSocket connection
+            self._ws_closed.clear()
             self.ws = websocket.WebSocketApp(
                 stream_url,
                 on_message=on_message,
@@ -498,15 +728,50 @@ class BinanceExchange(AbstractExchange):
                 on_open=on_open
             )
             
-            # Start WebSocket in a separate thread
-            self.ws_thread = threading.Thread(target=self.ws.run_forever)
+            # Start WebSocket in a separate thread. orjson already rejects
+            # invalid UTF-8, so skip websocket-client's pure-Python check per frame
+            self.ws_thread = threading.Thread(
+                target=self.ws.run_forever,
+                kwargs={'skip_utf8_validation': True}
+            )
             self.ws_thread.daemon = True
             self.ws_thread.start()
             
+            # Without new frames nothing else would deliver the last partial batch
+            if batch:
+                threading.Thread(target=flush_idle, name="ws_batch_flusher", daemon=True).start()
+            
         except Exception as e:
             logger.error(f"Error starting WebSocket stream: {e}")
             self.running = False
     
+    def subscribe_symbols(self, symbols: List[str], unsubscribe: bool = False) -> bool:
+        """
+        Add or remove trade streams on the open connection without reconnecting
+        
+        Args:
+            symbols: List of trading symbols
+            unsubscribe: Remove the streams instead of adding them
+            
+        Returns:
+            True if the control frame was sent, False otherwise
+        """
+        if not self.ws or not self.running:
+            logger.error("Cannot change subscriptions: WebSocket stream not running")
+            return False
+        
+        try:
+            self._ws_request_id += 1
+            self.ws.send(orjson.dumps({
+                'method': 'UNSUBSCRIBE' if unsubscribe else 'SUBSCRIBE',
+                'params': [f"{symbol.lower()}@trade" for symbol in symbols],
+                'id': self._ws_request_id
+            }))
+            return True
+        except Exception as e:
+            logger.error(f"Error updating WebSocket subscriptions: {e}")
+            return False
+    
     def stop_websocket_stream(self):
         """
         Stop the active WebSocket stream
@@ -515,14 +780,22 @@ class BinanceExchange(AbstractExchange):
             self.running = False
             if self.ws:
                 self.ws.close()
-            
-            if self.ws_thread:
-                self.ws_thread.join(timeout=2)
+                self._wait_for_ws_close()
                 
             logger.info("WebSocket stream stopped")
         except Exception as e:
             logger.error(f"Error stopping WebSocket stream: {e}")
     
+    def _wait_for_ws_close(self, timeout: float = 2) -> None:
+        """
+        Block until on_close has fired, or the reader thread is already gone
+        
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        if self.ws_thread and self.ws_thread.is_alive():
+            self._ws_closed.wait(timeout=timeout)
+    
     def calculate_position_size(self, symbol: str, risk_percentage: float, stop_loss_price: float) -> float:
         """
         Calculate optimal position size based on account balance and risk management
@@ -536,11 +809,11 @@ class BinanceExchange(AbstractExchange):
             Optimal position size in base asset
         """
         try:
-            # Get account balance
-            balances = self.get_account_balance()
-            
-            # Get current ticker price
-            current_price = self.get_ticker_price(symbol)
+            # Fetch account balance and ticker price in parallel
+            balances_future = _IO_EXECUTOR.submit(self.get_account_balance)
+            price_future = _IO_EXECUTOR.submit(self.get_ticker_price, symbol)
+            balances = balances_future.result()
+            current_price = price_future.result()
             
             if not current_price or 'USDT' not in balances:
                 logger.error("Unable to calculate position size")
@@ -38,7 +38,8 @@ class DatabaseConnectionError(Exception):
 class Database:
     """Advanced Database interface for QuantumFlow Trading Bot."""
     
-    def __init__(self, db_url, max_connections=30, connection_timeout=60):
+    def __init__(self, db_url, max_connections=30, connection_timeout=60, min_connections=1,
+                 pgbouncer=False):
         """
         Initialize Database with advanced connection management.
         
@@ -46,9 +47,13 @@ class Database:
             db_url (str): Database connection URL
             max_connections (int): Maximum number of database connections
             connection_timeout (int): Connection timeout in seconds
+            min_connections (int): Connections the psycopg2 pool opens up front and keeps open
+            pgbouncer (bool): db_url points at PgBouncer in transaction pooling mode
         """
         self.db_url = db_url
         self.max_connections = max_connections
+        self.min_connections = min(min_connections, max_connections)
+        self.pgbouncer = pgbouncer
         self.connection_timeout = connection_timeout
         
         # Core database components
@@ -170,8 +175,9 @@ class Database:
             # Parse connection parameters
             conn_params = self._parse_connection_url(self.db_url)
             
-            # Create database if not exists
-            if not database_exists(self.db_url):
+            # Create database if not exists. PgBouncer only exposes configured
+            # databases, so behind it the database must already be provisioned
+            if not self.pgbouncer and not database_exists(self.db_url):
                 self.logger.warning("Database does not exist. Creating...")
                 create_database(self.db_url)
             
@@ -182,7 +188,9 @@ class Database:
                 max_overflow=self.max_connections // 2,  # Remaining for overflow
                 pool_timeout=self.connection_timeout,
                 pool_recycle=1800,  # Recycle connections every 30 minutes
-                pool_pre_ping=True,  # Test connection health before use
+                # Test connection health before use; PgBouncer already does this
+                # for its server connections, so skip the extra round-trip behind it
+                pool_pre_ping=not self.pgbouncer,
                 echo=False  # Set to True for SQL logging
             )
             
@@ -199,7 +207,7 @@ class Database:
             
             # Configure psycopg2 connection pool
             self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                1,  # Minimum connections
+                self.min_connections,  # Minimum connections
                 self.max_connections,  # Maximum connections
                 host=conn_params['host'],
                 port=conn_params['port'],
@@ -301,6 +309,7 @@ class Database:
                     "is_admin": "Boolean DEFAULT false",
                     "is_active": "Boolean DEFAULT true",
                     "is_paused": "Boolean DEFAULT false",
+                    "first_profit_recorded": "Boolean DEFAULT false",
                     "last_login": "TIMESTAMP",
                     "registration_date": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
                 },
@@ -385,16 +394,24 @@ class Database:
         if not self.initialized:
             self.initialize()
         
+        conn = None
         try:
             conn = self.connection_pool.getconn()
             
-            # Additional connection validation
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
+            # Additional connection validation, left to PgBouncer when behind it
+            if not self.pgbouncer:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
             
             return conn
         except Exception as e:
+            # Hand a broken connection back to be closed instead of leaking its pool slot
+            if conn is not None:
+                try:
+                    self.connection_pool.putconn(conn, close=True)
+                except Exception:
+                    pass
             self.logger.error(f"Connection retrieval failed: {e}")
             raise DatabaseConnectionError(f"Could not get database connection: {e}")
     
@@ -646,6 +663,7 @@ class Database:
         Returns:
             bool: Connection test result
         """
+        conn = None
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
@@ -663,13 +681,15 @@ class Database:
                 self.logger.debug(f"Connection test passed: {test}")
             
             cursor.close()
-            self.release_connection(conn)
             
             return True
         
         except Exception as e:
             self.logger.error(f"Comprehensive connection test failed: {e}")
             return False
+        finally:
+            if conn:
+                self.release_connection(conn)
 
 # Alias for backward compatibility
 DatabaseManager = Database
@@ -1,29 +1,60 @@
 import logging
 import threading
 import time
+import types
+from collections import OrderedDict, deque
+from itertools import groupby
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any, Set, Tuple
 
+import numpy as np
+
 from config.app_config import AppConfig
 from config.trading_config import TradingConfig
 from database.db import DatabaseManager
 from exchange.abstract_exchange import AbstractExchange
 from exchange.exchange_factory import ExchangeFactory
+from exchange.exchange_helper import ExchangeHelper
 from notification.notification_manager import NotificationManager
 from risk.risk_manager import RiskManager
 from security.api_key_manager import APIKeyManager
 from strategies.strategy_factory import StrategyFactory
 from strategies.base_strategy import BaseStrategy
 from analysis.market_analyzer import MarketAnalyzer
+from analysis._njit import NUMBA_AVAILABLE
+from analysis.technical_indicators import warm_up_kernels
+from analysis.strategy_metrics_cache import StrategyMetricsCache
 from ml.models.price_predictor import PricePredictor
 from ml.models.pattern_recognition import PatternRecognition
 from ml.models.regime_classifier import RegimeClassifier
 from database.repository.user_repository import UserRepository
-from database.repository.trade_repository import TradeRepository
+from database.repository.trade_repository import TradeRepository, TradeRow
 from database.repository.position_repository import PositionRepository
 from profit.profit_tracker import ProfitTracker
+from services.user_trading_manager import UserTradingManager
 
 logger = logging.getLogger(__name__)
 
+class ActiveUserView:
+    """
+    Lightweight read-only view of an active user row, used when the ORM query cannot run
+    """
+    __slots__ = ('id', 'telegram_id', 'email', 'username', 'first_name', 'last_name',
+                 'is_active', 'is_admin')
+    
+    def __init__(self, id: int, telegram_id: Optional[int] = None, email: Optional[str] = None,
+                 username: Optional[str] = None, first_name: Optional[str] = None,
+                 last_name: Optional[str] = None, is_active: bool = True, is_admin: bool = False):
+        self.id = id
+        self.telegram_id = telegram_id
+        self.email = email
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+        self.is_active = is_active
+        self.is_admin = is_admin
+
 class TradingEngine:
     """
     Comprehensive Trading Execution and Management System
@@ -33,6 +64,9 @@ class TradingEngine:
     risk management and performance tracking capabilities.
     """
 
+    # User IDs below this are looked up by list index; larger ones use a dict
+    MAX_DENSE_USER_ID = 100_000
+
     def __init__(
         self, 
         config: Optional[AppConfig] = None,
@@ -51,6 +85,7 @@ class TradingEngine:
         trade_repository: Optional[TradeRepository] = None,
         user_repository: Optional[UserRepository] = None,
         profit_tracker: Optional[ProfitTracker] = None,
+        exchange_helper: Optional[ExchangeHelper] = None,
         shutdown_event: Optional[threading.Event] = None
     ):
         """
@@ -66,78 +101,185 @@ class TradingEngine:
             risk_manager (RiskManager): Risk management and validation system
             strategy_factory (StrategyFactory): Factory for creating trading strategies
             market_analyzer (MarketAnalyzer): Market analysis system
-            price_predictor (PricePredictor): Price prediction model
-            pattern_recognition (PatternRecognition): Pattern recognition model
-            regime_classifier (RegimeClassifier): Market regime classification model
+            price_predictor (PricePredictor): Price prediction model, or a function returning it
+            pattern_recognition (PatternRecognition): Pattern recognition model, or a function returning it
+            regime_classifier (RegimeClassifier): Market regime classification model, or a function returning it
             position_repository (PositionRepository): Repository for tracking positions
             trade_repository (TradeRepository): Repository for tracking trades
             user_repository (UserRepository): Repository for user management
             profit_tracker (ProfitTracker): System for tracking trading profits
+            exchange_helper (ExchangeHelper): Builds many users' exchanges from one key query
             shutdown_event (threading.Event): Event to signal system shutdown
         """
         # Core system dependencies
         self.config = config
         self.trading_config = trading_config
         self.db = db
+        # Raw-query path for the active-users fallback, probed once
+        self._exec_query = getattr(db, 'execute_query', None)
         self.exchange_factory = exchange_factory
         self.api_key_manager = api_key_manager
+        self.exchange_helper = exchange_helper
         self.notification_manager = notification_manager
         self.shutdown_event = shutdown_event or threading.Event()
+        # A private event may be set by stop(); a shared one belongs to the application
+        self._owns_shutdown_event = shutdown_event is None
 
         # Risk and strategy management
         self.risk_manager = risk_manager or RiskManager(config, db)
         self.strategy_factory = strategy_factory or StrategyFactory(config, self.risk_manager)
 
-        # Analysis and ML components
+        # Analysis and ML components. Models may be passed as functions returning
+        # the model, which are then called once, on first use
         self.market_analyzer = market_analyzer
-        self.price_predictor = price_predictor
-        self.pattern_recognition = pattern_recognition
-        self.regime_classifier = regime_classifier
+        self._ml_models: Dict[str, Any] = {
+            'price_predictor': price_predictor,
+            'pattern_recognition': pattern_recognition,
+            'regime_classifier': regime_classifier
+        }
+        self._ml_models_lock = threading.Lock()
 
         # Repositories - direct references, not using db.get_repository()
         self.position_repository = position_repository
         self.trade_repository = trade_repository
         self.user_repository = user_repository
+        # Trade writes go through one repository resolved up front
+        self._trade_repo = trade_repository or (self.db.get_repository('trade') if self.db else None)
+        # Completed days of strategy totals are kept on disk; only today and changed days are queried
+        self._strategy_metrics_cache = None
+        if hasattr(trade_repository, 'get_strategy_daily_totals'):
+            self._strategy_metrics_cache = StrategyMetricsCache(
+                trade_repository,
+                config.get('trading.metrics_cache_dir', 'cache/trades') if config else 'cache/trades'
+            )
 
         # Profit tracking
         self.profit_tracker = profit_tracker
 
+        # Per-user trading settings, shared by every cycle
+        self._trading_manager = UserTradingManager(self.db)
+        self._settings_cache: Dict[int, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self.settings_cache_ttl = 30  # seconds
+
         # User tracking
         self.user_exchange_map: Dict[int, AbstractExchange] = {}
-        self.user_strategy_map: Dict[int, List[BaseStrategy]] = {}
+        # Index of user_exchange_map for the hot lookup path (see _get_exchange)
+        self._user_exchange_list: List[Optional[AbstractExchange]] = []
+        self._user_exchange_overflow: Dict[int, AbstractExchange] = {}
+        # Strategy allocation per risk level, read from TradingConfig on first use
+        self._allocations_by_risk: Dict[str, Dict[str, float]] = {}
+        # user id -> (allocation key, strategies); rebuilt only when the allocation changes
+        self.user_strategy_map: Dict[int, Tuple[Tuple[Any, ...], List[BaseStrategy]]] = {}
+        # Total strategies across user_strategy_map, kept in step with it under self.lock
+        self._active_strategies_count = 0
         self.active_users_cache: List[Any] = []
-        self.last_user_refresh = 0
         self.user_refresh_interval = 300  # 5 minutes
+        # Single float written by the refreshing thread and read lock-free by get_status
+        self._next_user_refresh = 0.0  # time.monotonic() deadline
+        self._user_refresh_lock = threading.Lock()
 
         # Trading thread management
         self.trading_thread: Optional[threading.Thread] = None
+        # Users are processed concurrently; each is dominated by exchange/DB I/O
+        self.user_workers = config.get('trading.user_workers', 16) if config else 16
+        # Separate pool for per-strategy signal generation; sharing the user pool could deadlock
+        self.signal_workers = config.get('trading.signal_workers', 32) if config else 32
+        # Both pools are created by start(), since stop() shuts them down
+        self._user_pool: Optional[ThreadPoolExecutor] = None
+        self._signal_pool: Optional[ThreadPoolExecutor] = None
+        self.reconnect_workers = 16
+        self.monitor_workers = config.get('trading.monitor_workers', 32) if config else 32
         self.running = False
         self.paused = False
 
-        # Market data cache
-        self.market_data_cache = {}
-        self.last_market_update = 0
+        # Market data cache: symbol -> summary. Rebuilt whole by update_market_data
+        # and swapped in, so readers never see a half-updated snapshot
+        self.market_data_cache: Dict[str, Dict[str, Any]] = {}
+        self.max_market_data_symbols = 4096
+        self.market_data_ttl = 120  # seconds; outlives one failed refresh
+        self._market_data_expires = 0.0  # time.monotonic() deadline
         self.market_update_interval = 60  # 1 minute
+        # Single float written by the trading loop and read lock-free by get_status
+        self._next_market_update = 0.0  # time.monotonic() deadline
+
+        # Trade recording: rows in TradeRepository.add_trade argument order are
+        # buffered and written in bulk by a flusher thread
+        self._trade_buffer: deque = deque()
+        self._trade_buffer_lock = threading.Lock()
+        self._trade_flush_event = threading.Event()
+        self._trade_flusher: Optional[threading.Thread] = None
+        self.trade_flush_batch_size = 64
+        self.trade_flush_interval = 0.25  # seconds
+
+        # Monitoring results: name -> (repository revision, expiry, value)
+        self._metric_cache: Dict[str, Tuple[Any, float, Any]] = {}
+        self.metric_cache_ttl = 60  # seconds
+        self._metric_cache_stats = {'hits': 0, 'misses': 0}
+        # Active positions shared by risk checks and monitoring: (revision, expiry, positions)
+        self._positions_snapshot: Tuple[Any, float, Optional[List[Any]]] = (None, 0.0, None)
+        self.positions_snapshot_ttl = 5  # seconds
+        # A user whose open-position exposure exceeds this counts as at risk
+        self.user_exposure_threshold = config.get('risk.user_exposure_threshold', 5000) if config else 5000
 
-        # Error tracking
-        self.error_counts = {}
+        # Error tracking: error type -> [count, last_seen, last_message], oldest first
+        self.error_counts: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self.max_tracked_errors = 128
+        self.error_log_interval = 5.0  # seconds between logs of the same error type
+        self._last_error_log: Dict[str, float] = {}
+        # (key, count) of the most frequent tracked error, maintained by _track_error
+        self._top_error: Tuple[Optional[str], int] = (None, 0)
         self.max_consecutive_errors = 5
         self.error_backoff_time = 5.0  # seconds
 
         # Health status
         self.health_status = "initializing"
         
-        # Thread safety
-        self.lock = threading.RLock()
+        # Thread safety; not re-entrant, so helpers called under it must not take it again
+        self.lock = threading.Lock()
         
         # Schema verification flag
         self.schema_verified = False
+        # Set by the schema probe when users.is_admin is missing
+        self._use_fallback_users = False
 
         logger.info("Trading Engine initialized successfully")
         
         # Verify database schema for critical tables
         self._verify_database_schema()
 
+    @property
+    def price_predictor(self) -> Optional[PricePredictor]:
+        return self._ml_model('price_predictor')
+
+    @property
+    def pattern_recognition(self) -> Optional[PatternRecognition]:
+        return self._ml_model('pattern_recognition')
+
+    @property
+    def regime_classifier(self) -> Optional[RegimeClassifier]:
+        return self._ml_model('regime_classifier')
+
+    def _ml_model(self, name: str) -> Any:
+        """
+        Get an ML model, building it on first use when it was passed as a function.
+
+        Args:
+            name: Model name
+
+        Returns:
+            The model, or None if none was configured
+        """
+        model = self._ml_models[name]
+        if not isinstance(model, types.FunctionType):
+            return model
+            
+        with self._ml_models_lock:
+            model = self._ml_models[name]
+            if isinstance(model, types.FunctionType):
+                model = model()
+                self._ml_models[name] = model
+        return model
+
     def _verify_database_schema(self) -> None:
         """
         Verify that the database schema has necessary columns.
@@ -161,6 +303,11 @@ class TradingEngine:
                     if not exists:
                         logger.warning(f"Critical column '{col_name}' missing from users table")
                 
+                # The ORM user query selects is_admin; use raw SQL when it is missing
+                self._use_fallback_users = not users_table_status['is_admin']
+                if self._use_fallback_users:
+                    logger.warning("Using fallback method for active users due to schema issue")
+                
                 self.schema_verified = True
                 
         except Exception as e:
@@ -181,68 +328,171 @@ class TradingEngine:
             logger.info(f"Processing {len(users)} active users")
             
             # Process strategies for each user
-            for user in users:
-                self._process_user_strategies(user)
+            self._process_users(users)
+            
+            # Without the trading thread there is no flusher; write this cycle's trades now
+            if not self.running:
+                self._flush_trades()
                 
             logger.info("Trading cycle completed")
             
         except Exception as e:
             logger.error(f"Error running trading cycle: {e}")
         
-    def _process_user_strategies(self, user):
+    def _process_users(self, users) -> None:
+        """
+        Process strategies for all users concurrently on the user worker pool.
+
+        Args:
+            users: Active users to process this cycle
+        """
+        settings_by_user = self._load_settings_bulk(users)
+        futures = {
+            self._user_pool.submit(self._process_user_strategies, user, settings_by_user.get(user.id)): user
+            for user in users
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error processing user {futures[future].id}: {e}")
+
+    def _process_user_strategies(self, user, settings: Optional[Dict[str, Any]] = None):
         """Process all strategies for a user"""
         try:
             # Check if user trading is paused
-            from services.user_trading_manager import UserTradingManager
-            trading_manager = UserTradingManager(self.db)
-            settings = trading_manager.get_trading_settings(user.id)
+            if settings is None:
+                settings = self._get_settings_cached(user.id)
             
             if settings and settings.get('is_paused', False):
                 logger.info(f"Skipping user {user.id}: Trading is paused")
                 return
                 
             # Get user's exchange
-            exchange = self.user_exchange_map.get(user.id)
+            exchange = self._get_exchange(user.id)
             
             if not exchange:
                 logger.error(f"Failed to create exchange for user {user.id}")
                 return
                 
             # Get all strategies for this user
-            strategies = self._get_user_strategies(user)
+            strategies = self._get_user_strategies(user, settings)
             
             if not strategies:
                 logger.info(f"No strategies configured for user {user.id}")
                 return
                 
-            # Process each strategy
-            for strategy in strategies:
-                self._process_strategy(user, exchange, strategy)
+            if len(strategies) == 1:
+                self._process_strategy(user, exchange, strategies[0])
+                return
+                
+            # Signal generation is dominated by market-data requests, so overlap it
+            # across strategies; signals are still executed in strategy order so each
+            # risk check sees the trades placed before it
+            pending = [self._signal_pool.submit(self._generate_signals, exchange, strategy) for strategy in strategies]
+            for strategy, signals_future in zip(strategies, pending):
+                self._process_strategy(user, exchange, strategy, signals_future)
                 
         except Exception as e:
             logger.error(f"Error processing strategies for user {user.id}: {e}")
         
-    def _get_user_strategies(self, user):
+    def _get_settings_cached(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's trading settings, reusing a recent read.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Trading settings dict or None if unavailable
+        """
+        now = time.monotonic()
+        cached = self._settings_cache.get(user_id)
+        if cached and now < cached[0]:
+            return cached[1]
+
+        settings = self._trading_manager.get_trading_settings(user_id)
+        self._settings_cache[user_id] = (now + self.settings_cache_ttl, settings)
+        return settings
+
+    def _load_settings_bulk(self, users) -> Dict[int, Dict[str, Any]]:
+        """
+        Load trading settings for all users in one query and prime the cache.
+
+        Args:
+            users: Users about to be processed this cycle
+
+        Returns:
+            Dict mapping user ID to settings (empty if the bulk read failed)
+        """
+        settings_by_user = self._trading_manager.get_trading_settings_bulk([user.id for user in users])
+        if not settings_by_user:
+            return {}
+
+        expires = time.monotonic() + self.settings_cache_ttl
+        for user_id, settings in settings_by_user.items():
+            self._settings_cache[user_id] = (expires, settings)
+        return settings_by_user
+
+    def _get_exchange(self, user_id: int) -> Optional[AbstractExchange]:
+        """
+        Look up a user's exchange, by list index for dense user IDs.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Exchange instance or None if the user has none
+        """
+        if 0 <= user_id < len(self._user_exchange_list):
+            return self._user_exchange_list[user_id]
+        return self._user_exchange_overflow.get(user_id)
+
+    def _set_exchange(self, user_id: int, exchange: AbstractExchange) -> None:
+        """
+        Register a user's exchange in user_exchange_map and its lookup index.
+
+        Args:
+            user_id: User ID
+            exchange: Initialized exchange instance
+        """
+        self.user_exchange_map[user_id] = exchange
+        if 0 <= user_id < self.MAX_DENSE_USER_ID:
+            if user_id >= len(self._user_exchange_list):
+                self._user_exchange_list.extend([None] * (user_id + 1 - len(self._user_exchange_list)))
+            self._user_exchange_list[user_id] = exchange
+        else:
+            self._user_exchange_overflow[user_id] = exchange
+
+    def _get_user_strategies(self, user, settings: Optional[Dict[str, Any]] = None):
         """Get all strategies configured for a user"""
         try:
             # Get user's risk level
-            from services.user_trading_manager import UserTradingManager
-            trading_manager = UserTradingManager(self.db)
-            settings = trading_manager.get_trading_settings(user.id)
+            if settings is None:
+                settings = self._get_settings_cached(user.id)
             
             risk_level = settings.get('risk_level', 'medium') if settings else 'medium'
             
             # Get strategy allocation for this risk level
-            from config.trading_config import TradingConfig
-            trading_config = TradingConfig.get_instance()
-            strategy_allocation = trading_config.get_strategy_allocation(risk_level)
+            strategy_allocation = self._allocations_by_risk.get(risk_level)
+            if strategy_allocation is None:
+                strategy_allocation = TradingConfig.get_instance().get_strategy_allocation(risk_level)
+                if strategy_allocation:
+                    self._allocations_by_risk[risk_level] = strategy_allocation
             
             if not strategy_allocation:
                 logger.warning(f"No strategy allocation found for risk level {risk_level}")
                 return []
+            
+            # Reuse the user's strategies while their allocation is unchanged
+            allocation_key = (risk_level, tuple(sorted(strategy_allocation.items())))
+            cached = self.user_strategy_map.get(user.id)
+            if cached is not None and cached[0] == allocation_key:
+                return cached[1]
                 
             # Create strategy instances
             strategies = []
+            complete = True
             
             for strategy_name, allocation_percent in strategy_allocation.items():
                 try:
@@ -255,9 +505,19 @@ class TradingEngine:
                     
                     if strategy:
                         strategies.append(strategy)
+                    else:
+                        complete = False
                         
                 except Exception as e:
+                    complete = False
                     logger.error(f"Error creating strategy {strategy_name}: {e}")
+            
+            # Leave a partial set uncached so failed strategies are retried next cycle
+            if complete:
+                with self.lock:
+                    previous = self.user_strategy_map.get(user.id)
+                    self.user_strategy_map[user.id] = (allocation_key, strategies)
+                    self._active_strategies_count += len(strategies) - (len(previous[1]) if previous else 0)
                     
             return strategies
             
@@ -265,64 +525,96 @@ class TradingEngine:
             logger.error(f"Error getting strategies for user {user.id}: {e}")
             return []
         
-    def _process_strategy(self, user, exchange, strategy):
-        """Process a single strategy for a user"""
+    def _generate_signals(self, exchange, strategy):
+        """Bind a strategy to the user's exchange and generate its signals"""
+        strategy.set_exchange(exchange)
+        return strategy.generate_signals()
+        
+    def _process_strategy(self, user, exchange, strategy, signals_future=None):
+        """Process a single strategy for a user, optionally with signals generated on the signal pool"""
+        strategy_name = strategy.name
+        user_id = user.id
         try:
-            # Set the exchange for the strategy
-            strategy.set_exchange(exchange)
-            
             # Generate trading signals
-            signals = strategy.generate_signals()
+            if signals_future is not None:
+                signals = signals_future.result()
+            else:
+                signals = self._generate_signals(exchange, strategy)
             
             if not signals:
-                logger.debug(f"No signals generated by {strategy.name} for user {user.id}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"No signals generated by {strategy_name} for user {user_id}")
                 return
                 
-            logger.info(f"Generated {len(signals)} signals with {strategy.name} for user {user.id}")
+            logger.info(f"Generated {len(signals)} signals with {strategy_name} for user {user_id}")
             
-            # Process each signal
-            for signal in signals:
-                self._process_signal(user, exchange, strategy, signal)
+            if len(signals) == 1:
+                self._process_signal(user, exchange, strategy, signals[0])
+                return
+                
+            # Skip if risk manager not available
+            if not self.risk_manager:
+                logger.warning("Risk manager not available, skipping signal processing")
+                return
+                
+            # Validate the batch against one load of the user's risk context, then execute in order
+            for validated_signal in self.risk_manager.validate_signals_batch(user, signals):
+                self._execute_signal(user, exchange, strategy, validated_signal)
                 
         except Exception as e:
-            logger.error(f"Error processing strategy {strategy.name} for user {user.id}: {e}")
+            logger.error(f"Error processing strategy {strategy_name} for user {user_id}: {e}")
 
-    # The rest of the methods from the complete Trading Engine class implementation would follow here
-    # This includes methods like start(), stop(), pause(), resume(), update_market_data(), 
-    # analyze_performance(), evaluate_strategies(), get_status(), _trading_loop(), 
-    # _load_active_users(), _initialize_user(), _close_exchange_connections(), 
-    # _process_signal(), _record_trade(), _send_trade_notification(), monitor_positions(), 
-    # check_risk_exposure(), reset_engine(), and others from the original implementation
+    def start(self) -> bool:
+        """
+        Activate the trading engine and begin trade execution.
 
-# Maintain backward compatibility
-Engine = TradingEngine
-def start(self) -> bool:
-    """
-    Activate the trading engine and begin trade execution.
+        Initiates a background thread for continuous trading operations 
+        and user strategy management.
 
-    Initiates a background thread for continuous trading operations 
-    and user strategy management.
+        Returns:
+            bool: Indicates successful engine start
+        """
+        # Pay JIT compile / cache-load cost now rather than in the first trading
+        # cycle, before taking the lock so stop() and get_status() are not blocked
+        self._warmup_numba_kernels()
+        
+        with self.lock:
+            if self.running:
+                logger.warning("Trading engine is already operational")
+                return False
 
-    Returns:
-        bool: Indicates successful engine start
-    """
-    with self.lock:
-        if self.running:
-            logger.warning("Trading engine is already operational")
-            return False
+            logger.info("Starting trading engine")
+            self.running = True
+            self.paused = False
+            self.health_status = "starting"
+            if self._owns_shutdown_event:
+                self.shutdown_event.clear()
+            # Fresh pools each start; executors cannot be restarted after stop()
+            self._user_pool = ThreadPoolExecutor(max_workers=self.user_workers, thread_name_prefix="engine-user")
+            self._signal_pool = ThreadPoolExecutor(max_workers=self.signal_workers, thread_name_prefix="engine-signal")
+            self.trading_thread = threading.Thread(target=self._trading_loop, name="trading_engine_thread", daemon=True)
+            self.trading_thread.start()
+            self._trade_flusher = threading.Thread(target=self._trade_flush_loop, name="trade_flusher_thread", daemon=True)
+            self._trade_flusher.start()
 
-        logger.info("Starting trading engine")
-        self.running = True
-        self.paused = False
-        self.health_status = "starting"
-        self.trading_thread = threading.Thread(target=self._trading_loop, name="trading_engine_thread", daemon=True)
-        self.trading_thread.start()
+            logger.info("Trading engine started successfully")
+            self.health_status = "running"
+            return True
 
-        logger.info("Trading engine started successfully")
-        self.health_status = "running"
-        return True
+    def _warmup_numba_kernels(self) -> None:
+        """
+        Compile the Numba indicator kernels before the trading thread needs them.
+        """
+        if not NUMBA_AVAILABLE:
+            return
+            
+        try:
+            for kernel, seconds in warm_up_kernels().items():
+                logger.info(f"Warmed up {kernel} kernel in {seconds * 1000:.1f} ms")
+        except Exception as e:
+            logger.error(f"Error warming up indicator kernels: {str(e)}")
 
-def stop(self) -> bool:
+    def stop(self) -> bool:
         """
         Gracefully terminate the trading engine.
 
@@ -339,21 +631,33 @@ def stop(self) -> bool:
             logger.info("Stopping trading engine")
             self.running = False
             self.health_status = "stopping"
+            # Wake the trading loop out of its idle wait
+            if self._owns_shutdown_event:
+                self.shutdown_event.set()
 
-            # Wait for trading thread to terminate
-            if self.trading_thread and self.trading_thread.is_alive():
-                self.trading_thread.join(timeout=30)
-                if self.trading_thread.is_alive():
-                    logger.warning("Trading thread did not terminate gracefully")
+        # Wait for the trading thread outside the lock so status queries are not blocked
+        if self.trading_thread and self.trading_thread.is_alive():
+            self.trading_thread.join(timeout=30)
+            if self.trading_thread.is_alive():
+                logger.warning("Trading thread did not terminate gracefully")
 
-            # Close exchange connections
-            self._close_exchange_connections()
+        # Let in-flight user work finish, then close exchange connections
+        self._user_pool.shutdown(wait=True)
+        self._signal_pool.shutdown(wait=True)
+        
+        # Stop the flusher and write whatever trades are still buffered
+        self._trade_flush_event.set()
+        if self._trade_flusher and self._trade_flusher.is_alive():
+            self._trade_flusher.join(timeout=30)
+        self._flush_trades()
+        
+        self._close_exchange_connections()
 
-            logger.info("Trading engine stopped successfully")
-            self.health_status = "stopped"
-            return True
+        logger.info("Trading engine stopped successfully")
+        self.health_status = "stopped"
+        return True
 
-def pause(self) -> bool:
+    def pause(self) -> bool:
         """
         Pause trading operations without shutting down.
         
@@ -376,31 +680,73 @@ def pause(self) -> bool:
             self.paused = True
             self.health_status = "paused"
             return True
-        def resume(self) -> bool:
-            """
-            Resume trading operations after a pause.
+
+    def resume(self) -> bool:
+        """
+        Resume trading operations after a pause.
             
-            Restarts trading activities using the existing
-            exchange connections and system state.
+        Restarts trading activities using the existing
+        exchange connections and system state.
             
-            Returns:
-                bool: Indicates successful resume
-            """
-            with self.lock:
-                if not self.running:
-                    logger.warning("Trading engine is not running")
-                    return False
+        Returns:
+            bool: Indicates successful resume
+        """
+        with self.lock:
+            if not self.running:
+                logger.warning("Trading engine is not running")
+                return False
                     
-                if not self.paused:
-                    logger.warning("Trading engine is not paused")
-                    return False
+            if not self.paused:
+                logger.warning("Trading engine is not paused")
+                return False
                     
-                logger.info("Resuming trading engine")
-                self.paused = False
-                self.health_status = "running"
-                return True
+            logger.info("Resuming trading engine")
+            self.paused = False
+            self.health_status = "running"
+            return True
+
+    def update_market_data(self) -> None:
+        """
+        Refresh the market summary cache for all enabled trading pairs.
+
+        A new snapshot is built off to the side and published with a single
+        assignment; symbols that are no longer enabled drop out with it.
+        """
+        if not self.market_analyzer:
+            return
+            
+        try:
+            pairs = (self.trading_config or TradingConfig.get_instance()).get_enabled_pairs()
+        except Exception as e:
+            logger.error(f"Error loading enabled pairs for market data: {str(e)}")
+            return
+            
+        snapshot = {}
+        for symbol in pairs[:self.max_market_data_symbols]:
+            try:
+                snapshot[symbol] = self.market_analyzer.get_market_summary(symbol)
+            except Exception as e:
+                logger.error(f"Error updating market data for {symbol}: {str(e)}")
+                
+        if snapshot:
+            self.market_data_cache = snapshot
+            self._market_data_expires = time.monotonic() + self.market_data_ttl
+
+    def get_market_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached market summary for a symbol.
+
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Dict: Market summary, or None if missing or the snapshot has expired
+        """
+        if time.monotonic() >= self._market_data_expires:
+            return None
+        return self.market_data_cache.get(symbol)
 
-def _trading_loop(self) -> None:
+    def _trading_loop(self) -> None:
         """
         Primary trading execution loop.
 
@@ -408,55 +754,84 @@ def _trading_loop(self) -> None:
         while respecting system shutdown signals.
         """
         error_count = 0
-        last_market_update = 0
         
         while self.running and not self.shutdown_event.is_set():
             try:
                 # Skip processing if paused
                 if self.paused:
-                    time.sleep(1)
+                    if self.shutdown_event.wait(timeout=1):
+                        break
                     continue
                     
                 # Update market data periodically
-                current_time = time.time()
-                if current_time - last_market_update > self.market_update_interval:
+                now = time.monotonic()
+                if now >= self._next_market_update:
                     self.update_market_data()
-                    last_market_update = current_time
+                    self._next_market_update = now + self.market_update_interval
                 
                 # Load and process active users
                 active_users = self._load_active_users()
-                
-                for user in active_users:
-                    self._process_user_strategies(user)
+                self._process_users(active_users)
                 
                 # Reset error count on successful iteration
                 error_count = 0
                 
-                # Prevent high CPU usage
-                time.sleep(1)
+                # Prevent high CPU usage; returns at once on shutdown
+                if self.shutdown_event.wait(timeout=1):
+                    break
             
             except Exception as e:
                 error_count += 1
                 error_message = str(e)
                 
-                # Track error frequency
-                if error_message not in self.error_counts:
-                    self.error_counts[error_message] = [0, time.time()]
-                self.error_counts[error_message][0] += 1
-                self.error_counts[error_message][1] = time.time()
-                
-                logger.error(f"Critical error in trading loop: {error_message}")
+                # Track error frequency by type so varying messages do not grow the map
+                self._track_error(e, error_message)
                 
                 # Implement exponential backoff for repeated errors
                 backoff_time = min(self.error_backoff_time * (2 ** (error_count - 1)), 60)
-                time.sleep(backoff_time)
+                if self.shutdown_event.wait(timeout=backoff_time):
+                    break
                 
                 # If too many consecutive errors, mark health as degraded
                 if error_count >= self.max_consecutive_errors:
                     self.health_status = "degraded"
                     logger.critical(f"Trading engine health degraded after {error_count} consecutive errors")
 
-def _load_active_users(self) -> List[Any]:
+    def _track_error(self, error: Exception, error_message: str) -> None:
+        """
+        Count an error by type in a bounded map and log it at a limited rate.
+
+        Args:
+            error: The exception raised
+            error_message: Its message
+        """
+        now = time.time()
+        error_key = f"{type(error).__name__}:{type(error).__module__}"
+        
+        entry = self.error_counts.get(error_key)
+        if entry is None:
+            entry = self.error_counts[error_key] = [0, now, error_message]
+            if len(self.error_counts) > self.max_tracked_errors:
+                evicted_key, _ = self.error_counts.popitem(last=False)
+                self._last_error_log.pop(evicted_key, None)
+                if evicted_key == self._top_error[0]:
+                    # Rare: rescan for the new leader
+                    top_key, top_entry = max(self.error_counts.items(), key=lambda x: x[1][0])
+                    self._top_error = (top_key, top_entry[0])
+        else:
+            self.error_counts.move_to_end(error_key)
+        entry[0] += 1
+        entry[1] = now
+        entry[2] = error_message
+        if entry[0] > self._top_error[1] or error_key == self._top_error[0]:
+            self._top_error = (error_key, entry[0])
+        
+        # Rate-limit log emission during error storms
+        if now - self._last_error_log.get(error_key, 0) >= self.error_log_interval:
+            self._last_error_log[error_key] = now
+            logger.error(f"Critical error in trading loop: {error_message} (seen {entry[0]} times)")
+
+    def _load_active_users(self) -> List[Any]:
         """
         Retrieve and initialize active users for trading with schema adaptation.
         
@@ -468,139 +843,149 @@ def _load_active_users(self) -> List[Any]:
         """
         try:
             # Only refresh user list periodically
-            current_time = time.time()
-            if current_time - self.last_user_refresh < self.user_refresh_interval and self.active_users_cache:
+            now = time.monotonic()
+            if now < self._next_user_refresh and self.active_users_cache:
                 return self.active_users_cache
                 
-            active_users = []
-            
-            # Use user repository directly with schema-adaptive approach
-            if self.user_repository:
-                # Check if repository has schema-adaptive methods
-                if hasattr(self.user_repository, 'get_active_users'):
-                    try:
-                        active_users = self.user_repository.get_active_users()
-                    except Exception as e:
-                        # Handle schema-related errors
-                        if "column users.is_admin does not exist" in str(e):
-                            logger.warning("Using fallback method for active users due to schema issue")
-                            active_users = self._get_active_users_fallback()
-                        else:
-                            logger.error(f"Error getting active users: {str(e)}")
-                            # Use cached users if available
-                            return self.active_users_cache or []
-                else:
-                    # Old repository without enhanced methods
-                    active_users = self._get_active_users_fallback()
-            else:
-                # Fallback to database if direct repository not available
-                try:
-                    user_repo = self.db.get_repository('user')
-                    active_users = user_repo.get_active_users()
-                except Exception as e:
-                    logger.error(f"Failed to get user repository: {str(e)}")
-                    # Try raw query as last resort
-                    active_users = self._get_active_users_fallback()
-            
-            if not active_users and self.active_users_cache:
-                # If we failed to get users but have a cache, use it
-                logger.warning("Failed to get active users, using cached data")
+            # Single-flight refresh: while one caller queries the database,
+            # others keep serving the cached list instead of stampeding it
+            if not self._user_refresh_lock.acquire(blocking=not self.active_users_cache):
                 return self.active_users_cache
-            
-            # Update cache
-            self.active_users_cache = active_users
-            self.last_user_refresh = current_time
-
-            # Initialize exchange connections for new users
-            for user in active_users:
-                if user.id not in self.user_exchange_map:
-                    self._initialize_user(user)
-
-            return active_users
+            try:
+                # Another caller may have refreshed while we waited
+                if time.monotonic() < self._next_user_refresh and self.active_users_cache:
+                    return self.active_users_cache
+                return self._refresh_active_users(now)
+            finally:
+                self._user_refresh_lock.release()
         
         except Exception as e:
             logger.error(f"Error loading active users: {str(e)}")
             # Return cached users if available, otherwise empty list
             return self.active_users_cache or []
 
-    # The remaining methods (_get_active_users_fallback, _initialize_user, 
-    # _close_exchange_connections, etc.) would continue here
+    def _refresh_active_users(self, now: float) -> List[Any]:
+        """
+        Query active users, update the cache and initialize new users.
+
+        Callers must hold self._user_refresh_lock.
+
+        Args:
+            now: time.monotonic() value the next refresh is scheduled from
+
+        Returns:
+            List of active users
+        """
+        active_users = []
+        
+        # Use user repository directly with schema-adaptive approach
+        if self.user_repository:
+            # Check if repository has schema-adaptive methods
+            if self._use_fallback_users:
+                # Schema probe found the ORM query cannot run
+                active_users = self._get_active_users_fallback()
+            elif hasattr(self.user_repository, 'get_active_users'):
+                try:
+                    active_users = self.user_repository.get_active_users()
+                except Exception as e:
+                    logger.error(f"Error getting active users: {str(e)}")
+                    # Use cached users if available
+                    return self.active_users_cache or []
+            else:
+                # Old repository without enhanced methods
+                active_users = self._get_active_users_fallback()
+        else:
+            # Fallback to database if direct repository not available
+            try:
+                user_repo = self.db.get_repository('user')
+                active_users = user_repo.get_active_users()
+            except Exception as e:
+                logger.error(f"Failed to get user repository: {str(e)}")
+                # Try raw query as last resort
+                active_users = self._get_active_users_fallback()
+        
+        if not active_users and self.active_users_cache:
+            # If we failed to get users but have a cache, use it
+            logger.warning("Failed to get active users, using cached data")
+            return self.active_users_cache
+        
+        # Update cache
+        self.active_users_cache = active_users
+        self._next_user_refresh = now + self.user_refresh_interval
+
+        # Initialize exchange connections for new users
+        for user in active_users:
+            if self._get_exchange(user.id) is None:
+                self._initialize_user(user)
+
+        return active_users
 
-def _get_active_users_fallback(self) -> List[Any]:
+    def _get_active_users_fallback(self) -> List[Any]:
         """
         Fallback method to get active users without relying on ORM.
         
-        Uses raw SQL queries to bypass potential schema issues.
+        Uses raw SQL queries to bypass potential schema issues. The query path is
+        chosen once at construction; a failure is reported and an empty list
+        returned so the caller can keep serving its cached users.
         
         Returns:
-            List of User objects with is_active=True
+            List of ActiveUserView objects for users with is_active=True
         """
-        from database.models.user import User  # Import here to avoid circular imports
-        
         if not self.db:
             return []
             
+        if self._exec_query is None:
+            return self._get_active_users_via_session()
+            
         try:
-            # Try direct SQL query with only essential fields
-            users = []
+            result = self._exec_query("SELECT id, telegram_id, email, username, first_name, last_name FROM users WHERE is_active = true")
             
-            try:
-                # Use database's execute_query method if available
-                if hasattr(self.db, 'execute_query'):
-                    result = self.db.execute_query("SELECT id, telegram_id, email, username, first_name, last_name FROM users WHERE is_active = true")
-                    
-                    # Convert results to User objects
-                    for row in result:
-                        user = User(
-                            id=row.get('id'),
-                            telegram_id=row.get('telegram_id'),
-                            email=row.get('email'),
-                            username=row.get('username'),
-                            first_name=row.get('first_name'),
-                            last_name=row.get('last_name'),
-                            is_active=True,
-                            is_admin=False  # Default value for missing column
-                        )
-                        users.append(user)
-                    
-                    return users
-            except Exception as e:
-                logger.error(f"Error in fallback query: {str(e)}")
-                
-            # Last resort - use SQLAlchemy session directly
-            try:
-                session = self.db.get_session()
-                try:
-                    from sqlalchemy import text
-                    result = session.execute(text("SELECT id, telegram_id, email, username FROM users WHERE is_active = true"))
-                    
-                    for row in result:
-                        # Manual mapping of result rows to User objects
-                        user = User(
-                            id=row[0],
-                            telegram_id=row[1],
-                            email=row[2],
-                            username=row[3],
-                            is_active=True,
-                            is_admin=False
-                        )
-                        users.append(user)
-                        
-                    return users
-                except Exception as inner_e:
-                    logger.error(f"Error in SQLAlchemy direct query: {str(inner_e)}")
-                    return []
-                finally:
-                    session.close()
-            except Exception as session_e:
-                logger.error(f"Error getting session: {str(session_e)}")
-                return []
-                
+            # Plain views avoid ORM identity-map and change-tracking overhead;
+            # is_admin defaults to False for the missing column
+            return [
+                ActiveUserView(
+                    row.get('id'),
+                    row.get('telegram_id'),
+                    row.get('email'),
+                    row.get('username'),
+                    row.get('first_name'),
+                    row.get('last_name')
+                )
+                for row in result
+            ]
         except Exception as e:
-            logger.error(f"All fallback methods failed: {str(e)}")
+            logger.error(f"Error in fallback query: {str(e)}")
             return []
 
-def _initialize_user(self, user) -> bool:
+    def _get_active_users_via_session(self) -> List[Any]:
+        """
+        Query active users through a SQLAlchemy session.
+        
+        Used by the fallback when the database manager has no execute_query,
+        and available for manual diagnostics.
+        
+        Returns:
+            List of ActiveUserView objects for users with is_active=True
+        """
+        from sqlalchemy import text
+        
+        session = None
+        try:
+            session = self.db.get_session()
+            # Stream rows from a server-side cursor instead of buffering the whole result
+            query = text("SELECT id, telegram_id, email, username FROM users WHERE is_active = true")
+            result = session.execute(query.execution_options(stream_results=True)).yield_per(1000)
+            
+            # Rows are (id, telegram_id, email, username)
+            return [ActiveUserView(*row) for row in result]
+        except Exception as e:
+            logger.error(f"Error in SQLAlchemy direct query: {str(e)}")
+            return []
+        finally:
+            if session is not None:
+                session.close()
+
+    def _initialize_user(self, user) -> bool:
         """
         Establish exchange connection and strategies for a user.
 
@@ -645,7 +1030,8 @@ def _initialize_user(self, user) -> bool:
                 return False
 
             # Store exchange and initialize strategies
-            self.user_exchange_map[user.id] = exchange
+            with self.lock:
+                self._set_exchange(user.id, exchange)
             self._initialize_user_strategies(user)
 
             logger.info(f"Initialized user {user.id} trading environment")
@@ -655,23 +1041,40 @@ def _initialize_user(self, user) -> bool:
             logger.error(f"User initialization failed for user {user.id}: {str(e)}")
             return False
 
-def _close_exchange_connections(self):
+    def _initialize_user_strategies(self, user) -> None:
+        """
+        Build and cache a newly initialized user's strategies.
+
+        Args:
+            user: User object
+        """
+        strategies = self._get_user_strategies(user)
+        logger.info(f"Loaded {len(strategies)} strategies for user {user.id}")
+
+    def _close_exchange_connections(self):
         """
         Safely close all active exchange connections.
         
         Ensures proper shutdown of all user exchange instances.
+        Must be called without holding self.lock.
         """
-        for user_id, exchange in list(self.user_exchange_map.items()):
+        # Detach the maps under the lock; closing is network I/O and runs outside it
+        with self.lock:
+            exchanges = list(self.user_exchange_map.items())
+            self.user_exchange_map.clear()
+            self._user_exchange_list.clear()
+            self._user_exchange_overflow.clear()
+            self.user_strategy_map.clear()
+            self._active_strategies_count = 0
+        
+        for user_id, exchange in exchanges:
             try:
                 exchange.close()
                 logger.info(f"Closed exchange connection for user {user_id}")
             except Exception as e:
                 logger.error(f"Exchange connection close error for user {user_id}: {str(e)}")
-        
-        self.user_exchange_map.clear()
-        self.user_strategy_map.clear()
 
-def _process_signal(self, user, exchange, strategy, signal) -> bool:
+    def _process_signal(self, user, exchange, strategy, signal) -> bool:
         """
         Process a trading signal through risk validation and execution.
 
@@ -695,10 +1098,31 @@ def _process_signal(self, user, exchange, strategy, signal) -> bool:
             if not validated_signal:
                 return False
 
+            return self._execute_signal(user, exchange, strategy, validated_signal)
+
+        except Exception as e:
+            logger.error(f"Error processing signal for user {user.id}: {str(e)}")
+            return False
+
+    def _execute_signal(self, user, exchange, strategy, validated_signal) -> bool:
+        """
+        Execute a risk-validated signal, then record and announce the trade.
+
+        Args:
+            user: User object
+            exchange: Exchange instance
+            strategy: Trading strategy
+            validated_signal: Signal accepted by the risk manager
+            
+        Returns:
+            bool: Success status of trade execution
+        """
+        user_id = user.id
+        try:
             # Execute trade
             trade_result = exchange.execute_trade(validated_signal)
             if not trade_result:
-                logger.warning(f"Trade execution failed for user {user.id}, symbol {signal.symbol}")
+                logger.warning(f"Trade execution failed for user {user_id}, symbol {validated_signal.symbol}")
                 return False
 
             # Record and notify successful trades
@@ -707,12 +1131,12 @@ def _process_signal(self, user, exchange, strategy, signal) -> bool:
             return True
 
         except Exception as e:
-            logger.error(f"Error processing signal for user {user.id}: {str(e)}")
+            logger.error(f"Error executing signal for user {user_id}: {str(e)}")
             return False
 
-def _record_trade(self, user, strategy, signal, trade_result) -> bool:
+    def _record_trade(self, user, strategy, signal, trade_result) -> bool:
         """
-        Record trade details in the database.
+        Queue trade details for the next bulk write to the database.
 
         Args:
             user: User object
@@ -721,57 +1145,98 @@ def _record_trade(self, user, strategy, signal, trade_result) -> bool:
             trade_result: Execution result
             
         Returns:
-            bool: Success status of trade recording
+            bool: Success status of queueing the trade
+        """
+        if self._trade_repo is None:
+            logger.warning(f"No trade repository available, trade for user {user.id} not recorded")
+            return False
+            
+        trade = TradeRow(
+            user.id,
+            strategy.name,
+            signal.symbol,
+            signal.side,
+            trade_result.price,
+            trade_result.quantity,
+            signal.take_profit,
+            signal.stop_loss,
+            trade_result.trade_id,
+            trade_result.timestamp
+        )
+        with self._trade_buffer_lock:
+            self._trade_buffer.append(trade)
+            buffered = len(self._trade_buffer)
+            
+        # Wake the flusher early once a full batch is waiting
+        if buffered >= self.trade_flush_batch_size:
+            self._trade_flush_event.set()
+        return True
+
+    def _send_trade_notification(self, user, strategy, signal, trade_result) -> None:
+        """
+        Tell the user about an executed trade.
+
+        A failed notification is logged and never fails the trade itself.
+
+        Args:
+            user: User object
+            strategy: Trading strategy
+            signal: Trading signal
+            trade_result: Execution result
         """
+        if not self.notification_manager:
+            return
+            
         try:
-            # Try using trade repository directly
-            if self.trade_repository:
-                try:
-                    self.trade_repository.add_trade(
-                        user_id=user.id,
-                        strategy_name=strategy.name,
-                        symbol=signal.symbol,
-                        side=signal.side,
-                        entry_price=trade_result.price,
-                        quantity=trade_result.quantity,
-                        take_profit=signal.take_profit,
-                        stop_loss=signal.stop_loss,
-                        trade_id=trade_result.trade_id,
-                        timestamp=trade_result.timestamp
-                    )
-                    return True
-                except Exception as e:
-                    logger.error(f"Error using trade repository: {str(e)}")
-                    # Continue to fallback
+            self.notification_manager.send_trade_notification(user, strategy, signal, trade_result)
+        except Exception as e:
+            logger.error(f"Error sending trade notification to user {user.id}: {str(e)}")
+
+    def _trade_flush_loop(self) -> None:
+        """
+        Write buffered trades every trade_flush_interval seconds, or sooner when a batch fills.
+        """
+        while self.running:
+            self._trade_flush_event.wait(timeout=self.trade_flush_interval)
+            self._trade_flush_event.clear()
+            self._flush_trades()
+
+    def _flush_trades(self) -> int:
+        """
+        Write all buffered trades to the database in one bulk insert.
+
+        Falls back to per-trade inserts if the bulk insert fails, so one bad
+        row cannot hold back the rest of the batch.
+
+        Returns:
+            int: Number of trades written
+        """
+        with self._trade_buffer_lock:
+            if not self._trade_buffer:
+                return 0
+            batch = list(self._trade_buffer)
+            self._trade_buffer.clear()
+            
+        trade_repo = self._trade_repo
+        if trade_repo is None:
+            logger.warning(f"No trade repository available, {len(batch)} trades not recorded")
+            return 0
+            
+        try:
+            written = trade_repo.add_trades_bulk(batch)
+            if written:
+                return written
                 
-            # Fallback to database if needed
-            if self.db:
-                try:
-                    trade_repo = self.db.get_repository('trade')
-                    trade_repo.add_trade(
-                        user_id=user.id,
-                        strategy_name=strategy.name,
-                        symbol=signal.symbol,
-                        side=signal.side,
-                        entry_price=trade_result.price,
-                        quantity=trade_result.quantity,
-                        take_profit=signal.take_profit,
-                        stop_loss=signal.stop_loss,
-                        trade_id=trade_result.trade_id,
-                        timestamp=trade_result.timestamp
-                    )
-                    return True
-                except Exception as e:
-                    logger.error(f"Error using database trade repository: {str(e)}")
-                    
-            logger.warning("No trade repository available, trade not recorded")
-            return False
+            written = sum(1 for trade in batch if trade_repo.add_trade(*trade))
+            if written < len(batch):
+                logger.error(f"Failed to record {len(batch) - written} of {len(batch)} trades")
+            return written
             
         except Exception as e:
-            logger.error(f"Error recording trade for user {user.id}: {str(e)}")
-            return False
+            logger.error(f"Error flushing {len(batch)} trades: {str(e)}")
+            return 0
         
-def evaluate_strategies(self):
+    def evaluate_strategies(self):
         """
         Evaluate the effectiveness of trading strategies.
         
@@ -788,8 +1253,12 @@ def evaluate_strategies(self):
                 logger.warning("Trade repository not available, skipping strategy evaluation")
                 return {}
             
-            # Get strategy performance metrics
-            strategy_metrics = self._get_strategy_performance_metrics()
+            # Get strategy performance metrics, reused until trades change or the TTL lapses
+            strategy_metrics = self._cached_metric(
+                'strategy_metrics',
+                self._repository_revision(self.trade_repository),
+                self._get_strategy_performance_metrics
+            )
             
             # Log strategy performance
             for strategy_name, metrics in strategy_metrics.items():
@@ -806,7 +1275,7 @@ def evaluate_strategies(self):
             logger.error(f"Strategy evaluation failed: {str(e)}")
             return {}
 
-def _get_strategy_performance_metrics(self) -> Dict[str, Dict[str, float]]:
+    def _get_strategy_performance_metrics(self) -> Dict[str, Dict[str, float]]:
         """
         Calculate performance metrics for each strategy.
         
@@ -814,41 +1283,43 @@ def _get_strategy_performance_metrics(self) -> Dict[str, Dict[str, float]]:
             Dict: Detailed performance metrics by strategy name
         """
         try:
-            metrics = {}
-            
+            if self._strategy_metrics_cache is not None:
+                return self._strategy_metrics_cache.get_metrics(30)
+                
+            # Let the database group and aggregate when the repository supports it
+            if hasattr(self.trade_repository, 'get_strategy_metrics_since_days'):
+                return self.trade_repository.get_strategy_metrics_since_days(30)
+                
             # Get all trades from the past 30 days
             recent_trades = self.trade_repository.get_trades_since_days(30)
+            if not recent_trades:
+                return {}
             
-            # Group trades by strategy
-            strategy_trades = {}
-            for trade in recent_trades:
-                strategy_name = trade.strategy_name
-                if strategy_name not in strategy_trades:
-                    strategy_trades[strategy_name] = []
-                strategy_trades[strategy_name].append(trade)
-            
-            # Calculate metrics for each strategy
-            for strategy_name, trades in strategy_trades.items():
-                win_count = sum(1 for trade in trades if trade.profit_pct > 0)
-                total_count = len(trades)
-                win_rate = (win_count / total_count * 100) if total_count > 0 else 0
-                
-                profits = [trade.profit_pct for trade in trades]
-                avg_profit = sum(profits) / len(profits) if profits else 0
-                
-                metrics[strategy_name] = {
-                    'win_rate': win_rate,
-                    'avg_profit': avg_profit,
+            # Extract the two columns once, then group-reduce per strategy with bincount
+            names = np.array([trade.strategy_name for trade in recent_trades])
+            profits = np.fromiter((trade.profit_pct for trade in recent_trades), dtype=np.float64, count=len(recent_trades))
+            strategy_names, groups = np.unique(names, return_inverse=True)
+            
+            trade_counts = np.bincount(groups)
+            win_counts = np.bincount(groups, weights=profits > 0)
+            profit_sums = np.bincount(groups, weights=profits)
+            
+            return {
+                strategy_name: {
+                    'win_rate': win_count / total_count * 100,
+                    'avg_profit': profit_sum / total_count,
                     'trade_count': total_count
                 }
-                
-            return metrics
+                for strategy_name, total_count, win_count, profit_sum in zip(
+                    strategy_names.tolist(), trade_counts.tolist(), win_counts.tolist(), profit_sums.tolist()
+                )
+            }
             
         except Exception as e:
             logger.error(f"Error calculating strategy metrics: {str(e)}")
             return {}
 
-def check_risk_exposure(self) -> Dict[str, Any]:
+    def check_risk_exposure(self) -> Dict[str, Any]:
         """
         Check current risk exposure across all users and positions.
         
@@ -866,8 +1337,31 @@ def check_risk_exposure(self) -> Dict[str, Any]:
                 logger.warning("Position repository not available, skipping risk exposure check")
                 return {}
                 
-            # Get all active positions
-            active_positions = self.position_repository.get_all_active_positions()
+            # Reuse the last report until positions change or the TTL lapses
+            return self._cached_metric(
+                'risk_exposure',
+                self._repository_revision(self.position_repository),
+                self._compute_risk_exposure
+            )
+            
+        except Exception as e:
+            logger.error(f"Error conducting comprehensive risk exposure check: {str(e)}")
+            return {}
+
+    def _compute_risk_exposure(self) -> Dict[str, Any]:
+        """
+        Compute the risk exposure report from current positions.
+        
+        Returns:
+            Dict with comprehensive risk exposure metrics
+        """
+        try:
+            # Let the database aggregate per user when the repository supports it
+            if hasattr(self.position_repository, 'get_exposure_by_user'):
+                return self._check_risk_exposure_aggregated()
+                
+            # Get all active positions, each user's contiguous
+            active_positions = self._active_positions_snapshot()
             if not active_positions:
                 logger.info("No active positions for risk assessment")
                 return {
@@ -876,29 +1370,25 @@ def check_risk_exposure(self) -> Dict[str, Any]:
                     "users_at_risk": 0
                 }
                 
-            # Calculate risk metrics
-            total_exposure = sum(p.current_quantity * p.average_entry_price for p in active_positions)
+            # Read the position columns once; every figure below is computed on the arrays
+            columns = self._position_columns(active_positions)
+            user_ids, quantity, entry_price = columns[0], columns[1], columns[2]
+            position_value = quantity * entry_price
+            total_exposure = float(position_value.sum())
+            
+            # Positions arrive grouped by user, so per-user exposure is a sum over
+            # each run of equal user IDs
+            run_starts = np.flatnonzero(np.concatenate(([True], user_ids[1:] != user_ids[:-1])))
+            user_exposure = np.add.reduceat(position_value, run_starts)
+            
+            # Count users at or near max risk, by exposure threshold
+            users_at_risk = int(np.count_nonzero(user_exposure > self.user_exposure_threshold))
             
             # Identify positions at high risk
             high_risk_positions = self.position_repository.get_positions_at_risk(threshold_percentage=3.0)
-            
-            # Group positions by user
-            user_positions = {}
-            for position in active_positions:
-                if position.user_id not in user_positions:
-                    user_positions[position.user_id] = []
-                user_positions[position.user_id].append(position)
-                
-            # Count users at or near max risk
-            users_at_risk = 0
-            for user_id, positions in user_positions.items():
-                user_exposure = sum(p.current_quantity * p.average_entry_price for p in positions)
-                # Determine if user is at risk based on exposure threshold
-                if user_exposure > 5000:  # Example threshold
-                    users_at_risk += 1
                     
             # Simulate potential max drawdown
-            max_drawdown_risk = self._calculate_max_drawdown_risk(active_positions)
+            max_drawdown_risk = self._calculate_max_drawdown_risk(active_positions, total_exposure, columns)
             
             risk_report = {
                 "total_exposure": total_exposure,
@@ -915,12 +1405,137 @@ def check_risk_exposure(self) -> Dict[str, Any]:
             logger.error(f"Error conducting comprehensive risk exposure check: {str(e)}")
             return {}
 
-def _calculate_max_drawdown_risk(self, positions) -> float:
+    def _repository_revision(self, repository) -> Optional[int]:
+        """
+        Get a repository's write revision, if it tracks one.
+        
+        Args:
+            repository: Repository instance
+            
+        Returns:
+            int: Revision, or None if the repository does not track writes
+        """
+        revision = getattr(repository, 'revision', None)
+        return revision() if callable(revision) else None
+
+    def _active_positions_snapshot(self) -> List[Any]:
+        """
+        Get all active positions ordered by user, sharing one fetch between callers.
+        
+        The list is reused while the position repository revision is unchanged
+        and it is younger than positions_snapshot_ttl; callers must not mutate it.
+        
+        Returns:
+            List of active positions
+        """
+        revision = self._repository_revision(self.position_repository)
+        now = time.monotonic()
+        cached_revision, expires, positions = self._positions_snapshot
+        if positions is not None and cached_revision == revision and now < expires:
+            return positions
+            
+        positions = self.position_repository.get_all_active_positions(order_by_user=True)
+        self._positions_snapshot = (revision, now + self.positions_snapshot_ttl, positions)
+        return positions
+
+    def _cached_metric(self, name: str, revision: Optional[int], compute) -> Any:
+        """
+        Return a cached monitoring result, recomputing it when stale.
+        
+        A result is reused while the source revision is unchanged and it is
+        younger than metric_cache_ttl. Empty (failed) results are not cached.
+        
+        Args:
+            name: Cache entry name
+            revision: Revision of the data the result derives from
+            compute: Callable producing a fresh result
+            
+        Returns:
+            Cached or freshly computed result
+        """
+        now = time.monotonic()
+        cached = self._metric_cache.get(name)
+        if cached is not None and cached[0] == revision and now < cached[1]:
+            self._metric_cache_stats['hits'] += 1
+            return cached[2]
+            
+        self._metric_cache_stats['misses'] += 1
+        value = compute()
+        if value:
+            self._metric_cache[name] = (revision, now + self.metric_cache_ttl, value)
+        return value
+
+    def _check_risk_exposure_aggregated(self) -> Dict[str, Any]:
+        """
+        Build the risk exposure report from per-user aggregates computed in SQL.
+        
+        Returns:
+            Dict with comprehensive risk exposure metrics
+        """
+        exposure_rows = self.position_repository.get_exposure_by_user()
+        if not exposure_rows:
+            logger.info("No active positions for risk assessment")
+            return {
+                "total_exposure": 0, 
+                "max_drawdown_risk": 0, 
+                "users_at_risk": 0
+            }
+            
+        # Columns: user_id, positions_count, exposure, potential_loss
+        totals = np.array(exposure_rows, dtype=np.float64)
+        positions_count = int(totals[:, 1].sum())
+        total_exposure = float(totals[:, 2].sum())
+        potential_loss = float(totals[:, 3].sum())
+        
+        # Identify positions at high risk
+        high_risk_positions = self.position_repository.get_positions_at_risk(threshold_percentage=3.0)
+        
+        risk_report = {
+            "total_exposure": total_exposure,
+            "positions_count": positions_count,
+            "high_risk_positions": len(high_risk_positions),
+            # Users at or near max risk, by exposure threshold
+            "users_at_risk": int(np.count_nonzero(totals[:, 2] > self.user_exposure_threshold)),
+            "max_drawdown_risk": (potential_loss / total_exposure) * 100 if total_exposure else 0.0
+        }
+        
+        logger.info(f"Comprehensive risk assessment completed: {risk_report}")
+        return risk_report
+
+    def _position_columns(self, positions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract the numeric position fields into arrays in a single pass.
+        
+        Args:
+            positions: List of positions
+            
+        Returns:
+            Tuple of (user_id, quantity, entry_price, stop_loss, is_long) arrays;
+            a missing (or zero) stop loss becomes NaN
+        """
+        count = len(positions)
+        user_ids = np.empty(count, dtype=np.int64)
+        quantity = np.empty(count)
+        entry_price = np.empty(count)
+        stop_loss = np.empty(count)
+        is_long = np.empty(count, dtype=bool)
+        for i, position in enumerate(positions):
+            user_ids[i] = position.user_id
+            quantity[i] = position.current_quantity
+            entry_price[i] = position.average_entry_price
+            stop_loss[i] = position.stop_loss or np.nan
+            # Sides may be stored as "buy"/"sell" or as PositionSide enums
+            is_long[i] = getattr(position.side, 'value', position.side) in ("buy", "long")
+        return user_ids, quantity, entry_price, stop_loss, is_long
+
+    def _calculate_max_drawdown_risk(self, positions, total_value: Optional[float] = None, columns=None) -> float:
         """
         Calculate potential maximum drawdown risk.
         
         Args:
             positions: List of active positions
+            total_value: Total portfolio value, if the caller already summed it
+            columns: Arrays from _position_columns(positions), if the caller already built them
             
         Returns:
             float: Estimated maximum drawdown as percentage
@@ -929,31 +1544,33 @@ def _calculate_max_drawdown_risk(self, positions) -> float:
             if not positions:
                 return 0.0
                 
+            if columns is None:
+                columns = self._position_columns(positions)
+            _, quantity, entry_price, stop_loss, is_long = columns
+                
             # Calculate total portfolio value
-            total_value = sum(p.current_quantity * p.average_entry_price for p in positions)
+            position_value = quantity * entry_price
+            if total_value is None:
+                total_value = position_value.sum()
             if total_value == 0:
                 return 0.0
                 
-            potential_loss = 0
-            for position in positions:
-                if position.stop_loss:
-                    # Calculate potential loss based on position side
-                    if position.side == "buy":
-                        position_loss = (position.average_entry_price - position.stop_loss) * position.current_quantity
-                    else:
-                        position_loss = (position.stop_loss - position.average_entry_price) * position.current_quantity
-                    potential_loss += max(0, position_loss)
-                else:
-                    # If no stop loss, assume 100% loss (worst-case scenario)
-                    potential_loss += position.current_quantity * position.average_entry_price
+            # Loss if each stop is hit, never negative; with no stop loss,
+            # assume 100% loss (worst-case scenario)
+            stop_distance = np.where(is_long, entry_price - stop_loss, stop_loss - entry_price)
+            position_loss = np.where(
+                np.isnan(stop_loss),
+                position_value,
+                np.clip(stop_distance * quantity, 0, None)
+            )
                     
-            return (potential_loss / total_value) * 100
+            return float(position_loss.sum() / total_value * 100)
             
         except Exception as e:
             logger.error(f"Error calculating maximum drawdown risk: {str(e)}")
             return 0.0        
         
-def get_status(self) -> Dict[str, Any]:
+    def get_status(self) -> Dict[str, Any]:
         """
         Retrieve comprehensive status of the trading engine.
         
@@ -963,34 +1580,48 @@ def get_status(self) -> Dict[str, Any]:
         Returns:
             Dict: Comprehensive status information
         """
+        # Copy plain values under the lock and build the result after releasing it
         with self.lock:
-            return {
-                "running": self.running,
-                "paused": self.paused,
-                "health_status": self.health_status,
-                "active_users_count": len(self.active_users_cache),
-                "active_exchanges_count": len(self.user_exchange_map),
-                "active_strategies_count": sum(len(strat_list) for strat_list in self.user_strategy_map.values()),
-                "market_data_age_seconds": time.time() - self.last_market_update if self.last_market_update else None,
-                "user_data_age_seconds": time.time() - self.last_user_refresh if self.last_user_refresh else None,
-                "last_error": self._get_last_error(),
-                "schema_verified": self.schema_verified
-            }
+            running = self.running
+            paused = self.paused
+            health_status = self.health_status
+            active_users_count = len(self.active_users_cache)
+            active_exchanges_count = len(self.user_exchange_map)
+            active_strategies_count = self._active_strategies_count
+            metric_cache = dict(self._metric_cache_stats)
+            schema_verified = self.schema_verified
+            
+        # The refresh deadlines are single float attributes, each replaced by one
+        # assignment, so reading them needs no lock
+        next_market_update = self._next_market_update
+        next_user_refresh = self._next_user_refresh
+        now = time.monotonic()
+        return {
+            "running": running,
+            "paused": paused,
+            "health_status": health_status,
+            "active_users_count": active_users_count,
+            "active_exchanges_count": active_exchanges_count,
+            "active_strategies_count": active_strategies_count,
+            "market_data_age_seconds": now - (next_market_update - self.market_update_interval) if next_market_update else None,
+            "user_data_age_seconds": now - (next_user_refresh - self.user_refresh_interval) if next_user_refresh else None,
+            "last_error": self._get_last_error(),
+            "metric_cache": metric_cache,
+            "schema_verified": schema_verified
+        }
 
-def _get_last_error(self) -> Optional[str]:
+    def _get_last_error(self) -> Optional[str]:
         """
         Retrieve the most recent error message from error tracking.
         
         Returns:
             str: Most recent error message or None if no errors
         """
-        if not self.error_counts:
-            return None
-            
-        max_count_key = max(self.error_counts.items(), key=lambda x: x[1][0])
-        return max_count_key[0]
+        # Most frequent error type; its entry may be mid-eviction on the trading thread
+        entry = self.error_counts.get(self._top_error[0])
+        return entry[2] if entry else None
 
-def reset_engine(self) -> bool:
+    def reset_engine(self) -> bool:
         """
         Perform a comprehensive reset of the trading engine.
         
@@ -1003,15 +1634,24 @@ def reset_engine(self) -> bool:
         try:
             logger.info("Initiating comprehensive trading engine reset")
             
+            # Persist trades recorded before the reset
+            self._flush_trades()
+            
             with self.lock:
                 # Clear system caches
-                self.market_data_cache.clear()
+                self.market_data_cache = {}
+                self._market_data_expires = 0.0
                 self.active_users_cache.clear()
+                self._allocations_by_risk.clear()
+                self._metric_cache.clear()
+                self._positions_snapshot = (None, 0.0, None)
                 self.error_counts.clear()
+                self._last_error_log.clear()
+                self._top_error = (None, 0)
                 
-                # Reset critical timestamps
-                self.last_market_update = 0
-                self.last_user_refresh = 0
+                # Reset refresh deadlines so both run on the next tick
+                self._next_market_update = 0.0
+                self._next_user_refresh = 0.0
                 
                 # Reset schema verification
                 self.schema_verified = False
@@ -1019,50 +1659,95 @@ def reset_engine(self) -> bool:
                 # Revalidate database schema
                 self._verify_database_schema()
                 
-                # Reestablish exchange connections
-                for user_id in list(self.user_exchange_map.keys()):
-                    try:
-                        # Retrieve existing exchange details
-                        old_exchange = self.user_exchange_map[user_id]
-                        exchange_name = old_exchange.name
-                        
-                        # Retrieve API keys
-                        if self.api_key_manager:
-                            api_keys = self.api_key_manager.get_api_keys(user_id)
-                            if api_keys and self.exchange_factory:
-                                # Close previous connection
-                                try:
-                                    old_exchange.close()
-                                except:
-                                    pass
-                                    
-                                # Create new exchange connection
-                                new_exchange = self.exchange_factory.create_exchange(
-                                    exchange_name,
-                                    api_keys['api_key'],
-                                    api_keys['secret_key']
-                                )
-                                
-                                # Initialize and replace exchange
-                                if new_exchange.initialize():
-                                    self.user_exchange_map[user_id] = new_exchange
-                                    logger.info(f"Reestablished exchange connection for user {user_id}")
-                    except Exception as e:
-                        logger.error(f"Exchange reconnection error for user {user_id}: {str(e)}")
+                exchanges = list(self.user_exchange_map.items())
+                
+            # Reestablish exchange connections in parallel and outside the lock;
+            # each reconnect is independent network I/O
+            user_ids = [user_id for user_id, _ in exchanges]
+            if self.exchange_helper and user_ids:
+                # Every user's keys come from one joined query
+                reconnected = self.exchange_helper.get_user_exchanges(user_ids)
+            else:
+                with ThreadPoolExecutor(max_workers=self.reconnect_workers, thread_name_prefix="engine-reconnect") as pool:
+                    reconnected = dict(pool.map(self._reconnect_exchange, user_ids))
+                
+            with self.lock:
+                for user_id, new_exchange in reconnected.items():
+                    if new_exchange:
+                        self._set_exchange(user_id, new_exchange)
                 
                 # Reset health status
                 if self.running:
                     self.health_status = "running"
                 
-                logger.info("Trading engine reset completed successfully")
-                return True
+            # Close the replaced connections once nothing can pick them up;
+            # users whose reconnect failed keep their current connection
+            for user_id, old_exchange in exchanges:
+                if reconnected.get(user_id):
+                    try:
+                        old_exchange.close()
+                    except Exception as e:
+                        logger.error(f"Exchange connection close error for user {user_id}: {str(e)}")
+                
+            logger.info("Trading engine reset completed successfully")
+            return True
                 
         except Exception as e:
             logger.error(f"Comprehensive engine reset failed: {str(e)}")
             self.health_status = "degraded"
             return False
 
-def monitor_positions(self) -> None:
+    def _reconnect_exchange(self, user_id: int) -> Tuple[int, Optional[AbstractExchange]]:
+        """
+        Create a freshly initialized exchange connection for a user.
+
+        The current connection is left open; the caller swaps the new one in
+        under the lock and closes the old one afterwards.
+
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Tuple of user ID and the new exchange, or None if it could not be created
+        """
+        try:
+            # Retrieve API keys
+            if not self.api_key_manager or not self.exchange_factory:
+                return user_id, None
+                
+            api_keys = self.api_key_manager.get_api_keys(user_id)
+            if not api_keys:
+                return user_id, None
+                
+            # Same exchange choice as _initialize_user
+            exchange_name = self.trading_config.get('default_exchange', 'binance') if self.trading_config else 'binance'
+            user = self.user_repository.get_user_by_id(user_id) if self.user_repository else None
+            if user is not None:
+                exchange_name = getattr(user, 'preferred_exchange', None) or exchange_name
+                
+            # Create new exchange connection
+            new_exchange = self.exchange_factory.create_exchange(
+                exchange_name,
+                api_keys['api_key'],
+                api_keys['secret_key']
+            )
+            
+            if not new_exchange:
+                return user_id, None
+                
+            if new_exchange.initialize():
+                logger.info(f"Reestablished exchange connection for user {user_id}")
+                return user_id, new_exchange
+                
+            new_exchange.close()
+            logger.warning(f"Failed to reinitialize exchange for user {user_id}, keeping current connection")
+            return user_id, None
+            
+        except Exception as e:
+            logger.error(f"Exchange reconnection error for user {user_id}: {str(e)}")
+            return user_id, None
+
+    def monitor_positions(self) -> None:
         """
         Continuously monitor and manage active trading positions.
         
@@ -1077,20 +1762,40 @@ def monitor_positions(self) -> None:
                 logger.warning("Position repository unavailable, skipping position monitoring")
                 return
                 
-            # Retrieve all active positions
-            active_positions = self.position_repository.get_all_active_positions()
+            # Retrieve all active positions, each user's contiguous
+            active_positions = self._active_positions_snapshot()
             if not active_positions:
                 logger.info("No active positions to monitor")
                 return
                 
-            # Process each active position
-            for position in active_positions:
-                self._monitor_position(position)
+            # One worker per user, so a user's positions share that user's exchange
+            # connection sequentially while different users are checked concurrently
+            positions_by_user = [
+                list(user_positions)
+                for _, user_positions in groupby(active_positions, key=attrgetter('user_id'))
+            ]
+                
+            workers = min(self.monitor_workers, len(positions_by_user))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="engine-monitor") as pool:
+                list(pool.map(self._monitor_user_positions, positions_by_user))
                 
             logger.info(f"Completed monitoring {len(active_positions)} active positions")
             
         except Exception as e:
             logger.error(f"Position monitoring process encountered an error: {str(e)}")
 
+    def _monitor_user_positions(self, positions: List) -> None:
+        """
+        Monitor one user's active positions in order.
+
+        Args:
+            positions: Active positions belonging to a single user
+        """
+        for position in positions:
+            try:
+                self._monitor_position(position)
+            except Exception as e:
+                logger.error(f"Error monitoring position {position.id} for user {position.user_id}: {str(e)}")
+
 # Maintain backward compatibility
 Engine = TradingEngine        
\ No newline at end of file
@@ -2,11 +2,15 @@
 Factory for creating exchange API instances
 """
 
+import importlib
 import logging
-from typing import Dict, Optional
+import sys
+import threading
+from typing import Callable, Dict, Optional, Union
+
+import requests
 
 from exchange.abstract_exchange import AbstractExchange
-from exchange.binance.client import BinanceExchange
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +18,21 @@ class ExchangeFactory:
     """
     Factory for creating exchange instances
     """
+    # Connection pool size of each shared venue session
+    SHARED_POOL_MAXSIZE = 200
+    
     def __init__(self):
-        self.exchanges = {
-            'binance': BinanceExchange
+        # Keys are interned lowercase names so lookups compare by identity. Values
+        # are exchange classes, or "module:Class" paths imported on first use so
+        # a deployment only loads the clients it actually trades on
+        self.exchanges: Dict[str, Union[type, str]] = {
+            sys.intern('binance'): 'exchange.binance.client:BinanceExchange'
         }
+        # One keep-alive HTTP session per venue, shared by every user's instance
+        self._shared_sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        # name -> callable(api_key, api_secret), specialized once per loaded exchange
+        self._constructors: Dict[str, Callable[[str, str], AbstractExchange]] = {}
     
     def create_exchange(self, exchange_name: str, api_key: str, api_secret: str) -> Optional[AbstractExchange]:
         """
@@ -31,28 +46,99 @@ class ExchangeFactory:
         Returns:
             Exchange instance or None if exchange is not supported
         """
-        exchange_name = exchange_name.lower()
-        
-        if exchange_name not in self.exchanges:
-            logger.error(f"Unsupported exchange: {exchange_name}")
-            return None
+        # Callers almost always pass the canonical lowercase name, so try it
+        # as-is before paying for a lowercased copy
+        constructor = self._constructors.get(exchange_name)
+        if constructor is None:
+            exchange_name = sys.intern(exchange_name.lower())
+            constructor = self._constructors.get(exchange_name) or self._load_constructor(exchange_name)
+            if constructor is None:
+                return None
             
         try:
-            exchange_class = self.exchanges[exchange_name]
-            return exchange_class(api_key, api_secret)
+            return constructor(api_key, api_secret)
         except Exception as e:
             logger.error(f"Failed to create exchange instance for {exchange_name}: {str(e)}")
             return None
     
-    def register_exchange(self, name: str, exchange_class: type) -> None:
+    def _load_constructor(self, exchange_name: str) -> Optional[Callable[[str, str], AbstractExchange]]:
+        """
+        Import a registered exchange on first use and build its constructor
+        
+        Args:
+            exchange_name: Normalized exchange name
+            
+        Returns:
+            Constructor, or None if the exchange is unsupported or fails to import
+        """
+        exchange_class = self.exchanges.get(exchange_name)
+        if exchange_class is None:
+            logger.error(f"Unsupported exchange: {exchange_name}")
+            return None
+            
+        if isinstance(exchange_class, str):
+            module_name, _, class_name = exchange_class.partition(':')
+            try:
+                exchange_class = getattr(importlib.import_module(module_name), class_name)
+            except Exception as e:
+                logger.error(f"Failed to load exchange {exchange_name}: {str(e)}")
+                return None
+            self.exchanges[exchange_name] = exchange_class
+            
+        constructor = self._make_constructor(exchange_name, exchange_class)
+        self._constructors[exchange_name] = constructor
+        return constructor
+    
+    def _make_constructor(self, exchange_name: str, exchange_class: type) -> Callable[[str, str], AbstractExchange]:
+        """
+        Build the constructor create_exchange calls for an exchange
+        
+        Args:
+            exchange_name: Normalized exchange name
+            exchange_class: Exchange class
+            
+        Returns:
+            Callable taking (api_key, api_secret) and returning a new instance
+        """
+        if not hasattr(exchange_class, 'create_session'):
+            return exchange_class
+            
+        def construct(api_key: str, api_secret: str) -> AbstractExchange:
+            return exchange_class(api_key, api_secret, session=self._get_shared_session(exchange_name, exchange_class))
+            
+        return construct
+    
+    def _get_shared_session(self, exchange_name: str, exchange_class: type) -> requests.Session:
+        """
+        Get the shared HTTP session for an exchange, creating it on first use
+        
+        Args:
+            exchange_name: Normalized exchange name
+            exchange_class: Exchange class providing create_session()
+            
+        Returns:
+            Shared session for the exchange
+        """
+        session = self._shared_sessions.get(exchange_name)
+        if session is None:
+            with self._sessions_lock:
+                session = self._shared_sessions.get(exchange_name)
+                if session is None:
+                    session = exchange_class.create_session(pool_maxsize=self.SHARED_POOL_MAXSIZE)
+                    self._shared_sessions[exchange_name] = session
+        return session
+    
+    def register_exchange(self, name: str, exchange_class: Union[type, str]) -> None:
         """
         Register a new exchange type
         
         Args:
             name: Exchange name
-            exchange_class: Exchange class
+            exchange_class: Exchange class, or a "module:Class" path to import on first use
         """
-        self.exchanges[name.lower()] = exchange_class
+        key = sys.intern(name.lower())
+        self.exchanges[key] = exchange_class
+        self._constructors.pop(key, None)
         logger.info(f"Registered exchange: {name}")
     
     def get_supported_exchanges(self) -> list:
@@ -1,5 +1,8 @@
 import logging
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from exchange.exchange_factory import ExchangeFactory
 from database.repository.api_key_repository import ApiKeyRepository
@@ -12,6 +15,11 @@ class ExchangeHelper:
     Helper class to connect exchange instances with user API keys
     """
     
+    # Upper bound on concurrent exchange initializations in get_user_exchanges
+    MAX_INIT_WORKERS = 16
+    # Seconds an initialized exchange instance is reused before rebuilding it
+    EXCHANGE_CACHE_TTL = 300
+    
     def __init__(self, exchange_factory, api_key_repository, user_repository):
         """
         Initialize helper with required repositories
@@ -25,6 +33,12 @@ class ExchangeHelper:
         self.api_key_repo = api_key_repository
         self.user_repo = user_repository
         
+        # (user_id, exchange_name, api_key_id) -> (exchange, expiry); keying on the
+        # API key ID makes a rotated key miss instead of reusing stale credentials
+        self._exchange_cache: Dict[Tuple[int, str, str], Tuple[object, float]] = {}
+        self._cache_ttl = self.EXCHANGE_CACHE_TTL
+        self._cache_lock = threading.Lock()
+        
     def get_user_exchange(self, user_id: int, exchange_name: Optional[str] = None) -> Optional[object]:
         """
         Get exchange instance for a user with their API keys
@@ -53,6 +67,13 @@ class ExchangeHelper:
                 logger.warning(f"User {user_id} has no API key configured")
                 return None
                 
+            cache_key = (user_id, exchange_name, api_key_id)
+            now = time.time()
+            with self._cache_lock:
+                cached = self._exchange_cache.get(cache_key)
+            if cached and now < cached[1]:
+                return cached[0]
+                
             # Get API credentials
             credentials = self.api_key_repo.get_api_key(api_key_id)
             if not credentials:
@@ -73,7 +94,91 @@ class ExchangeHelper:
                 logger.warning(f"Failed to initialize exchange {exchange_name} for user {user_id}")
                 return None
                 
+            if exchange:
+                with self._cache_lock:
+                    self._exchange_cache[cache_key] = (exchange, now + self._cache_ttl)
+                    
             return exchange
         except Exception as e:
             logger.error(f"Error getting user exchange: {str(e)}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+            
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop cached exchange instances for a user, e.g. after their API keys change
+        
+        Args:
+            user_id: User ID
+        """
+        with self._cache_lock:
+            for key in [key for key in self._exchange_cache if key[0] == user_id]:
+                del self._exchange_cache[key]
+                
+    def get_user_exchanges(self, user_ids: List[int]) -> Dict[int, object]:
+        """
+        Get initialized exchange instances for many users at once
+        
+        Users and API keys are loaded in one joined query, and the exchange
+        ``initialize()`` calls (network round-trips) run concurrently.
+        
+        Args:
+            user_ids: User IDs
+            
+        Returns:
+            Dictionary mapping user ID to exchange instance; users without
+            credentials or whose exchange failed to initialize are omitted
+        """
+        try:
+            rows = self.user_repo.get_users_with_keys(user_ids)
+        except Exception as e:
+            logger.error(f"Error loading user API keys: {str(e)}", exc_info=True)
+            return {}
+            
+        pending = []
+        for user_id, preferred_exchange, encrypted_key, encrypted_secret in rows:
+            credentials = self.api_key_repo.decrypt_credentials(encrypted_key, encrypted_secret)
+            if not credentials:
+                logger.warning(f"Could not decrypt API key for user {user_id}")
+                continue
+                
+            exchange_name = preferred_exchange or "binance"
+            api_key, api_secret = credentials
+            try:
+                exchange = self.exchange_factory.create_exchange(
+                    exchange_name=exchange_name,
+                    api_key=api_key,
+                    api_secret=api_secret
+                )
+            except Exception as e:
+                logger.error(f"Error creating exchange for user {user_id}: {str(e)}")
+                continue
+                
+            if exchange:
+                pending.append((user_id, exchange_name, exchange))
+                
+        missing = len(set(user_ids)) - len(rows)
+        if missing > 0:
+            logger.warning(f"{missing} users not found or have no API key configured")
+            
+        if not pending:
+            return {}
+            
+        def _initialize(exchange) -> bool:
+            try:
+                return bool(exchange.initialize())
+            except Exception as e:
+                logger.error(f"Error initializing exchange: {str(e)}")
+                return False
+                
+        workers = min(self.MAX_INIT_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exchange-init") as pool:
+            results = list(pool.map(_initialize, [exchange for _, _, exchange in pending]))
+            
+        exchanges = {}
+        for (user_id, exchange_name, exchange), ok in zip(pending, results):
+            if ok:
+                exchanges[user_id] = exchange
+            else:
+                logger.warning(f"Failed to initialize exchange {exchange_name} for user {user_id}")
+                
+        return exchanges
\ No newline at end of file
@@ -1,11 +1,90 @@
 # profit/fee_calculator.py
 import logging
-from typing import Dict, List, Any, Optional
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
-from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from analysis._njit import njit
 
 logger = logging.getLogger(__name__)
 
+# Amounts are calculated as integer multiples of 1e-8, the precision fees are rounded to
+AMOUNT_SCALE = 10 ** 8
+# Percentages are calculated as integer multiples of 1e-6 percent
+PERCENT_SCALE = 10 ** 6
+# amount_units * percent_units / RATE_DENOMINATOR == amount_units * percent / 100
+RATE_DENOMINATOR = 100 * PERCENT_SCALE
+
+def _round_half_up(numerator: int, denominator: int) -> int:
+    """
+    Divide two integers, rounding halves away from zero.
+
+    Args:
+        numerator (int): Dividend
+        denominator (int): Positive divisor
+
+    Returns:
+        int: Rounded quotient
+    """
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((-2 * numerator + denominator) // (2 * denominator))
+
+# Fee transaction amounts summed by get_fee_summary
+FEE_SUMMARY_COLUMNS = ('total_profit', 'fee_amount', 'referral_fee_amount', 'admin_fee_amount')
+
+# Largest intermediate product the int64 batch kernel accepts, with headroom
+# for the rounding step
+_KERNEL_PRODUCT_LIMIT = 2 ** 62
+
+# Integer-only, so fastmath has nothing to relax; every index is in range,
+# so bounds checks stay off even under NUMBA_BOUNDSCHECK
+@njit(cache=True, boundscheck=False)
+def _bulk_fee_kernel(profit_units, use_higher_rate, referral_eligible,
+                     base_rate, higher_rate, referral_rate, denominator):
+    """
+    Exact fee arithmetic for many trades, on int64 arrays.
+
+    Rates are integer numerators over denominator; amounts are 1e-8 units.
+    Callers must keep profit * max(rate, denominator) below _KERNEL_PRODUCT_LIMIT.
+
+    Returns:
+        Tuple of (fee_units, referral_scaled, user_profit_units) arrays, where
+        referral_scaled is the exact referral commission scaled by denominator
+    """
+    count = profit_units.shape[0]
+    fee_units = np.empty(count, dtype=np.int64)
+    referral_scaled = np.empty(count, dtype=np.int64)
+    user_profit_units = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        profit = profit_units[i]
+        rate = higher_rate if use_higher_rate[i] else base_rate
+        
+        # Fee, rounded half up (profit is positive)
+        numerator = profit * rate
+        fee = numerator // denominator
+        if 2 * (numerator - fee * denominator) >= denominator:
+            fee += 1
+        
+        referral = profit * referral_rate if referral_eligible[i] else 0
+        
+        # Net profit, rounded half away from zero
+        numerator = (profit - fee) * denominator - referral
+        magnitude = numerator if numerator >= 0 else -numerator
+        net = magnitude // denominator
+        if 2 * (magnitude - net * denominator) >= denominator:
+            net += 1
+        
+        fee_units[i] = fee
+        referral_scaled[i] = referral
+        user_profit_units[i] = net if numerator >= 0 else -net
+    return fee_units, referral_scaled, user_profit_units
+
 class FeeCalculator:
     """
     Comprehensive Fee Calculation and Management System
@@ -36,6 +115,9 @@ class FeeCalculator:
         self.trade_repo = trade_repository
         self.transaction_repo = transaction_repository
         
+        # Repositories are fixed for the calculator's lifetime, so check them once
+        self._repos_ok = self._validate_repository_dependencies()
+        
         # Load configuration
         self.config = config or {}
         
@@ -45,6 +127,35 @@ class FeeCalculator:
         self.higher_fee_percent = self.config.get('fees.higher_fee_percent', 30.0)
         self.referral_commission_percent = self.config.get('fees.referral_commission_percent', 10.0)
         
+        # The same percentages as integer multiples of 1e-6 percent, fixed for the
+        # lifetime of the calculator
+        self._base_fee_units = round(self.base_fee_percent * PERCENT_SCALE)
+        self._higher_fee_units = round(self.higher_fee_percent * PERCENT_SCALE)
+        self._referral_commission_units = round(self.referral_commission_percent * PERCENT_SCALE)
+        
+        # Short-lived user lookups shared by the steps of one fee collection:
+        # user_id -> (user, expiry). Entries are dropped when the user's profit changes
+        self.user_cache_ttl = self.config.get('fees.user_cache_ttl', 30)
+        self._user_cache: Dict[int, Tuple[Any, float]] = {}
+        
+        # Fee summaries for repeated dashboard queries: days -> (generation, expiry,
+        # summary). Recording a fee transaction bumps the generation
+        self.summary_cache_ttl = self.config.get('fees.summary_cache_ttl', 60)
+        self._summary_cache: Dict[int, Tuple[int, float, Dict[str, Any]]] = {}
+        self._fee_generation = 0
+        
+        # Optional write-behind of user profit and referral commission updates:
+        # (UserRepository method name, args) entries are buffered and written by
+        # a flusher thread, off the fee collection path
+        self.write_behind = self.config.get('fees.write_behind', False)
+        self.write_flush_interval = self.config.get('fees.write_flush_interval', 0.05)  # seconds
+        self.write_flush_batch_size = self.config.get('fees.write_flush_batch_size', 100)
+        self._write_buffer: deque = deque()
+        self._write_buffer_lock = threading.Lock()
+        self._write_flush_event = threading.Event()
+        self._write_flusher: Optional[threading.Thread] = None
+        self._write_stopped = False
+        
         logger.info("Fee Calculator initialized successfully")
 
     def calculate_fee(self, user_id: int, trade_id: int, profit: float) -> Dict[str, float]:
@@ -68,49 +179,266 @@ class FeeCalculator:
                 return self._generate_zero_fee_structure(profit)
             
             # Validate required repositories
-            if not self._validate_repository_dependencies():
+            if not self._repos_ok:
                 return self._generate_zero_fee_structure(profit)
             
             # Retrieve user information
-            user = self.user_repo.get_user_by_id(user_id)
-            if not user:
-                logger.error(f"User {user_id} not found")
+            user = self._get_user(user_id)
+            
+        except Exception as e:
+            logger.error(f"Fee calculation error: {str(e)}")
+            return self._generate_zero_fee_structure(profit)
+            
+        if not user:
+            logger.error(f"User {user_id} not found")
+            return self._generate_zero_fee_structure(profit)
+        
+        return self.calculate_fee_for_user(user, trade_id, profit)
+
+    def calculate_fee_for_user(self, user: Any, trade_id: int, profit: float) -> Dict[str, float]:
+        """
+        Calculate the fee structure for a trade of an already loaded user.
+
+        Args:
+            user: User object
+            trade_id (int): Unique identifier for the trade
+            profit (float): Total profit from the trade
+
+        Returns:
+            Dict[str, float]: Detailed breakdown of fees and net profit
+        """
+        # Only the inputs can fail here: the arithmetic below is on integers,
+        # and the referral lookup handles its own repository errors
+        try:
+            # Immediately return zero fees for unprofitable trades
+            if profit <= 0:
                 return self._generate_zero_fee_structure(profit)
             
-            # Determine appropriate fee percentage
-            fee_percent = (
-                self.base_fee_percent if user.total_profit < self.profit_threshold 
-                else self.higher_fee_percent
-            )
+            # Determine appropriate fee tier
+            below_threshold = user.total_profit < self.profit_threshold
             
-            # Perform precise decimal calculations
-            profit_decimal = Decimal(str(profit))
-            fee_percent_decimal = Decimal(str(fee_percent)) / Decimal('100')
+            # Perform exact integer calculations on 1e-8 units
+            profit_units = round(profit * AMOUNT_SCALE)
             
-            # Calculate primary fee amount
-            fee_amount = profit_decimal * fee_percent_decimal
-            fee_amount = fee_amount.quantize(Decimal('0.00000001'), rounding=ROUND_HALF_UP)
+        except (AttributeError, TypeError, ValueError, OverflowError) as e:
+            logger.error(f"Fee calculation error: {str(e)}")
+            return self._generate_zero_fee_structure(profit)
             
-            # Calculate referral commission
-            referral_fee_amount = self._compute_referral_commission(
-                user, trade_id, profit_decimal
-            )
+        # Validate required repositories
+        if not self._repos_ok:
+            return self._generate_zero_fee_structure(profit)
             
-            # Calculate user's net profit after fees
-            user_profit = profit_decimal - fee_amount - referral_fee_amount
-            user_profit = user_profit.quantize(Decimal('0.00000001'), rounding=ROUND_HALF_UP)
+        # Determine appropriate fee percentage
+        if below_threshold:
+            fee_percent, fee_percent_units = self.base_fee_percent, self._base_fee_units
+        else:
+            fee_percent, fee_percent_units = self.higher_fee_percent, self._higher_fee_units
+        
+        # Calculate primary fee amount, rounded half up to 8 decimals
+        fee_units = _round_half_up(profit_units * fee_percent_units, RATE_DENOMINATOR)
+        
+        # Calculate referral commission (exact, scaled by RATE_DENOMINATOR)
+        referral_scaled = self._compute_referral_commission(
+            user, trade_id, profit_units
+        )
+        
+        # Calculate user's net profit after fees, rounded half up to 8 decimals
+        user_profit_units = _round_half_up(
+            (profit_units - fee_units) * RATE_DENOMINATOR - referral_scaled,
+            RATE_DENOMINATOR
+        )
+        
+        # Integer true division rounds correctly to the nearest float
+        return {
+            'fee_amount': fee_units / AMOUNT_SCALE,
+            'fee_percent': float(fee_percent),
+            'referral_fee_amount': referral_scaled / (AMOUNT_SCALE * RATE_DENOMINATOR),
+            'referral_percent': float(self.referral_commission_percent) if referral_scaled > 0 else 0,
+            'user_profit': user_profit_units / AMOUNT_SCALE
+        }
+
+    def calculate_fees_batch(
+        self, 
+        user_ids: Sequence[int], 
+        trade_ids: Sequence[int], 
+        profits: Sequence[float]
+    ) -> List[Dict[str, float]]:
+        """
+        Calculate fee structures for many trades at once.
+
+        Intended for bulk recomputation and backfills. Users and their
+        profitable-trade history are loaded with one query each, and the
+        arithmetic runs in a compiled kernel. Each result equals what
+        calculate_fee returns for the same trade.
+
+        Args:
+            user_ids (Sequence[int]): User identifier of each trade
+            trade_ids (Sequence[int]): Trade identifiers
+            profits (Sequence[float]): Total profit of each trade
+
+        Returns:
+            List[Dict[str, float]]: Fee breakdown per trade, in input order
+        """
+        results = [self._generate_zero_fee_structure(profit) for profit in profits]
+        try:
+            if not self._repos_ok:
+                return results
+                
+            wanted_ids = {user_ids[i] for i, profit in enumerate(profits) if profit > 0}
+            users = self._get_users(wanted_ids)
+            if len(users) < len(wanted_ids):
+                logger.error(f"Users not found: {sorted(wanted_ids - users.keys())}")
             
-            return {
-                'fee_amount': float(fee_amount),
-                'fee_percent': float(fee_percent),
-                'referral_fee_amount': float(referral_fee_amount),
-                'referral_percent': float(self.referral_commission_percent) if float(referral_fee_amount) > 0 else 0,
-                'user_profit': float(user_profit)
+            self._fill_batch_fees(results, users, user_ids, trade_ids, profits)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch fee calculation error: {str(e)}")
+            return [self._generate_zero_fee_structure(profit) for profit in profits]
+
+    def _fill_batch_fees(
+        self, 
+        results: List[Dict[str, float]], 
+        users: Dict[int, Any], 
+        user_ids: Sequence[int], 
+        trade_ids: Sequence[int], 
+        profits: Sequence[float]
+    ) -> None:
+        """
+        Fill in the fee structures of the profitable trades of loaded users.
+
+        Args:
+            results (List[Dict[str, float]]): Fee breakdown per trade, updated in place
+            users (Dict[int, Any]): Loaded users by ID; trades of other users are left as they are
+            user_ids (Sequence[int]): User identifier of each trade
+            trade_ids (Sequence[int]): Trade identifiers
+            profits (Sequence[float]): Total profit of each trade
+        """
+        pending = [i for i, profit in enumerate(profits) if profit > 0 and user_ids[i] in users]
+        if not pending:
+            return
+            
+        eligible = self._referral_eligibility(
+            [(users[user_ids[i]], trade_ids[i]) for i in pending]
+        )
+        use_higher_rate = [users[user_ids[i]].total_profit >= self.profit_threshold for i in pending]
+        profit_units = [round(profits[i] * AMOUNT_SCALE) for i in pending]
+        
+        # Reduce the rates by their common factor with the denominator so the
+        # products stay well inside int64
+        divisor = math.gcd(math.gcd(self._base_fee_units, self._higher_fee_units),
+                           math.gcd(self._referral_commission_units, RATE_DENOMINATOR))
+        base_rate = self._base_fee_units // divisor
+        higher_rate = self._higher_fee_units // divisor
+        referral_rate = self._referral_commission_units // divisor
+        denominator = RATE_DENOMINATOR // divisor
+        
+        largest = max(profit_units) * max(base_rate, higher_rate, referral_rate, denominator)
+        if largest < _KERNEL_PRODUCT_LIMIT:
+            fee_units, referral_scaled, user_profit_units = (
+                column.tolist() for column in _bulk_fee_kernel(
+                    np.array(profit_units, dtype=np.int64),
+                    np.array(use_higher_rate, dtype=np.bool_),
+                    np.array(eligible, dtype=np.bool_),
+                    base_rate, higher_rate, referral_rate, denominator
+                )
+            )
+        else:
+            # Amounts too large for int64; use Python integers
+            fee_units, referral_scaled, user_profit_units = [], [], []
+            for units, higher, is_eligible in zip(profit_units, use_higher_rate, eligible):
+                fee = _round_half_up(units * (higher_rate if higher else base_rate), denominator)
+                referral = units * referral_rate if is_eligible else 0
+                fee_units.append(fee)
+                referral_scaled.append(referral)
+                user_profit_units.append(_round_half_up((units - fee) * denominator - referral, denominator))
+                
+        for n, i in enumerate(pending):
+            results[i] = {
+                'fee_amount': fee_units[n] / AMOUNT_SCALE,
+                'fee_percent': float(self.higher_fee_percent if use_higher_rate[n] else self.base_fee_percent),
+                'referral_fee_amount': referral_scaled[n] / (AMOUNT_SCALE * denominator),
+                'referral_percent': float(self.referral_commission_percent) if referral_scaled[n] > 0 else 0,
+                'user_profit': user_profit_units[n] / AMOUNT_SCALE
             }
+
+    def _get_users(self, user_ids) -> Dict[int, Any]:
+        """
+        Retrieve many users, in one query when the repository supports it.
+
+        Args:
+            user_ids: User identifiers
+
+        Returns:
+            Dict[int, Any]: Users found, by ID
+        """
+        if not hasattr(self.user_repo, 'get_users_by_ids'):
+            users = {user_id: self._get_user(user_id) for user_id in user_ids}
+            return {user_id: user for user_id, user in users.items() if user}
+            
+        expiry = time.monotonic() + self.user_cache_ttl
+        users = {user.id: user for user in self.user_repo.get_users_by_ids(list(user_ids))}
+        for user_id, user in users.items():
+            self._user_cache[user_id] = (user, expiry)
+        return users
+
+    def _referral_eligibility(self, items: List[Tuple[Any, int]]) -> List[bool]:
+        """
+        Decide, for many (user, trade_id) pairs, whether the trade earns a referral commission.
+
+        Args:
+            items: Pairs of user object and trade identifier
+
+        Returns:
+            List[bool]: Eligibility per pair, in input order
+        """
+        try:
+            referred_ids = {
+                user.id for user, _ in items
+                if user.referrer_id and not getattr(user, 'first_profit_recorded', False)
+            }
+            if not referred_ids:
+                return [False] * len(items)
+                
+            if not hasattr(self.trade_repo, 'get_profitable_trade_summary'):
+                return [
+                    self._compute_referral_commission(user, trade_id, 1) > 0
+                    for user, trade_id in items
+                ]
+                
+            # Eligible when the user has no profitable trade other than this one
+            summary = self.trade_repo.get_profitable_trade_summary(list(referred_ids))
+            eligible = []
+            for user, trade_id in items:
+                trade_count, first_trade_id = summary.get(user.id, (0, None))
+                eligible.append(user.id in referred_ids and (
+                    trade_count == 0 or (trade_count == 1 and first_trade_id == trade_id)
+                ))
+            return eligible
             
         except Exception as e:
-            logger.error(f"Fee calculation error: {str(e)}")
-            return self._generate_zero_fee_structure(profit)
+            logger.error(f"Referral eligibility check error: {str(e)}")
+            return [False] * len(items)
+
+    def _get_user(self, user_id: int) -> Optional[Any]:
+        """
+        Retrieve a user, reusing a lookup made within the last user_cache_ttl seconds.
+
+        Args:
+            user_id (int): User identifier
+
+        Returns:
+            User object or None if not found
+        """
+        now = time.monotonic()
+        cached = self._user_cache.get(user_id)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+            
+        user = self.user_repo.get_user_by_id(user_id)
+        if user:
+            self._user_cache[user_id] = (user, now + self.user_cache_ttl)
+        return user
 
     def _validate_repository_dependencies(self) -> bool:
         """
@@ -130,8 +458,8 @@ class FeeCalculator:
         self, 
         user: Any, 
         trade_id: int, 
-        profit: Decimal
-    ) -> Decimal:
+        profit_units: int
+    ) -> int:
         """
         Calculate referral commission for a specific trade.
 
@@ -141,29 +469,36 @@ class FeeCalculator:
         Args:
             user: User object
             trade_id: Unique trade identifier
-            profit: Profit amount as a Decimal
+            profit_units: Profit amount in 1e-8 units
 
         Returns:
-            Decimal: Calculated referral commission amount
+            int: Exact referral commission in 1e-8 units, scaled by RATE_DENOMINATOR
         """
+        # Only referred users earn their referrer a commission, and only until
+        # their first profitable trade is recorded, so skip the trade history
+        # lookup for everyone else
+        if not user.referrer_id or getattr(user, 'first_profit_recorded', False):
+            return 0
+        
         try:
-            # Identify previous profitable trades
-            profitable_trades = self.trade_repo.get_trades_by_user(user.id)
-            profitable_trades = [
-                trade for trade in profitable_trades 
-                if trade.profit and trade.profit > 0 and trade.id != trade_id
-            ]
+            # Identify previous profitable trades, with an EXISTS probe when available
+            if hasattr(self.trade_repo, 'has_other_profitable_trade'):
+                has_previous_profit = self.trade_repo.has_other_profitable_trade(user.id, trade_id)
+            else:
+                has_previous_profit = any(
+                    trade.profit and trade.profit > 0 and trade.id != trade_id
+                    for trade in self.trade_repo.get_trades_by_user(user.id)
+                )
             
             # Apply referral commission for first profitable trade
-            if not profitable_trades and user.referrer_id:
-                referral_percent = Decimal(str(self.referral_commission_percent)) / Decimal('100')
-                return profit * referral_percent
+            if not has_previous_profit:
+                return profit_units * self._referral_commission_units
             
-            return Decimal('0')
+            return 0
         
         except Exception as e:
             logger.error(f"Referral commission calculation error: {str(e)}")
-            return Decimal('0')
+            return 0
 
     def _generate_zero_fee_structure(self, profit: float) -> Dict[str, float]:
         """
@@ -183,81 +518,241 @@ class FeeCalculator:
             'user_profit': profit
         }
 
+    def _build_fee_transaction(
+        self, 
+        user: Any, 
+        trade_id: int, 
+        fee_details: Dict[str, float], 
+        total_profit: float, 
+        timestamp: datetime
+    ) -> Dict[str, Any]:
+        """
+        Build the fee transaction record for a trade.
+
+        Args:
+            user: User object
+            trade_id (int): Trade identifier
+            fee_details (Dict[str, float]): Calculated fee breakdown
+            total_profit (float): Total trade profit
+            timestamp (datetime): Transaction timestamp
+
+        Returns:
+            Dict[str, Any]: Transaction data for the transaction repository
+        """
+        return {
+            'trade_id': trade_id,
+            'user_id': user.id,
+            'referrer_id': getattr(user, 'referrer_id', None),
+            'total_profit': total_profit,
+            'fee_amount': fee_details['fee_amount'],
+            'fee_percent': fee_details['fee_percent'],
+            'referral_fee_amount': fee_details['referral_fee_amount'],
+            # Admin fee is the total fee minus the referral fee
+            'admin_fee_amount': fee_details['fee_amount'] - fee_details['referral_fee_amount'],
+            'admin_wallet': self.config.get('admin_wallet', ''),
+            'timestamp': timestamp
+        }
+
     def _record_fee_transactions(
         self, 
-        user_id: int, 
+        user: Any, 
         trade_id: int, 
         fee_details: Dict[str, float], 
-        total_profit: float
+        total_profit: float,
+        batch_timestamp: Optional[datetime] = None
     ):
         """
         Record detailed fee and referral transactions.
 
         Args:
-            user_id (int): User identifier
+            user: User object
             trade_id (int): Trade identifier
             fee_details (Dict[str, float]): Calculated fee breakdown
             total_profit (float): Total trade profit
+            batch_timestamp (datetime, optional): Timestamp shared by a batch of
+                collections; the current time when omitted
             
         Returns:
             Optional[int]: Transaction ID if successful, None otherwise
         """
+        user_id = user.id
+        
+        # Extract referrer information
+        referrer_id = getattr(user, 'referrer_id', None)
+        
         try:
-            # Retrieve user information
-            user = self.user_repo.get_user_by_id(user_id)
-            if not user:
-                logger.error(f"Cannot record fee transaction: User {user_id} not found")
-                return None
-                
-            # Extract referrer information
-            referrer_id = getattr(user, 'referrer_id', None)
-            
-            # Calculate admin fee (total fee minus referral fee)
-            admin_fee = fee_details['fee_amount'] - fee_details['referral_fee_amount']
-            admin_wallet = self.config.get('admin_wallet', '')
-            
             # Record transaction via repository
-            transaction_data = {
-                'trade_id': trade_id,
-                'user_id': user_id,
-                'referrer_id': referrer_id,
-                'total_profit': total_profit,
-                'fee_amount': fee_details['fee_amount'],
-                'fee_percent': fee_details['fee_percent'],
-                'referral_fee_amount': fee_details['referral_fee_amount'],
-                'admin_fee_amount': admin_fee,
-                'admin_wallet': admin_wallet,
-                'timestamp': datetime.now()
-            }
+            transaction_data = self._build_fee_transaction(
+                user, trade_id, fee_details, total_profit, batch_timestamp or datetime.now()
+            )
             
             # Create transaction record
             transaction_id = self.transaction_repo.create_fee_transaction(transaction_data)
+            self._fee_generation += 1
+        except Exception as e:
+            logger.error(f"Error recording fee transaction: {str(e)}")
+            return None
             
-            # Log successful transaction creation
-            logger.info(f"Fee transaction {transaction_id} recorded for trade {trade_id}")
-            
-            # Update user profit statistics
-            self.user_repo.update_user_profit(
-                user_id, 
-                fee_details['user_profit']
+        # Log successful transaction creation
+        logger.info(f"Fee transaction {transaction_id} recorded for trade {trade_id}")
+        
+        # The fee is collected from here on; the updates below log their own failures
+        
+        # Update user profit statistics
+        self._write_user_update_logged('update_user_profit', user_id, fee_details['user_profit'])
+        
+        # This trade ends the user's referral eligibility; remember that on
+        # the user so later trades skip the trade history lookup
+        if referrer_id and not getattr(user, 'first_profit_recorded', False):
+            self._mark_first_profit_recorded(user_id)
+        # The user's total profit (and so their fee tier) has changed
+        self._user_cache.pop(user_id, None)
+        
+        # Process referral commission if applicable
+        if referrer_id and fee_details['referral_fee_amount'] > 0:
+            self._write_user_update_logged(
+                'add_referral_commission',
+                referrer_id,
+                fee_details['referral_fee_amount'],
+                user_id,
+                trade_id
             )
             
-            # Process referral commission if applicable
-            if referrer_id and fee_details['referral_fee_amount'] > 0:
-                self.user_repo.add_referral_commission(
-                    referrer_id,
-                    fee_details['referral_fee_amount'],
-                    user_id,
-                    trade_id
-                )
+        return transaction_id
+
+    def _write_user_update_logged(self, method: str, *args) -> None:
+        """
+        Apply a user aggregate update whose fee transaction is already recorded.
+
+        The fee counts as collected either way, so a failure is logged
+        instead of raised.
+
+        Args:
+            method (str): UserRepository method name
+            *args: Arguments for the method
+        """
+        try:
+            self._write_user_update(method, *args)
+        except Exception as e:
+            logger.error(f"Error writing {method} for user {args[0]} after recording its fee: {str(e)}")
+
+    def _mark_first_profit_recorded(self, user_id: int) -> None:
+        """
+        Flag a user's first profitable trade as recorded, logging any failure.
+
+        Args:
+            user_id (int): User identifier
+        """
+        try:
+            self.user_repo.update_user(user_id, first_profit_recorded=True)
+        except Exception as e:
+            logger.error(f"Error flagging first profit for user {user_id}: {str(e)}")
+
+    def _write_user_update(self, method: str, *args) -> None:
+        """
+        Apply a user aggregate update, or queue it when write-behind is enabled.
+
+        Args:
+            method (str): UserRepository method name
+            *args: Arguments for the method
+        """
+        queued = False
+        if self.write_behind:
+            with self._write_buffer_lock:
+                if not self._write_stopped:
+                    self._write_buffer.append((method, args))
+                    buffered = len(self._write_buffer)
+                    queued = True
+                    if self._write_flusher is None:
+                        self._write_flusher = threading.Thread(
+                            target=self._write_flush_loop, name="fee_write_flusher_thread", daemon=True
+                        )
+                        self._write_flusher.start()
+                        
+        if not queued:
+            getattr(self.user_repo, method)(*args)
+            return
+            
+        # Wake the flusher early once a full batch is waiting
+        if buffered >= self.write_flush_batch_size:
+            self._write_flush_event.set()
+
+    def _write_flush_loop(self) -> None:
+        """
+        Write queued user updates every write_flush_interval seconds, or sooner when a batch fills.
+        """
+        while not self._write_stopped:
+            self._write_flush_event.wait(timeout=self.write_flush_interval)
+            self._write_flush_event.clear()
+            self._flush_user_updates()
+
+    def _flush_user_updates(self) -> int:
+        """
+        Write all queued user updates.
+
+        Profit updates are summed per user and written in one bulk update when
+        the repository supports it; everything else is written one call at a
+        time, so one failing update cannot hold back the rest.
+
+        Returns:
+            int: Number of queued updates written
+        """
+        with self._write_buffer_lock:
+            if not self._write_buffer:
+                return 0
+            batch = list(self._write_buffer)
+            self._write_buffer.clear()
+            
+        profit_updates = [args for method, args in batch if method == 'update_user_profit']
+        remaining = [(method, args) for method, args in batch if method != 'update_user_profit']
+        written = 0
+        
+        if profit_updates and hasattr(self.user_repo, 'update_user_profits_bulk'):
+            user_profits: Dict[int, float] = {}
+            for user_id, user_profit in profit_updates:
+                user_profits[user_id] = user_profits.get(user_id, 0) + user_profit
+            try:
+                self.user_repo.update_user_profits_bulk(user_profits)
+                written += len(profit_updates)
+                profit_updates = []
+            except Exception as e:
+                logger.error(f"Error writing {len(user_profits)} user profits in bulk: {str(e)}")
                 
-            return transaction_id
+        remaining = [('update_user_profit', args) for args in profit_updates] + remaining
+        for method, args in remaining:
+            try:
+                getattr(self.user_repo, method)(*args)
+                written += 1
+            except Exception as e:
+                logger.error(f"Error writing {method} for user {args[0]}: {str(e)}")
+                
+        # Fee tiers must see the new totals
+        for method, args in batch:
+            if method == 'update_user_profit':
+                self._user_cache.pop(args[0], None)
+                
+        return written
+
+    def stop(self) -> None:
+        """
+        Stop the write-behind flusher and write any user updates still queued.
+        """
+        with self._write_buffer_lock:
+            self._write_stopped = True
+            flusher = self._write_flusher
             
-        except Exception as e:
-            logger.error(f"Error recording fee transaction: {str(e)}")
-            return None
+        self._write_flush_event.set()
+        if flusher and flusher.is_alive():
+            flusher.join(timeout=30)
+        self._flush_user_updates()
 
-    def collect_fees(self, user_id: int, trade_id: int, profit: float) -> bool:
+    def collect_fees(
+        self, 
+        user_id: int, 
+        trade_id: int, 
+        profit: float, 
+        batch_timestamp: Optional[datetime] = None
+    ) -> bool:
         """
         Collect and record fees for a completed trade.
 
@@ -268,6 +763,8 @@ class FeeCalculator:
             user_id (int): Unique user identifier
             trade_id (int): Unique trade identifier
             profit (float): Total trade profit
+            batch_timestamp (datetime, optional): Timestamp to record the fee
+                transaction with; the current time when omitted
 
         Returns:
             bool: Indicates successful fee collection and recording
@@ -277,27 +774,175 @@ class FeeCalculator:
             if profit <= 0:
                 return True
             
-            # Calculate comprehensive fee details
-            fee_details = self.calculate_fee(user_id, trade_id, profit)
-            
-            # Record fee transactions
-            transaction_id = self._record_fee_transactions(
-                user_id, 
-                trade_id, 
-                fee_details, 
-                profit
-            )
-            
-            return transaction_id is not None
+            # Retrieve the user once for both calculation and recording
+            user = self._get_user(user_id) if self.user_repo else None
         
         except Exception as e:
             logger.error(f"Fee collection error: {str(e)}")
             return False
+            
+        if not user:
+            logger.error(f"Cannot collect fees: User {user_id} not found")
+            return False
+        
+        # Calculation and recording handle their own errors
+        fee_details = self.calculate_fee_for_user(user, trade_id, profit)
+        
+        # Record fee transactions
+        transaction_id = self._record_fee_transactions(
+            user, 
+            trade_id, 
+            fee_details, 
+            profit,
+            batch_timestamp
+        )
+        
+        return transaction_id is not None
+
+    def collect_fees_batch(self, trades: Sequence[Tuple[int, int, float]]) -> List[bool]:
+        """
+        Collect and record fees for trades that settled together.
+
+        All fee transactions of the batch share one timestamp. When the
+        repositories support bulk writes, users and referral history are
+        loaded with one query each, fees are calculated with
+        calculate_fees_batch's kernel, and transactions and user profits are
+        written in one call each. The fee tier of every trade is then taken
+        from the user's total profit at the start of the batch.
+
+        Args:
+            trades (Sequence[Tuple[int, int, float]]): (user_id, trade_id, profit) per trade
+
+        Returns:
+            List[bool]: Collection success per trade, in input order
+        """
+        batch_timestamp = datetime.now()
+        if not (hasattr(self.transaction_repo, 'create_fee_transactions_bulk')
+                and hasattr(self.user_repo, 'update_user_profits_bulk')):
+            return [
+                self.collect_fees(user_id, trade_id, profit, batch_timestamp)
+                for user_id, trade_id, profit in trades
+            ]
+        
+        # Non-profitable trades have nothing to collect
+        collected = [profit <= 0 for _, _, profit in trades]
+        try:
+            profitable = [i for i, (_, _, profit) in enumerate(trades) if profit > 0]
+            if not profitable:
+                return collected
+                
+            user_ids, trade_ids, profits = (list(column) for column in zip(*trades))
+            
+            # Retrieve each user once for calculation and recording
+            wanted_ids = {user_ids[i] for i in profitable}
+            users = self._get_users(wanted_ids)
+            if len(users) < len(wanted_ids):
+                logger.error(f"Cannot collect fees: Users {sorted(wanted_ids - users.keys())} not found")
+            pending = [i for i in profitable if user_ids[i] in users]
+            if not pending:
+                return collected
+                
+            fee_details = [self._generate_zero_fee_structure(profit) for profit in profits]
+            self._fill_batch_fees(fee_details, users, user_ids, trade_ids, profits)
+            
+            # Create all transaction records at once
+            self.transaction_repo.create_fee_transactions_bulk([
+                self._build_fee_transaction(
+                    users[user_ids[i]], trade_ids[i], fee_details[i], profits[i], batch_timestamp
+                )
+                for i in pending
+            ])
+            self._fee_generation += 1
+            logger.info(f"{len(pending)} fee transactions recorded")
+            
+            # The fees are collected from here on; the updates below log their own failures
+            for i in pending:
+                collected[i] = True
+            
+            # Update user profit statistics, one total per user
+            user_profits: Dict[int, float] = {}
+            for i in pending:
+                user_profits[user_ids[i]] = user_profits.get(user_ids[i], 0) + fee_details[i]['user_profit']
+            try:
+                self.user_repo.update_user_profits_bulk(user_profits)
+            except Exception as e:
+                logger.error(f"Error writing {len(user_profits)} user profits in bulk: {str(e)}")
+                for user_id, user_profit in user_profits.items():
+                    self._write_user_update_logged('update_user_profit', user_id, user_profit)
+            
+            for i in pending:
+                user = users[user_ids[i]]
+                if user.referrer_id and fee_details[i]['referral_fee_amount'] > 0:
+                    self._write_user_update_logged(
+                        'add_referral_commission',
+                        user.referrer_id,
+                        fee_details[i]['referral_fee_amount'],
+                        user.id,
+                        trade_ids[i]
+                    )
+                
+            # These trades end the referral eligibility of the users' first profit
+            for user_id in user_profits:
+                user = users[user_id]
+                if user.referrer_id and not getattr(user, 'first_profit_recorded', False):
+                    self._mark_first_profit_recorded(user_id)
+                # The user's total profit (and so their fee tier) has changed
+                self._user_cache.pop(user_id, None)
+                
+            return collected
+            
+        except Exception as e:
+            logger.error(f"Batch fee collection error: {str(e)}")
+            # Only trades whose transactions were recorded are marked collected
+            return collected
+
+    @staticmethod
+    def _fee_columns(transactions: Sequence[Any]) -> Dict[str, np.ndarray]:
+        """
+        Convert fee transactions into one float64 array per summary column.
+
+        Args:
+            transactions (Sequence[Any]): Fee transaction records
+
+        Returns:
+            Dict[str, np.ndarray]: Contiguous array per FEE_SUMMARY_COLUMNS entry
+        """
+        rows = np.array(
+            [[getattr(t, name) for name in FEE_SUMMARY_COLUMNS] for t in transactions],
+            dtype=np.float64
+        ).reshape(-1, len(FEE_SUMMARY_COLUMNS))
+        return {
+            name: np.ascontiguousarray(rows[:, index])
+            for index, name in enumerate(FEE_SUMMARY_COLUMNS)
+        }
 
     def get_fee_summary(self, days: int = 30) -> Dict[str, Any]:
         """
         Generate comprehensive fee summary for the specified period.
 
+        Summaries are reused for summary_cache_ttl seconds, or until the next
+        fee transaction is recorded.
+
+        Args:
+            days (int): Number of days to include in the summary
+
+        Returns:
+            Dict[str, Any]: Detailed fee collection and profit statistics
+        """
+        generation = self._fee_generation
+        cached = self._summary_cache.get(days)
+        if cached and cached[0] == generation and cached[1] > time.monotonic():
+            return dict(cached[2])
+            
+        summary = self._build_fee_summary(days)
+        if 'error' not in summary:
+            self._summary_cache[days] = (generation, time.monotonic() + self.summary_cache_ttl, summary)
+        return dict(summary)
+
+    def _build_fee_summary(self, days: int) -> Dict[str, Any]:
+        """
+        Query and compute the fee summary for the specified period.
+
         Args:
             days (int): Number of days to include in the summary
 
@@ -309,21 +954,32 @@ class FeeCalculator:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            # Retrieve transactions for period
-            transactions = self.transaction_repo.get_transactions_in_period(start_date, end_date)
-            
-            # Calculate summary statistics
-            total_profit = sum(t.total_profit for t in transactions)
-            total_fees = sum(t.fee_amount for t in transactions)
-            total_referrals = sum(t.referral_fee_amount for t in transactions)
-            total_admin_fees = sum(t.admin_fee_amount for t in transactions)
+            if hasattr(self.transaction_repo, 'get_fee_aggregates'):
+                # Let the database count and sum the period in one query:
+                # (count, total_profit, fee_amount, referral_fee_amount, admin_fee_amount)
+                (transaction_count, total_profit, total_fees,
+                 total_referrals, total_admin_fees) = self.transaction_repo.get_fee_aggregates(start_date, end_date)
+            else:
+                # Column arrays keyed by FEE_SUMMARY_COLUMNS, straight from the
+                # repository when it can skip building transaction objects
+                if hasattr(self.transaction_repo, 'get_fee_columns'):
+                    columns = self.transaction_repo.get_fee_columns(start_date, end_date)
+                else:
+                    columns = self._fee_columns(
+                        self.transaction_repo.get_transactions_in_period(start_date, end_date)
+                    )
+                
+                # Calculate summary statistics
+                total_profit, total_fees, total_referrals, total_admin_fees = (
+                    float(columns[name].sum()) for name in FEE_SUMMARY_COLUMNS
+                )
+                
+                # Get transaction count
+                transaction_count = len(columns['total_profit'])
             
             # Calculate average fee percentage
             avg_fee_percent = (total_fees / total_profit * 100) if total_profit > 0 else 0
             
-            # Get transaction count
-            transaction_count = len(transactions)
-            
             # Return comprehensive summary
             return {
                 'period_days': days,
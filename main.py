@@ -5,11 +5,16 @@ This is the central integration point for the QuantumFlow trading bot system,
 coordinating all components and providing the primary entry point for the application.
 """
 
+import hashlib
 import logging
+import os
+import random
 import time
 import signal
 import threading
 import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import cached_property
 from typing import Dict, List, Any, Optional
 
 # Core components
@@ -97,6 +102,77 @@ from utils.helpers import generate_unique_id
 from utils.validators import validate_config
 from utils.decorators import log_execution, retry
 
+# Tables created by _verify_database_schema when missing, in creation order
+REQUIRED_TABLES = {
+    "user_trading_settings": """
+        CREATE TABLE IF NOT EXISTS user_trading_settings (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id) UNIQUE,
+            trading_mode VARCHAR(10) NOT NULL DEFAULT 'paper', 
+            risk_level VARCHAR(10) NOT NULL DEFAULT 'medium',
+            is_paused BOOLEAN DEFAULT false,
+            max_open_positions INTEGER DEFAULT 5,
+            max_position_size DECIMAL(10,5) DEFAULT 0.1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "fee_transactions": """
+        CREATE TABLE IF NOT EXISTS fee_transactions (
+            id SERIAL PRIMARY KEY,
+            trade_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            referrer_id INTEGER,
+            profit_amount DECIMAL(20,10) NOT NULL,
+            fee_amount DECIMAL(20,10) NOT NULL,
+            fee_rate DECIMAL(10,5) NOT NULL,
+            referral_amount DECIMAL(20,10) NOT NULL DEFAULT 0,
+            admin_amount DECIMAL(20,10) NOT NULL,
+            admin_wallet VARCHAR(255),
+            transaction_status VARCHAR(20) DEFAULT 'pending',
+            transaction_hash VARCHAR(255),
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "user_trading_pairs": """
+        CREATE TABLE IF NOT EXISTS user_trading_pairs (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            trading_pair VARCHAR(20) NOT NULL,
+            is_enabled BOOLEAN DEFAULT true,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT unique_user_pair UNIQUE (user_id, trading_pair)
+        );
+    """,
+    "user_strategies": """
+        CREATE TABLE IF NOT EXISTS user_strategies (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            strategy_name VARCHAR(50) NOT NULL,
+            allocation_percent DECIMAL(5,2) DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT unique_user_strategy UNIQUE (user_id, strategy_name)
+        );
+    """,
+}
+
+# schema_versions row holding the hash of the verified REQUIRED_TABLES definitions
+SCHEMA_VERSION_NAME = "quantumflow"
+
+# Upper bound on threads building components at startup; kept small since
+# most constructors are cheap and the rest mostly wait on the database
+STARTUP_WORKERS = 6
+
+# Upper bound of the random offset added to scheduled task intervals
+TASK_JITTER_SECONDS = 60
+
+# Services started on the shared executor, each holding a worker while it runs
+SERVICE_COUNT = 5
+
 
 class QuantumFlowBot:
     """
@@ -132,307 +208,324 @@ class QuantumFlowBot:
         # System state
         self.running = False
         self.initialized = False
-        self.threads = []
+        # Long-running services share one pool, created on each start
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self._futures = []
         self.components = {}
         self.system_status = "initializing"
         
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self.handle_shutdown_signal)
-        signal.signal(signal.SIGTERM, self.handle_shutdown_signal)
+        # Set by the signal handlers; run_forever performs the shutdown
+        self._shutdown_event = threading.Event()
+        
+        # Setup signal handlers for graceful shutdown (only possible on the main thread)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.handle_shutdown_signal)
+            signal.signal(signal.SIGTERM, self.handle_shutdown_signal)
         
         # Initialize but don't start components yet
         self._init_components()
     
+    def _config_section(self, path: str) -> Dict[str, Any]:
+        """
+        Get a configuration section.
+        
+        Args:
+            path: Section key (dot notation)
+            
+        Returns:
+            The section, or an empty dict if it is missing or not a section
+        """
+        section = self.app_config.get(path, {})
+        return section if isinstance(section, dict) else {}
+    
+    @cached_property
+    def data_processor(self) -> DataProcessor:
+        """ML data processor, built on first use."""
+        return DataProcessor(
+            cache_dir=self._config_section("ml.data_processing").get("cache_dir", "cache")
+        )
+    
+    @cached_property
+    def price_predictor(self) -> PricePredictor:
+        """Price prediction model, built on first use."""
+        return PricePredictor(
+            model_dir=self._config_section("ml.models.price_predictor").get("model_dir", "models")
+        )
+    
+    @cached_property
+    def pattern_recognition(self) -> PatternRecognition:
+        """Pattern recognition model, built on first use."""
+        return PatternRecognition(
+            model_dir=self._config_section("ml.models.pattern_recognition").get("model_dir", "models")
+        )
+    
+    @cached_property
+    def regime_classifier(self) -> RegimeClassifier:
+        """Market regime classification model, built on first use."""
+        return RegimeClassifier(
+            model_dir=self._config_section("ml.models.regime_classifier").get("model_dir", "models")
+        )
+    
+    @cached_property
+    def model_trainer(self) -> ModelTrainer:
+        """ML model trainer, built when the first training task runs."""
+        training_config = self._config_section("ml.training")
+        return ModelTrainer(
+            model_dir=training_config.get("model_dir", "models"),
+            data_dir=training_config.get("data_dir", "data")
+        )
+    
     @log_execution
     def _init_components(self):
         """Initialize all system components without starting them."""
         try:
             self.logger.info("Initializing system components...")
             
-            # Initialize core database
-            try:
-                db_url = f"postgresql://{self.app_config.get('database.username')}:{self.app_config.get('database.password')}@{self.app_config.get('database.host')}:{self.app_config.get('database.port')}/{self.app_config.get('database.name')}"
-                self.db_manager = DatabaseManager(db_url)
-                # Make sure database is properly initialized and schema is validated
-                if not self.db_manager.initialize():
-                    raise RuntimeError("Database initialization failed")
-                
-                # Verify the schema immediately after initialization
-                # This will add missing columns and avoid errors later
-                self._verify_database_schema()
-                
-            except Exception as e:
-                self.logger.error(f"Failed to initialize database: {str(e)}")
-                raise RuntimeError("Database initialization failed") from e
-            
-            # Initialize repositories - use enhanced versions with schema adaptation
-            self.user_repo = UserRepository(self.db_manager)
-            self.trade_repo = TradeRepository(self.db_manager)
-            self.position_repo = PositionRepository(self.db_manager)
-            self.analytics_repo = AnalyticsRepository(self.db_manager)
-            
-            # Initialize security services
-            jwt_secret = self.app_config.get("security.jwt_secret")
+            # Look up each configuration section once
+            db_config = self._config_section("database")
+            security_config = self._config_section("security")
+            exchange_config = self._config_section("exchange")
+            notification_config = self._config_section("notification")
+            email_config = self._config_section("notification.email")
+            telegram_config = self._config_section("notification.telegram")
+            admin_config = self._config_section("admin")
+            admin_telegram_config = self._config_section("admin.telegram")
+            dashboard_config = self._config_section("admin.dashboard")
+            compliance_config = self._config_section("compliance")
+            profit_config = self._config_section("profit")
+            
+            jwt_secret = security_config.get("jwt_secret")
             if not jwt_secret:
                 raise ValueError("JWT secret is required but not found in configuration")
-                
-            self.encryption_service = EncryptionService(
-                key=self.app_config.get("security.encryption_key")
-            )
-            self.auth_service = AuthenticationService(
-                db=self.db_manager,
-                jwt_secret=self.app_config.get("security.jwt_secret")
-            )
-            self.api_key_manager = APIKeyManager(
-                db=self.db_manager,
-            )
-            
-            # Initialize API key repository
-            self.api_key_repository = ApiKeyRepository(
-                db_manager=self.db_manager,
-                encryption_service=self.encryption_service
-            )
-            
-            # Initialize exchange components
-            self.exchange_factory = ExchangeFactory()
-            # Get a default exchange instance for analysis
-            default_exchange = self.exchange_factory.create_exchange(
-                exchange_name=self.app_config.get("exchange.default", "binance"),
-                api_key=self.app_config.get("exchange.api_key", ""),
-                api_secret=self.app_config.get("exchange.api_secret", "")
-            )
-            
-            # Initialize notification components first (since other components depend on them)
-            self.email_notifier = EmailNotifier(
-                enabled=self.app_config.get("notification.email.enabled", False),
-                smtp_server=self.app_config.get("notification.email.smtp_server", ""),
-                smtp_port=self.app_config.get("notification.email.smtp_port", 587),
-                smtp_username=self.app_config.get("notification.email.smtp_username", ""),
-                smtp_password=self.app_config.get("notification.email.smtp_password", ""),
-                from_email=self.app_config.get("notification.email.from_email", "")
-            )
-            self.notification_manager = NotificationManager(
-                config=self.app_config.get("notification.general")
-            )
-            
-            # Initialize risk management components
-            self.position_sizer = PositionSizer(config=self.app_config)
-            self.drawdown_protector = DrawdownProtector(
-                config=self.app_config,
-                db=self.db_manager,
-                notification_manager=self.notification_manager
-            )
-            self.risk_manager = RiskManager(
-                config=self.app_config,
-                db=self.db_manager
-            )
-            
-            # Initialize strategy factory with required parameters
-            self.strategy_factory = StrategyFactory(
-                config=self.app_config,  # Pass AppConfig instance
-                risk_manager=self.risk_manager  # Pass RiskManager instance
-            )
-            
-            # Initialize analysis tools
-            self.technical_indicators = TechnicalIndicators()
-            self.sentiment_analyzer = SentimentAnalyzer()
-            # Market analyzer requires an exchange instance
-            self.market_analyzer = MarketAnalyzer(
-                exchange=default_exchange
-            )
             
-            # Initialize ML components
-            # DataProcessor initialization
-            data_processing_config = self.app_config.get("ml.data_processing", {})
-            cache_dir = data_processing_config.get("cache_dir", "cache") if isinstance(data_processing_config, dict) else "cache"
-            self.data_processor = DataProcessor(
-                cache_dir=cache_dir
-            )
-            
-            # PricePredictor initialization
-            price_predictor_config = self.app_config.get("ml.models.price_predictor", {})
-            price_model_dir = price_predictor_config.get("model_dir", "models") if isinstance(price_predictor_config, dict) else "models"
-            self.price_predictor = PricePredictor(
-                model_dir=price_model_dir
-            )
-            
-            # PatternRecognition initialization
-            pattern_recognition_config = self.app_config.get("ml.models.pattern_recognition", {})
-            pattern_model_dir = pattern_recognition_config.get("model_dir", "models") if isinstance(pattern_recognition_config, dict) else "models"
-            self.pattern_recognition = PatternRecognition(
-                model_dir=pattern_model_dir
-            )
-            
-            # RegimeClassifier initialization
-            regime_classifier_config = self.app_config.get("ml.models.regime_classifier", {})
-            regime_model_dir = regime_classifier_config.get("model_dir", "models") if isinstance(regime_classifier_config, dict) else "models"
-            self.regime_classifier = RegimeClassifier(
-                model_dir=regime_model_dir
-            )
-            # Initialize ML model trainer
-            training_config = self.app_config.get("ml.training", {})
-            model_dir = training_config.get("model_dir", "models") if isinstance(training_config, dict) else "models"
-            data_dir = training_config.get("data_dir", "data") if isinstance(training_config, dict) else "data"
-            
-            self.model_trainer = ModelTrainer(
-                model_dir=model_dir,
-                data_dir=data_dir
-            )
-            
-            # NEW SERVICES INITIALIZATION
-            self.user_trading_manager = UserTradingManager(
-                db=self.db_manager
-            )
-
-            self.pairs_manager = PairsManager(
-                db=self.db_manager
-            )
-
-            self.strategy_manager = StrategyManager(
-                db=self.db_manager
-            )
-
-            self.price_service = PriceService(
-                db=self.db_manager
-            )
-
-            self.market_analysis = MarketAnalysis(
-                db=self.db_manager
-            )
-
-            self.stats_service = StatsService(
-                db=self.db_manager
-            )
-
-            self.report_generator = ReportGenerator(
-                db=self.db_manager
-            )
-            
-            # Initialize telegram bot 
-            telegram_token = self.app_config.get("notification.telegram.token", "")
-            admin_chat_ids = self.app_config.get("admin.admin_user_ids", [])
-            
-            self.telegram_bot = TelegramBot(
-                token=telegram_token,
-                admin_chat_ids=admin_chat_ids,
-                api_key_repository=self.api_key_repository,
-                db=self.db_manager,
-                user_trading_manager=self.user_trading_manager,
-                pairs_manager=self.pairs_manager,
-                strategy_manager=self.strategy_manager,
-                price_service=self.price_service,
-                market_analysis=self.market_analysis,
-                stats_service=self.stats_service,
-                report_generator=self.report_generator
-            )
-
-            # Initialize Exchange Helper
-            self.exchange_helper = ExchangeHelper(
-                exchange_factory=self.exchange_factory,
-                api_key_repository=self.api_key_repository,
-                user_repository=self.user_repo
-            )
-            
-            # Initialize admin components
-            self.system_monitoring = SystemMonitoring(
-                notification_manager=self.notification_manager
-            )
-            self.admin_bot = AdminBot(
-                token=self.app_config.get("admin.telegram.token"),
-                admin_ids=self.app_config.get("admin.admin_user_ids"),
-                user_repository=self.user_repo,
-                trade_repository=self.trade_repo,
-                system_monitoring=self.system_monitoring
-            )
-            self.dashboard_api = DashboardAPI(
-                auth_service=self.auth_service,
-                user_repository=self.user_repo,
-                trade_repository=self.trade_repo,
-                analytics_repository=self.analytics_repo,
-                system_monitoring=self.system_monitoring,
-                host=self.app_config.get("admin.dashboard.host"),
-                port=self.app_config.get("admin.dashboard.port")
-            )
-            
-            # Initialize compliance components
-            self.kyc_processor = KYCProcessor(
-                user_repository=self.user_repo,
-                notification_manager=self.notification_manager,
-                config=self.app_config.get("compliance.kyc")
-            )
-            self.aml_checker = AMLChecker(
-                user_repository=self.user_repo,
-                trade_repository=self.trade_repo,
-                notification_manager=self.notification_manager,
-                config=self.app_config.get("compliance.aml")
-            )
-            self.compliance_reporter = ComplianceReporter(
-                user_repository=self.user_repo,
-                trade_repository=self.trade_repo,
-                config=self.app_config.get("compliance.reporting")
-            )
-            
-            # Initialize profit tracking
-            self.fee_calculator = FeeCalculator(
-                config=self.app_config.get("profit.fees")
-            )
-            self.profit_tracker = ProfitTracker(
-                fee_calculator=self.fee_calculator,
-                trade_repository=self.trade_repo,
-                user_repository=self.user_repo,
-                config=self.app_config.get("profit.tracking")
-            )
-            
-            # Initialize system monitor first (needed for self-healing)
-            self.system_monitor = SystemMonitor(
-                notification_manager=self.notification_manager
-            )
-            
-            # Initialize scheduler (needed for many components)
-            self.scheduler = TaskScheduler()
-            
-            # Initialize trading engine (depends on many components)
-            self.trading_engine = TradingEngine(
-                config=self.app_config,
-                trading_config=self.trading_config,
-                db=self.db_manager,
-                exchange_factory=self.exchange_factory,
-                strategy_factory=self.strategy_factory,
-                api_key_manager=self.api_key_manager,
-                risk_manager=self.risk_manager,
-                notification_manager=self.notification_manager,
-                market_analyzer=self.market_analyzer,
-                price_predictor=self.price_predictor,
-                pattern_recognition=self.pattern_recognition,
-                regime_classifier=self.regime_classifier,
-                position_repository=self.position_repo,
-                trade_repository=self.trade_repo,
-                user_repository=self.user_repo,
-                profit_tracker=self.profit_tracker,
-                user_trading_manager=self.user_trading_manager,
-                pairs_manager=self.pairs_manager,
-                strategy_manager=self.strategy_manager,
-                price_service=self.price_service,
-                market_analysis=self.market_analysis
-            )
-            
-            # Initialize self-healing AFTER trading engine
-            # This ensures it has a valid reference
-            self.self_healing = SelfHealingSystem(
-                config=self.app_config,
-                trading_engine=self.trading_engine,
-                system_monitor=self.system_monitor,
-                notification_manager=self.notification_manager
-            )
+            # Component name -> (names of components it needs, builder).
+            # Independent components are built concurrently, so the database
+            # setup overlaps with everything that does not need it.
+            nodes = {
+                # Core database
+                "db_manager": ([], lambda: self._init_database(db_config)),
+                
+                # Repositories - use enhanced versions with schema adaptation
+                "user_repo": (["db_manager"], lambda: UserRepository(self.db_manager)),
+                "trade_repo": (["db_manager"], lambda: TradeRepository(self.db_manager)),
+                "position_repo": (["db_manager"], lambda: PositionRepository(self.db_manager)),
+                "analytics_repo": (["db_manager"], lambda: AnalyticsRepository(self.db_manager)),
+                
+                # Security services
+                "encryption_service": ([], lambda: EncryptionService(
+                    key=security_config.get("encryption_key")
+                )),
+                "auth_service": (["db_manager"], lambda: AuthenticationService(
+                    db=self.db_manager,
+                    jwt_secret=jwt_secret
+                )),
+                "api_key_manager": (["db_manager"], lambda: APIKeyManager(
+                    db=self.db_manager,
+                )),
+                "api_key_repository": (["db_manager", "encryption_service"], lambda: ApiKeyRepository(
+                    db_manager=self.db_manager,
+                    encryption_service=self.encryption_service
+                )),
+                
+                # Exchange components
+                "exchange_factory": ([], ExchangeFactory),
+                
+                # Notification components
+                "email_notifier": ([], lambda: EmailNotifier(
+                    enabled=email_config.get("enabled", False),
+                    smtp_server=email_config.get("smtp_server", ""),
+                    smtp_port=email_config.get("smtp_port", 587),
+                    smtp_username=email_config.get("smtp_username", ""),
+                    smtp_password=email_config.get("smtp_password", ""),
+                    from_email=email_config.get("from_email", "")
+                )),
+                "notification_manager": ([], lambda: NotificationManager(
+                    config=notification_config.get("general")
+                )),
+                
+                # Risk management components
+                "position_sizer": ([], lambda: PositionSizer(config=self.app_config)),
+                "drawdown_protector": (["db_manager", "notification_manager"], lambda: DrawdownProtector(
+                    config=self.app_config,
+                    db=self.db_manager,
+                    notification_manager=self.notification_manager
+                )),
+                "risk_manager": (["db_manager"], lambda: RiskManager(
+                    config=self.app_config,
+                    db=self.db_manager
+                )),
+                "strategy_factory": (["risk_manager"], lambda: StrategyFactory(
+                    config=self.app_config,  # Pass AppConfig instance
+                    risk_manager=self.risk_manager  # Pass RiskManager instance
+                )),
+                
+                # Analysis tools
+                "technical_indicators": ([], TechnicalIndicators),
+                "sentiment_analyzer": ([], SentimentAnalyzer),
+                # Market analyzer creates its default exchange on first use
+                "market_analyzer": (["exchange_factory"], lambda: MarketAnalyzer(
+                    exchange_provider=lambda: self.exchange_factory.create_exchange(
+                        exchange_name=exchange_config.get("default", "binance"),
+                        api_key=exchange_config.get("api_key", ""),
+                        api_secret=exchange_config.get("api_secret", "")
+                    )
+                )),
+                
+                # ML components (data_processor, price_predictor, pattern_recognition,
+                # regime_classifier, model_trainer) are built on first use
+                
+                # NEW SERVICES
+                "user_trading_manager": (["db_manager"], lambda: UserTradingManager(db=self.db_manager)),
+                "pairs_manager": (["db_manager"], lambda: PairsManager(db=self.db_manager)),
+                "strategy_manager": (["db_manager"], lambda: StrategyManager(db=self.db_manager)),
+                "price_service": (["db_manager"], lambda: PriceService(db=self.db_manager)),
+                "market_analysis": (["db_manager"], lambda: MarketAnalysis(db=self.db_manager)),
+                "stats_service": (["db_manager"], lambda: StatsService(db=self.db_manager)),
+                "report_generator": (["db_manager"], lambda: ReportGenerator(db=self.db_manager)),
+                
+                # Telegram bot
+                "telegram_bot": (
+                    ["api_key_repository", "db_manager", "user_trading_manager", "pairs_manager",
+                     "strategy_manager", "price_service", "market_analysis", "stats_service",
+                     "report_generator"],
+                    lambda: TelegramBot(
+                        token=telegram_config.get("token", ""),
+                        admin_chat_ids=admin_config.get("admin_user_ids", []),
+                        api_key_repository=self.api_key_repository,
+                        db=self.db_manager,
+                        user_trading_manager=self.user_trading_manager,
+                        pairs_manager=self.pairs_manager,
+                        strategy_manager=self.strategy_manager,
+                        price_service=self.price_service,
+                        market_analysis=self.market_analysis,
+                        stats_service=self.stats_service,
+                        report_generator=self.report_generator
+                    )
+                ),
+                
+                # Exchange Helper
+                "exchange_helper": (["exchange_factory", "api_key_repository", "user_repo"], lambda: ExchangeHelper(
+                    exchange_factory=self.exchange_factory,
+                    api_key_repository=self.api_key_repository,
+                    user_repository=self.user_repo
+                )),
+                
+                # Admin components
+                "system_monitoring": (["notification_manager"], lambda: SystemMonitoring(
+                    notification_manager=self.notification_manager
+                )),
+                "admin_bot": (["user_repo", "trade_repo", "system_monitoring"], lambda: AdminBot(
+                    token=admin_telegram_config.get("token"),
+                    admin_ids=admin_config.get("admin_user_ids"),
+                    user_repository=self.user_repo,
+                    trade_repository=self.trade_repo,
+                    system_monitoring=self.system_monitoring
+                )),
+                "dashboard_api": (
+                    ["auth_service", "user_repo", "trade_repo", "analytics_repo", "system_monitoring"],
+                    lambda: DashboardAPI(
+                        auth_service=self.auth_service,
+                        user_repository=self.user_repo,
+                        trade_repository=self.trade_repo,
+                        analytics_repository=self.analytics_repo,
+                        system_monitoring=self.system_monitoring,
+                        host=dashboard_config.get("host"),
+                        port=dashboard_config.get("port")
+                    )
+                ),
+                
+                # Compliance components
+                "kyc_processor": (["user_repo", "notification_manager"], lambda: KYCProcessor(
+                    user_repository=self.user_repo,
+                    notification_manager=self.notification_manager,
+                    config=compliance_config.get("kyc")
+                )),
+                "aml_checker": (["user_repo", "trade_repo", "notification_manager"], lambda: AMLChecker(
+                    user_repository=self.user_repo,
+                    trade_repository=self.trade_repo,
+                    notification_manager=self.notification_manager,
+                    config=compliance_config.get("aml")
+                )),
+                "compliance_reporter": (["user_repo", "trade_repo"], lambda: ComplianceReporter(
+                    user_repository=self.user_repo,
+                    trade_repository=self.trade_repo,
+                    config=compliance_config.get("reporting")
+                )),
+                
+                # Profit tracking
+                "fee_calculator": ([], lambda: FeeCalculator(
+                    config=profit_config.get("fees")
+                )),
+                "profit_tracker": (["fee_calculator", "trade_repo", "user_repo"], lambda: ProfitTracker(
+                    fee_calculator=self.fee_calculator,
+                    trade_repository=self.trade_repo,
+                    user_repository=self.user_repo,
+                    config=profit_config.get("tracking")
+                )),
+                
+                # System monitor (needed for self-healing)
+                "system_monitor": (["notification_manager"], lambda: SystemMonitor(
+                    notification_manager=self.notification_manager
+                )),
+                
+                # Scheduler (needed for many components)
+                "scheduler": ([], TaskScheduler),
+                
+                # Trading engine (depends on many components)
+                "trading_engine": (
+                    ["db_manager", "exchange_factory", "exchange_helper", "strategy_factory", "api_key_manager",
+                     "risk_manager", "notification_manager", "market_analyzer", "position_repo",
+                     "trade_repo", "user_repo", "profit_tracker", "user_trading_manager",
+                     "pairs_manager", "strategy_manager", "price_service", "market_analysis"],
+                    lambda: TradingEngine(
+                        config=self.app_config,
+                        trading_config=self.trading_config,
+                        db=self.db_manager,
+                        exchange_factory=self.exchange_factory,
+                        strategy_factory=self.strategy_factory,
+                        api_key_manager=self.api_key_manager,
+                        risk_manager=self.risk_manager,
+                        notification_manager=self.notification_manager,
+                        market_analyzer=self.market_analyzer,
+                        price_predictor=lambda: self.price_predictor,
+                        pattern_recognition=lambda: self.pattern_recognition,
+                        regime_classifier=lambda: self.regime_classifier,
+                        position_repository=self.position_repo,
+                        trade_repository=self.trade_repo,
+                        user_repository=self.user_repo,
+                        profit_tracker=self.profit_tracker,
+                        exchange_helper=self.exchange_helper,
+                        user_trading_manager=self.user_trading_manager,
+                        pairs_manager=self.pairs_manager,
+                        strategy_manager=self.strategy_manager,
+                        price_service=self.price_service,
+                        market_analysis=self.market_analysis
+                    )
+                ),
+                
+                # Self-healing AFTER trading engine
+                # This ensures it has a valid reference
+                "self_healing": (["trading_engine", "system_monitor", "notification_manager"], lambda: SelfHealingSystem(
+                    config=self.app_config,
+                    trading_engine=self.trading_engine,
+                    system_monitor=self.system_monitor,
+                    notification_manager=self.notification_manager
+                )),
+                
+                # Core application (coordinates all components)
+                "app": (["trading_engine", "notification_manager", "scheduler", "user_repo"], lambda: Application(
+                    trading_engine=self.trading_engine,
+                    notification_manager=self.notification_manager,
+                    scheduler=self.scheduler,
+                    user_repository=self.user_repo,
+                    config=self.app_config
+                )),
+            }
+            self._build_components(nodes, max_workers=min(STARTUP_WORKERS, os.cpu_count() or 1))
             
-            # Initialize core application (coordinates all components)
-            self.app = Application(
-                trading_engine=self.trading_engine,
-                notification_manager=self.notification_manager,
-                scheduler=self.scheduler,
-                user_repository=self.user_repo,
-                config=self.app_config
-            )
+            # The key stores are built before the helper, so point them at it afterwards
+            self.api_key_manager.exchange_helper = self.exchange_helper
+            self.api_key_repository.exchange_helper = self.exchange_helper
             
             # Track components for status reporting and management
             self.components = {
@@ -463,210 +556,255 @@ class QuantumFlowBot:
             self.system_status = "initialization_error"
             raise
 
+    def _init_database(self, db_config: Dict[str, Any]) -> DatabaseManager:
+        """
+        Create and initialize the database manager and verify the schema.
+
+        Args:
+            db_config: The "database" configuration section
+
+        Returns:
+            Initialized database manager
+
+        Raises:
+            RuntimeError: If the database cannot be initialized
+        """
+        try:
+            db_url = f"postgresql://{db_config.get('username')}:{db_config.get('password')}@{db_config.get('host')}:{db_config.get('port')}/{db_config.get('name')}"
+            self.db_manager = DatabaseManager(
+                db_url,
+                max_connections=db_config.get("max_connections", 30),
+                connection_timeout=db_config.get("connection_timeout", 60),
+                min_connections=db_config.get("min_connections", 5),
+                pgbouncer=db_config.get("pgbouncer", False)
+            )
+            # Make sure database is properly initialized and schema is validated
+            if not self.db_manager.initialize():
+                raise RuntimeError("Database initialization failed")
+            
+            # Verify the schema immediately after initialization
+            # This will add missing columns and avoid errors later
+            self._verify_database_schema()
+            return self.db_manager
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize database: {str(e)}")
+            raise RuntimeError("Database initialization failed") from e
+
+    def _build_components(self, nodes: Dict[str, Any], max_workers: int):
+        """
+        Build components concurrently in dependency order.
+
+        Each component is submitted to the pool as soon as everything it
+        depends on has been built, and is set on self under its name.
+
+        Args:
+            nodes: Component name -> (names of the components it depends on, builder)
+            max_workers: Number of startup threads
+
+        Raises:
+            RuntimeError: If some dependencies can never be satisfied
+            Exception: The first builder failure, once in-flight builds finish
+        """
+        pending = dict(nodes)
+        running = {}
+        built = set()
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qf-init") as pool:
+            while pending or running:
+                for name, (deps, builder) in list(pending.items()):
+                    if built.issuperset(deps):
+                        running[pool.submit(builder)] = name
+                        del pending[name]
+                
+                if not running:
+                    raise RuntimeError(f"Unresolvable component dependencies: {', '.join(pending)}")
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    setattr(self, name, future.result())
+                    built.add(name)
+
     def _verify_database_schema(self):
-        """Verify and fix database schema issues."""
+        """
+        Verify and fix database schema issues.
+
+        Creates any missing REQUIRED_TABLES, then records a hash of their
+        definitions in schema_versions so later startups with the same
+        definitions skip the check entirely. Every statement is idempotent,
+        so the connection runs in autocommit mode.
+        """
+        conn = None
         try:
             self.logger.info("Verifying database schema...")
             
             conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            # Check user_trading_settings table existence
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'user_trading_settings'
-                );
-            """)
-
-            if not cursor.fetchone()[0]:
-                self.logger.warning("user_trading_settings table doesn't exist, creating it now")
-                cursor.execute("""
-                    CREATE TABLE user_trading_settings (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL REFERENCES users(id) UNIQUE,
-                        trading_mode VARCHAR(10) NOT NULL DEFAULT 'paper', 
-                        risk_level VARCHAR(10) NOT NULL DEFAULT 'medium',
-                        is_paused BOOLEAN DEFAULT false,
-                        max_open_positions INTEGER DEFAULT 5,
-                        max_position_size DECIMAL(10,5) DEFAULT 0.1,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                """)
-
-            # Check fee_transactions table existence
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'fee_transactions'
-                );
-            """)
-
-            if not cursor.fetchone()[0]:
-                self.logger.warning("fee_transactions table doesn't exist, creating it now")
-                cursor.execute("""
-                    CREATE TABLE fee_transactions (
-                        id SERIAL PRIMARY KEY,
-                        trade_id INTEGER NOT NULL,
-                        user_id INTEGER NOT NULL,
-                        referrer_id INTEGER,
-                        profit_amount DECIMAL(20,10) NOT NULL,
-                        fee_amount DECIMAL(20,10) NOT NULL,
-                        fee_rate DECIMAL(10,5) NOT NULL,
-                        referral_amount DECIMAL(20,10) NOT NULL DEFAULT 0,
-                        admin_amount DECIMAL(20,10) NOT NULL,
-                        admin_wallet VARCHAR(255),
-                        transaction_status VARCHAR(20) DEFAULT 'pending',
-                        transaction_hash VARCHAR(255),
-                        notes TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    );
-                """)
-
-            # Check user_trading_pairs table existence
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'user_trading_pairs'
-                );
-            """)
-
-            if not cursor.fetchone()[0]:
-                self.logger.warning("user_trading_pairs table doesn't exist, creating it now")
-                cursor.execute("""
-                    CREATE TABLE user_trading_pairs (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL REFERENCES users(id),
-                        trading_pair VARCHAR(20) NOT NULL,
-                        is_enabled BOOLEAN DEFAULT true,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        CONSTRAINT unique_user_pair UNIQUE (user_id, trading_pair)
-                    );
-                """)
-
-            # Check user_strategies table existence
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'user_strategies'
-                );
-            """)
-
-            if not cursor.fetchone()[0]:
-                self.logger.warning("user_strategies table doesn't exist, creating it now")
-                cursor.execute("""
-                    CREATE TABLE user_strategies (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL REFERENCES users(id),
-                        strategy_name VARCHAR(50) NOT NULL,
-                        allocation_percent DECIMAL(5,2) DEFAULT 0,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        CONSTRAINT unique_user_strategy UNIQUE (user_id, strategy_name)
+            # End the transaction opened by the pool's validation query
+            conn.rollback()
+            conn.autocommit = True
+            
+            schema_hash = hashlib.sha256("".join(REQUIRED_TABLES.values()).encode()).hexdigest()
+            
+            with conn.cursor() as cursor:
+                # Warm restart: the schema was already verified with these definitions
+                try:
+                    cursor.execute(
+                        "SELECT hash FROM schema_versions WHERE name = %s",
+                        (SCHEMA_VERSION_NAME,)
+                    )
+                    row = cursor.fetchone()
+                    if row and row[0] == schema_hash:
+                        self.logger.info("Database schema is up to date")
+                        return
+                except Exception:
+                    # schema_versions does not exist yet
+                    pass
+                
+                # Create whatever is missing in a single round-trip
+                self.logger.info("Creating any missing database tables")
+                cursor.execute(
+                    "DO $$ BEGIN"
+                    + "".join(REQUIRED_TABLES.values())
+                    + """
+                    CREATE TABLE IF NOT EXISTS schema_versions (
+                        name TEXT PRIMARY KEY,
+                        hash TEXT NOT NULL,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     );
-                """)
-
-            conn.commit()
+                    END $$;"""
+                )
+                
+                # Remember the verified definitions
+                cursor.execute(
+                    """
+                    INSERT INTO schema_versions (name, hash, applied_at)
+                    VALUES (%s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (name) DO UPDATE
+                    SET hash = EXCLUDED.hash, applied_at = EXCLUDED.applied_at
+                    """,
+                    (SCHEMA_VERSION_NAME, schema_hash)
+                )
+            
             self.logger.info("Database schema verification completed")
             
         except Exception as e:
-            conn.rollback()
             self.logger.error(f"Database schema verification failed: {str(e)}")
         finally:
-            cursor.close()
-            self.db_manager.release_connection(conn)
+            if conn:
+                # Other pool users expect transactional connections
+                try:
+                    conn.autocommit = False
+                except Exception:
+                    pass
+                self.db_manager.release_connection(conn)
 
     def _register_scheduled_tasks(self):
         """Register all scheduled tasks with the scheduler."""
         self.logger.info("Registering scheduled tasks...")
         
-        # Register model training tasks
-        self.scheduler.schedule(
-            func=self.model_trainer.train_price_predictor,
+        seen = set()
+        
+        def register(func, interval_seconds: int, task_id: str, **kwargs):
+            # Task ids key the scheduler's task table, where a repeat would
+            # silently replace the earlier task
+            if task_id in seen:
+                raise ValueError(f"Duplicate scheduled task id: {task_id}")
+            seen.add(task_id)
+            
+            # A random offset keeps tasks with the same interval from hitting
+            # the database and exchanges at the same moment
+            self.scheduler.schedule(
+                task_func=func,
+                interval_seconds=interval_seconds + random.randint(0, TASK_JITTER_SECONDS),
+                task_id=task_id,
+                **kwargs
+            )
+        
+        # Register model training tasks; the trainer is built when a task first runs
+        register(
+            func=lambda: self.model_trainer.train_price_predictor(),
             interval_seconds=86400,  # Daily
             task_id="train_price_predictor"
         )
         
-        self.scheduler.schedule(
-            func=self.model_trainer.train_pattern_recognition,
+        register(
+            func=lambda: self.model_trainer.train_pattern_recognition(),
             interval_seconds=86400 * 3,  # Every 3 days
             task_id="train_pattern_recognition"
         )
         
-        self.scheduler.schedule(
-            func=self.model_trainer.train_regime_classifier,
+        register(
+            func=lambda: self.model_trainer.train_regime_classifier(),
             interval_seconds=86400 * 7,  # Weekly
             task_id="train_regime_classifier"
         )
         
         # Register risk management tasks
-        self.scheduler.schedule(
+        register(
             func=self.risk_manager.update_user_risk_metrics,
             interval_seconds=3600,  # Hourly
             task_id="update_risk_metrics"
         )
         
-        self.scheduler.schedule(
+        register(
             func=self.drawdown_protector.check_drawdowns,
             interval_seconds=600,  # Every 10 minutes
             task_id="check_drawdowns"
         )
         
         # Register market analysis tasks
-        self.scheduler.schedule(
+        register(
             func=self.market_analyzer.update_analysis,
             interval_seconds=1800,  # Every 30 minutes
             task_id="update_market_analysis"
         )
         
         # Register maintenance tasks
-        self.scheduler.schedule(
+        register(
             func=self.system_monitor.check_system_health,
             interval_seconds=300,  # Every 5 minutes
             task_id="check_system_health"
         )
         
-        self.scheduler.schedule(
+        register(
             func=self.self_healing.check_and_heal,
             interval_seconds=3600,  # Hourly
             task_id="self_healing"
         )
         
         # Register compliance tasks
-        self.scheduler.schedule(
+        register(
             func=self.aml_checker.run_scheduled_checks,
             interval_seconds=86400,  # Daily
             task_id="aml_checks"
         )
         
-        self.scheduler.schedule(
+        register(
             func=self.compliance_reporter.generate_daily_report,
             interval_seconds=86400,  # Daily
             task_id="compliance_report",
-            run_at_time="23:00:00"  # Run at 11 PM
+            run_at_time="23:00"  # Run at 11 PM
         )
         
         # New scheduled tasks for new services
-        self.scheduler.schedule(
+        register(
             func=self.user_trading_manager.check_paused_accounts,
             interval_seconds=3600,  # Hourly
             task_id="check_paused_accounts"
         )
 
-        self.scheduler.schedule(
+        register(
             func=self.market_analysis.update_market_analysis,
             interval_seconds=1800,  # 30 minutes
-            task_id="update_market_analysis"
+            task_id="update_market_analysis_service"
         )
 
-        self.scheduler.schedule(
+        register(
             func=self.stats_service.generate_daily_statistics,
             interval_seconds=86400,  # Daily
             task_id="generate_daily_statistics",
-            run_at_time="00:15:00"  # Run at 15 minutes past midnight
+            run_at_time="00:15"  # Run at 15 minutes past midnight
         )
         
         self.logger.info("Successfully registered all scheduled tasks")
@@ -687,52 +825,30 @@ class QuantumFlowBot:
             if hasattr(self.notification_manager, 'start'):
                 self.notification_manager.start()
             
-            # Start telegram bot in a separate thread
-            telegram_thread = threading.Thread(
-                target=self.telegram_bot.start_polling,
-                name="TelegramBot"
+            # Each service holds a worker for as long as it runs, so the pool
+            # is never smaller than the number of services
+            worker_threads = self.app_config.get("system.threads.service_worker_threads", 6)
+            self.executor = ThreadPoolExecutor(
+                max_workers=max(worker_threads, SERVICE_COUNT),
+                thread_name_prefix="qf"
             )
-            telegram_thread.daemon = True
-            telegram_thread.start()
-            self.threads.append(telegram_thread)
+            self._futures = []
             
-            # Start admin components
-            admin_bot_thread = threading.Thread(
-                target=self.admin_bot.start_polling,
-                name="AdminBot"
-            )
-            admin_bot_thread.daemon = True
-            admin_bot_thread.start()
-            self.threads.append(admin_bot_thread)
+            # Start telegram bot
+            self._submit_service(self.telegram_bot.start_polling)
             
-            dashboard_thread = threading.Thread(
-                target=self.dashboard_api.start,
-                name="DashboardAPI"
-            )
-            dashboard_thread.daemon = True
-            dashboard_thread.start()
-            self.threads.append(dashboard_thread)
+            # Start admin components
+            self._submit_service(self.admin_bot.start_polling)
+            self._submit_service(self.dashboard_api.start)
             
             # Start trading engine
-            trading_thread = threading.Thread(
-                target=self.trading_engine.start,
-                name="TradingEngine"
-            )
-            trading_thread.daemon = True
-            trading_thread.start()
-            self.threads.append(trading_thread)
+            self._submit_service(self.trading_engine.start)
             
             # Register all scheduled tasks
             self._register_scheduled_tasks()
             
             # Finally, start the application coordinator
-            app_thread = threading.Thread(
-                target=self.app.run,
-                name="ApplicationCoordinator"
-            )
-            app_thread.daemon = True
-            app_thread.start()
-            self.threads.append(app_thread)
+            self._submit_service(self.app.run)
             
             self.running = True
             self.system_status = "running"
@@ -745,6 +861,40 @@ class QuantumFlowBot:
             self._emergency_shutdown()
             raise
 
+    def _submit_service(self, target):
+        """
+        Run a long-running service on the shared executor.
+
+        Args:
+            target: Callable that runs the service until it is stopped
+        """
+        future = self.executor.submit(target)
+        future.add_done_callback(self._log_service_exit)
+        self._futures.append(future)
+
+    def _log_service_exit(self, future):
+        """Log a service that stopped with an exception."""
+        if not future.cancelled() and future.exception():
+            self.logger.error(f"Service stopped with an error: {str(future.exception())}")
+
+    def _shutdown_executor(self, timeout: float):
+        """
+        Shut down the service executor.
+
+        Services that are still running after the timeout are left to exit
+        on their own rather than blocking shutdown.
+
+        Args:
+            timeout: Seconds to wait for running services
+        """
+        if self.executor is None:
+            return
+        
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        wait(self._futures, timeout=timeout)
+        self.executor = None
+        self._futures = []
+
     @retry(max_attempts=3, delay_seconds=2)
     def _stop_components(self):
         """Stop all system components gracefully."""
@@ -765,6 +915,10 @@ class QuantumFlowBot:
             if hasattr(self.trading_engine, 'stop'):
                 self.trading_engine.stop()
             
+            # Write fee updates still queued by the fee calculator
+            if hasattr(self.fee_calculator, 'stop'):
+                self.fee_calculator.stop()
+            
             # Stop admin components
             if hasattr(self.dashboard_api, 'stop'):
                 self.dashboard_api.stop()
@@ -788,10 +942,8 @@ class QuantumFlowBot:
             if hasattr(self.system_monitor, 'stop'):
                 self.system_monitor.stop()
             
-            # Wait for all threads to finish
-            for thread in self.threads:
-                if thread.is_alive():
-                    thread.join(timeout=5.0)  # 5 second timeout
+            # Wait for all services to finish
+            self._shutdown_executor(timeout=5.0)
             
             self.running = False
             self.system_status = "stopped"
@@ -820,6 +972,7 @@ class QuantumFlowBot:
             # Stop other components that might be processing trades
             components_to_stop = [
                 self.app,
+                self.fee_calculator,
                 self.dashboard_api,
                 self.admin_bot,
                 self.telegram_bot,
@@ -833,10 +986,8 @@ class QuantumFlowBot:
                 elif hasattr(component, 'stop'):
                     component.stop()
                     
-            # Terminate threads if necessary after timeout
-            for thread in self.threads:
-                if thread.is_alive():
-                    thread.join(timeout=2.0)  # 2 second timeout
+            # Give services a moment to finish
+            self._shutdown_executor(timeout=2.0)
             
             self.running = False
             self.logger.warning("Emergency shutdown completed")
@@ -845,7 +996,12 @@ class QuantumFlowBot:
             self.logger.critical(f"Error during emergency shutdown: {str(e)}")
 
     def handle_shutdown_signal(self, signum, frame):
-        """Handle system shutdown signals (SIGINT, SIGTERM)."""
+        """
+        Handle system shutdown signals (SIGINT, SIGTERM).
+
+        Only flags the shutdown: stopping components here could interrupt
+        a database call on the main thread halfway through.
+        """
         signal_names = {
             signal.SIGINT: "SIGINT",
            signal.SIGTERM: "SIGTERM"
@@ -853,7 +1009,7 @@ class QuantumFlowBot:
         signal_name = signal_names.get(signum, f"signal {signum}")
        
         self.logger.info(f"Received {signal_name}, initiating shutdown...")
-        self.stop()
+        self._shutdown_event.set()
 
     def start(self):
        """Start the QuantumFlow Bot."""
@@ -904,9 +1060,9 @@ class QuantumFlowBot:
            # Start the bot
            self.start()
            
-           # Keep the main thread alive to allow SIGINT/SIGTERM to work
-           while self.running:
-               time.sleep(1)
+           # Keep the main thread alive until SIGINT/SIGTERM asks for shutdown
+           while self.running and not self._shutdown_event.wait(timeout=1):
+               pass
                
        except KeyboardInterrupt:
            self.logger.info("KeyboardInterrupt received, stopping...")
@@ -914,9 +1070,12 @@ class QuantumFlowBot:
            self.logger.critical(f"Unhandled exception in main loop: {str(e)}", exc_info=True)
            self._emergency_shutdown()
        finally:
-           # Ensure clean shutdown
-           if self.running:
-               self.stop()
+           # Ensure clean shutdown, then return every pooled connection
+           try:
+               if self.running:
+                   self.stop()
+           finally:
+               self.db_manager.close()
 
     def get_system_status(self) -> Dict[str, Any]:
        """Get the current system status and component health."""
@@ -53,24 +53,25 @@ class MarketAnalysis:
                 return 0
                 
             # Calculate liquidity as sum of bid/ask volume within 1% of mid price
-            bids = order_book['bids']
-            asks = order_book['asks']
+            # (levels may arrive as lists or as (N, 2) ndarrays)
+            bids = np.asarray(order_book['bids'], dtype=np.float64).reshape(-1, 2)
+            asks = np.asarray(order_book['asks'], dtype=np.float64).reshape(-1, 2)
             
-            if not bids or not asks:
+            if len(bids) == 0 or len(asks) == 0:
                 return 0
                 
-            mid_price = (float(bids[0][0]) + float(asks[0][0])) / 2
+            mid_price = (bids[0, 0] + asks[0, 0]) / 2
             
             # Calculate 1% range
             lower_bound = mid_price * 0.99
             upper_bound = mid_price * 1.01
             
             # Sum volumes within range
-            bid_volume = sum(float(bid[1]) for bid in bids if float(bid[0]) >= lower_bound)
-            ask_volume = sum(float(ask[1]) for ask in asks if float(ask[0]) <= upper_bound)
+            bid_volume = bids[bids[:, 0] >= lower_bound, 1].sum()
+            ask_volume = asks[asks[:, 0] <= upper_bound, 1].sum()
             
             # Total liquidity in base currency units
-            liquidity = bid_volume + ask_volume
+            liquidity = float(bid_volume + ask_volume)
             
             return liquidity
             
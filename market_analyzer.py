@@ -3,8 +3,9 @@
 import logging
 import numpy as np
 import time
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Callable
 from collections import defaultdict
+from functools import cached_property
 
 from exchange.abstract_exchange import AbstractExchange
 from analysis.technical_indicators import (
@@ -30,8 +31,19 @@ class MarketAnalyzer:
     """
     Market analysis system
     """
-    def __init__(self, exchange: AbstractExchange):
-        self.exchange = exchange
+    def __init__(self, exchange: Optional[AbstractExchange] = None,
+                 exchange_provider: Optional[Callable[[], AbstractExchange]] = None):
+        """
+        Initialize the market analyzer
+        
+        Args:
+            exchange: Exchange to read market data from
+            exchange_provider: Creates the exchange on first use when no
+                exchange is given
+        """
+        if exchange is not None:
+            self.exchange = exchange
+        self._exchange_provider = exchange_provider
         
         # Cache for market data
         self.data_cache = {}
@@ -49,6 +61,11 @@ class MarketAnalyzer:
         }
         
         logger.info("Market analyzer initialized")
+    
+    @cached_property
+    def exchange(self) -> Optional[AbstractExchange]:
+        """Exchange for market data, created by the provider on first use"""
+        return self._exchange_provider() if self._exchange_provider else None
         
     def analyze_market(self, symbol: str, timeframe: str = '1h') -> Dict[str, Any]:
         """
@@ -1,7 +1,7 @@
 # database/repository/position_repository.py
 import logging
 from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, func, case
 from datetime import datetime, timedelta
 from database.models.position import Position, PositionStatus, PositionSide
 
@@ -11,9 +11,20 @@ class PositionRepository:
     """
     Repository for Position model
     """
+    # Bumped on every committed write through any instance in this process,
+    # so callers can tell whether data they derived earlier may be stale
+    _revision = 0
+    
     def __init__(self, db):
         self.db = db
         
+    @classmethod
+    def revision(cls) -> int:
+        """
+        Get the write revision of the positions table as seen by this process
+        """
+        return cls._revision
+        
     def create_position(self, user_id: int, symbol: str, side: str, strategy: str,
                       entry_price: float, quantity: float, stop_loss: float = None,
                       take_profit: float = None) -> Position:
@@ -45,6 +56,7 @@ class PositionRepository:
             
             session.add(position)
             session.commit()
+            PositionRepository._revision += 1
             logger.info(f"Created new position with ID {position.id} for user {user_id}")
             return position
             
@@ -142,6 +154,7 @@ class PositionRepository:
                     setattr(position, key, value)
                     
             session.commit()
+            PositionRepository._revision += 1
             logger.info(f"Updated position with ID {position_id}")
             return True
             
@@ -173,6 +186,7 @@ class PositionRepository:
             position.current_quantity = new_quantity
             
             session.commit()
+            PositionRepository._revision += 1
             logger.info(f"Updated position size for ID {position_id}")
             return True
             
@@ -231,18 +245,26 @@ class PositionRepository:
         
     # Added missing methods that were causing errors in the logs
     
-    def get_all_active_positions(self) -> List[Position]:
+    def get_all_active_positions(self, order_by_user: bool = False) -> List[Position]:
         """
         Get all active positions across all users
         
+        Args:
+            order_by_user: Sort by user ID first, so each user's positions are contiguous
+        
         Returns:
-            List of Position objects with status=OPEN
+            List of Position objects with status=OPEN, newest first (per user if order_by_user)
         """
         session = self.db.get_session()
         try:
-            positions = session.query(Position).filter(
+            query = session.query(Position).filter(
                 Position.status == PositionStatus.OPEN
-            ).order_by(desc(Position.created_at)).all()
+            )
+            if order_by_user:
+                query = query.order_by(Position.user_id, desc(Position.created_at))
+            else:
+                query = query.order_by(desc(Position.created_at))
+            positions = query.all()
             return positions
         except Exception as e:
             logger.error(f"Error getting all active positions: {str(e)}")
@@ -250,6 +272,46 @@ class PositionRepository:
         finally:
             session.close()
     
+    def get_exposure_by_user(self) -> List[Tuple[int, int, float, float]]:
+        """
+        Get open-position exposure aggregated per user in a single query
+        
+        Returns:
+            List of (user_id, positions_count, exposure, potential_loss) rows. Exposure
+            is quantity * average entry price; potential loss is the loss if every
+            stop loss is hit, or the full exposure for positions without one
+        """
+        session = self.db.get_session()
+        try:
+            exposure = Position.current_quantity * Position.average_entry_price
+            stop_distance = case(
+                (Position.side == PositionSide.LONG, Position.average_entry_price - Position.stop_loss),
+                else_=Position.stop_loss - Position.average_entry_price
+            )
+            potential_loss = case(
+                (or_(Position.stop_loss.is_(None), Position.stop_loss == 0), exposure),
+                else_=func.greatest(stop_distance * Position.current_quantity, 0)
+            )
+            
+            rows = session.query(
+                Position.user_id,
+                func.count(Position.id),
+                func.sum(exposure),
+                func.sum(potential_loss)
+            ).filter(
+                Position.status == PositionStatus.OPEN
+            ).group_by(Position.user_id).all()
+            
+            return [
+                (user_id, positions_count, float(user_exposure or 0), float(user_loss or 0))
+                for user_id, positions_count, user_exposure, user_loss in rows
+            ]
+        except Exception as e:
+            logger.error(f"Error getting exposure by user: {str(e)}")
+            return []
+        finally:
+            session.close()
+    
     def get_positions_by_symbol(self, symbol: str, status: str = None) -> List[Position]:
         """
         Get positions by symbol, optionally filtered by status
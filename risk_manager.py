@@ -57,125 +57,209 @@ class RiskManager:
     def validate_signal(self, user, signal: TradeSignal) -> Optional[TradeSignal]:
         """Validate a trading signal against risk parameters"""
         try:
-            # Get trading settings
-            trading_manager = UserTradingManager(self.db)
-            settings = trading_manager.get_trading_settings(user.id)
-            
-            if not settings:
-                logger.warning(f"No trading settings found for user {user.id}, using defaults")
-                settings = {
-                    'trading_mode': 'paper',
-                    'risk_level': 'medium',
-                    'is_paused': False,
-                    'max_open_positions': 5,
-                    'max_position_size': 0.1
-                }
-            
-            # Check if trading is paused
-            if settings.get('is_paused', False):
-                logger.info(f"Signal rejected: Trading is paused for user {user.id}")
+            context = self._load_validation_context(user)
+            if context is None:
                 return None
             
-            # Check trading mode
-            trading_mode = settings.get('trading_mode', 'paper')
-            
-            # Get user risk state
-            risk_state = self._get_user_risk_state(user.id)
+            return self._validate_signal_in_context(user, signal, context)
             
-            # Check if trading is allowed
-            if not self._is_trading_allowed(user, risk_state):
-                logger.warning(f"Trading not allowed for user {user.id}")
-                return None
+        except Exception as e:
+            logger.error(f"Error validating signal for user {user.id}: {str(e)}")
+            return None
+
+    def validate_signals_batch(self, user, signals: List[TradeSignal]) -> List[TradeSignal]:
+        """
+        Validate all of a user's pending signals against one load of their risk context
+        
+        Settings, risk state, open position count and account balance are read once
+        for the batch instead of once per signal.
+        
+        Args:
+            user: User the signals belong to
+            signals: Signals to validate, in execution order
             
-            # For live trading, apply additional risk checks
-            if trading_mode == 'live':
-                # Check maximum open positions
-                position_repo = PositionRepository(self.db)
-                open_positions_count = position_repo.get_open_positions_count(user.id)
-                
-                if open_positions_count >= settings.get('max_open_positions', 5):
-                    logger.info(f"Signal rejected: Maximum open positions reached for user {user.id}")
-                    return None
-                
-                # Check position size against maximum allowed
-                max_position_size = settings.get('max_position_size', 0.1)
-                
-                # Calculate position size
-                exchange_factory = ExchangeFactory()
-                exchange = exchange_factory.create_exchange('binance', user)
-                
-                account_balance = exchange.get_account_balance()
-                position_value = signal.quantity * signal.price
-                position_size_percent = position_value / account_balance if account_balance > 0 else 1
-                
-                if position_size_percent > max_position_size:
-                    # Adjust position size to maximum allowed
-                    logger.info(f"Adjusting position size from {position_size_percent:.4f} to {max_position_size:.4f}")
-                    adjusted_quantity = (max_position_size * account_balance) / signal.price
-                    signal.quantity = adjusted_quantity
-            
-            # Check against market conditions
-            market_analyzer = MarketAnalyzer()
-            
-            # Check volatility
-            volatility = market_analyzer.get_current_volatility(signal.symbol)
-            max_allowed_volatility = self._get_max_volatility_for_risk_level(
-                settings.get('risk_level', 'medium')
-            )
+        Returns:
+            List of accepted (and possibly resized) signals, in input order
+        """
+        try:
+            context = self._load_validation_context(user)
+            if context is None:
+                return []
             
-            if volatility > max_allowed_volatility:
-                logger.info(
-                    f"Signal rejected: Market volatility too high for user's risk level "
-                    f"({volatility:.2f}% > {max_allowed_volatility:.2f}%)"
-                )
-                return None
+            validated = []
+            for signal in signals:
+                try:
+                    validated_signal = self._validate_signal_in_context(user, signal, context)
+                    if validated_signal:
+                        validated.append(validated_signal)
+                except Exception as e:
+                    logger.error(f"Error validating signal for user {user.id}: {str(e)}")
             
-            # Check liquidity
-            liquidity = market_analyzer.get_current_liquidity(signal.symbol)
-            min_required_liquidity = self._get_min_liquidity_for_position_size(position_value)
+            return validated
             
-            if liquidity < min_required_liquidity:
-                logger.info("Signal rejected: Insufficient market liquidity for position size")
-                return None
+        except Exception as e:
+            logger.error(f"Error validating signals for user {user.id}: {str(e)}")
+            return []
+
+    def _load_validation_context(self, user) -> Optional[Dict[str, Any]]:
+        """
+        Load the per-user state signal validation depends on
+        
+        Args:
+            user: User to load context for
             
-            # Calculate position size
-            position_size = self._calculate_position_size(user, signal, risk_state)
+        Returns:
+            Context dict, or None if the user may not trade right now
+        """
+        # Get trading settings
+        trading_manager = UserTradingManager(self.db)
+        settings = trading_manager.get_trading_settings(user.id)
+        
+        if not settings:
+            logger.warning(f"No trading settings found for user {user.id}, using defaults")
+            settings = {
+                'trading_mode': 'paper',
+                'risk_level': 'medium',
+                'is_paused': False,
+                'max_open_positions': 5,
+                'max_position_size': 0.1
+            }
+        
+        # Check if trading is paused
+        if settings.get('is_paused', False):
+            logger.info(f"Signal rejected: Trading is paused for user {user.id}")
+            return None
+        
+        # Get user risk state
+        risk_state = self._get_user_risk_state(user.id)
+        
+        # Check if trading is allowed
+        if not self._is_trading_allowed(user, risk_state):
+            logger.warning(f"Trading not allowed for user {user.id}")
+            return None
+        
+        context = {
+            'settings': settings,
+            'trading_mode': settings.get('trading_mode', 'paper'),
+            'risk_state': risk_state,
+            'market_analyzer': MarketAnalyzer()
+        }
+        
+        # Live trading checks need the open position count and account balance
+        if context['trading_mode'] == 'live':
+            position_repo = PositionRepository(self.db)
+            context['open_positions_count'] = position_repo.get_open_positions_count(user.id)
+            
+            exchange_factory = ExchangeFactory()
+            exchange = exchange_factory.create_exchange('binance', user)
+            context['account_balance'] = exchange.get_account_balance()
+        
+        return context
+
+    def _validate_signal_in_context(self, user, signal: TradeSignal, context: Dict[str, Any]) -> Optional[TradeSignal]:
+        """
+        Validate a single signal against a loaded validation context
+        
+        Args:
+            user: User the signal belongs to
+            signal: Signal to validate
+            context: Context from _load_validation_context; its open position
+                count and account balance are updated when a live signal is
+                accepted
             
-            if position_size <= 0:
-                logger.warning(f"Position size too small for user {user.id}")
+        Returns:
+            The validated signal, or None if rejected
+        """
+        settings = context['settings']
+        risk_state = context['risk_state']
+        
+        # For live trading, apply additional risk checks
+        if context['trading_mode'] == 'live':
+            # Check maximum open positions
+            if context['open_positions_count'] >= settings.get('max_open_positions', 5):
+                logger.info(f"Signal rejected: Maximum open positions reached for user {user.id}")
                 return None
             
-            # Set position size in signal
-            signal.quantity = position_size
-            
-            # Set stop loss and take profit
-            if not signal.stop_loss:
-                signal.stop_loss = self._calculate_stop_loss(
-                    signal, 
-                    settings.get('risk_level', 'medium')
-                )
-            
-            if not signal.take_profit:
-                signal.take_profit = self._calculate_take_profit(
-                    signal, 
-                    settings.get('risk_level', 'medium')
-                )
-            
-            # Check portfolio risk
-            if not self._check_portfolio_risk(user, signal, risk_state):
-                logger.warning(f"Signal rejected due to portfolio risk for user {user.id}")
-                return None
+            # Check position size against maximum allowed
+            max_position_size = settings.get('max_position_size', 0.1)
             
+            # Calculate position size
+            account_balance = context['account_balance']
+            position_value = signal.quantity * signal.price
+            position_size_percent = position_value / account_balance if account_balance > 0 else 1
+            
+            if position_size_percent > max_position_size:
+                # Adjust position size to maximum allowed
+                logger.info(f"Adjusting position size from {position_size_percent:.4f} to {max_position_size:.4f}")
+                adjusted_quantity = (max_position_size * account_balance) / signal.price
+                signal.quantity = adjusted_quantity
+        
+        # Check against market conditions
+        market_analyzer = context['market_analyzer']
+        
+        # Check volatility
+        volatility = market_analyzer.get_current_volatility(signal.symbol)
+        max_allowed_volatility = self._get_max_volatility_for_risk_level(
+            settings.get('risk_level', 'medium')
+        )
+        
+        if volatility > max_allowed_volatility:
             logger.info(
-                f"Validated signal for user {user.id}, "
-                f"symbol: {signal.symbol}, side: {signal.side}, "
-                f"quantity: {signal.quantity}"
+                f"Signal rejected: Market volatility too high for user's risk level "
+                f"({volatility:.2f}% > {max_allowed_volatility:.2f}%)"
             )
-            return signal
-            
-        except Exception as e:
-            logger.error(f"Error validating signal for user {user.id}: {str(e)}")
             return None
+        
+        # Check liquidity
+        liquidity = market_analyzer.get_current_liquidity(signal.symbol)
+        min_required_liquidity = self._get_min_liquidity_for_position_size(position_value)
+        
+        if liquidity < min_required_liquidity:
+            logger.info("Signal rejected: Insufficient market liquidity for position size")
+            return None
+        
+        # Calculate position size
+        position_size = self._calculate_position_size(user, signal, risk_state)
+        
+        if position_size <= 0:
+            logger.warning(f"Position size too small for user {user.id}")
+            return None
+        
+        # Set position size in signal
+        signal.quantity = position_size
+        
+        # Set stop loss and take profit
+        if not signal.stop_loss:
+            signal.stop_loss = self._calculate_stop_loss(
+                signal, 
+                settings.get('risk_level', 'medium')
+            )
+        
+        if not signal.take_profit:
+            signal.take_profit = self._calculate_take_profit(
+                signal, 
+                settings.get('risk_level', 'medium')
+            )
+        
+        # Check portfolio risk
+        if not self._check_portfolio_risk(user, signal, risk_state):
+            logger.warning(f"Signal rejected due to portfolio risk for user {user.id}")
+            return None
+        
+        # Later signals in the same batch count this one as an open position
+        # and size against the balance left after it
+        if context['trading_mode'] == 'live':
+            context['open_positions_count'] += 1
+            context['account_balance'] = max(
+                context['account_balance'] - signal.quantity * signal.price, 0
+            )
+        
+        logger.info(
+            f"Validated signal for user {user.id}, "
+            f"symbol: {signal.symbol}, side: {signal.side}, "
+            f"quantity: {signal.quantity}"
+        )
+        return signal
 
     def _get_max_volatility_for_risk_level(self, risk_level):
         """Get maximum allowed volatility based on risk level"""
@@ -0,0 +1,212 @@
+# analysis/strategy_metrics_cache.py
+import logging
+import os
+import pickle
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# strategy name -> (trade_count, win_count, profit_percentage_sum)
+DayTotals = Dict[str, Tuple[int, int, float]]
+
+class StrategyMetricsCache:
+    """
+    Disk-backed cache of per-day strategy trade totals
+
+    Each completed day is stored as one pickle file under the cache directory
+    and is only re-read from the database when one of its trades changes. The
+    current day is always queried, so a refresh is a small delta query instead
+    of a scan over the whole look-back window.
+    """
+    META_FILE = "_meta.pkl"
+    # Overlap when asking which days changed, to cover commit latency
+    SYNC_OVERLAP = timedelta(minutes=5)
+
+    def __init__(self, trade_repository, cache_dir: str = "cache/trades"):
+        """
+        Initialize the cache
+
+        Args:
+            trade_repository: Repository providing get_strategy_daily_totals()
+                and get_trade_days_updated_since()
+            cache_dir: Directory for the per-day cache files
+        """
+        self.trade_repo = trade_repository
+        self.cache_dir = cache_dir
+        self._days: Dict[date, DayTotals] = {}
+        self._synced_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+        self._load_meta()
+
+    def get_metrics(self, days: int = 30) -> Dict[str, Dict[str, float]]:
+        """
+        Get win rate, average profit and trade count per strategy
+
+        Args:
+            days: Look-back window in calendar days, including today
+
+        Returns:
+            Dict mapping strategy name to win_rate (%), avg_profit (%) and trade_count
+        """
+        with self._lock:
+            sync_started = datetime.utcnow()
+            today = sync_started.date()
+            window_start = today - timedelta(days=max(days, 1) - 1)
+            completed = [window_start + timedelta(days=offset) for offset in range((today - window_start).days)]
+
+            stale = self._stale_days(completed)
+            missing = [day for day in completed if day in stale or self._get_day(day) is None]
+
+            # One query from the oldest day that needs refreshing through today
+            fetch_start = missing[0] if missing else today
+            totals = self.trade_repo.get_strategy_daily_totals(datetime.combine(fetch_start, time.min))
+            if totals is None:
+                return {}
+
+            fetched: Dict[date, DayTotals] = {
+                fetch_start + timedelta(days=offset): {}
+                for offset in range((today - fetch_start).days + 1)
+            }
+            for day, strategy, trade_count, win_count, profit_sum in totals:
+                if day in fetched:
+                    fetched[day][strategy] = (trade_count, win_count, profit_sum)
+
+            for day, day_totals in fetched.items():
+                if day < today:
+                    self._days[day] = day_totals
+                    self._write_day(day, day_totals)
+
+            self._synced_at = sync_started
+            self._write_meta()
+            self._prune(window_start)
+
+            combined: Dict[str, List[float]] = {}
+            for day_totals in [self._days[day] for day in completed] + [fetched[today]]:
+                for strategy, (trade_count, win_count, profit_sum) in day_totals.items():
+                    entry = combined.setdefault(strategy, [0, 0, 0.0])
+                    entry[0] += trade_count
+                    entry[1] += win_count
+                    entry[2] += profit_sum
+
+            return {
+                strategy: {
+                    'win_rate': win_count / trade_count * 100,
+                    'avg_profit': profit_sum / trade_count,
+                    'trade_count': trade_count
+                }
+                for strategy, (trade_count, win_count, profit_sum) in combined.items()
+                if trade_count
+            }
+
+    def _stale_days(self, completed: List[date]) -> set:
+        """
+        Find cached days whose trades changed since the last sync
+
+        Args:
+            completed: Completed days in the window
+
+        Returns:
+            Set of days that must be re-queried
+        """
+        # Without a sync time the files on disk cannot be trusted
+        if self._synced_at is None:
+            return set(completed)
+
+        updated = self.trade_repo.get_trade_days_updated_since(self._synced_at - self.SYNC_OVERLAP)
+        if updated is None:
+            return set(completed)
+        return set(updated)
+
+    def _day_path(self, day: date) -> str:
+        return os.path.join(self.cache_dir, f"{day.isoformat()}.pkl")
+
+    def _get_day(self, day: date) -> Optional[DayTotals]:
+        """
+        Get a completed day's totals from memory or disk
+
+        Args:
+            day: Day to look up
+
+        Returns:
+            Day totals or None if the day is not cached
+        """
+        day_totals = self._days.get(day)
+        if day_totals is not None:
+            return day_totals
+
+        path = self._day_path(day)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                day_totals = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Error reading strategy metrics cache {path}: {str(e)}")
+            return None
+
+        self._days[day] = day_totals
+        return day_totals
+
+    def _write_day(self, day: date, day_totals: DayTotals) -> None:
+        self._write_file(self._day_path(day), day_totals)
+
+    def _load_meta(self) -> None:
+        path = os.path.join(self.cache_dir, self.META_FILE)
+        if not os.path.exists(path):
+            return
+
+        try:
+            with open(path, 'rb') as f:
+                self._synced_at = pickle.load(f).get('synced_at')
+        except Exception as e:
+            logger.warning(f"Error reading strategy metrics cache metadata: {str(e)}")
+
+    def _write_meta(self) -> None:
+        self._write_file(os.path.join(self.cache_dir, self.META_FILE), {'synced_at': self._synced_at})
+
+    def _write_file(self, path: str, data) -> None:
+        """
+        Atomically write a pickle file, logging rather than raising on failure
+
+        Args:
+            path: Destination path
+            data: Object to pickle
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Error writing strategy metrics cache {path}: {str(e)}")
+
+    def _prune(self, window_start: date) -> None:
+        """
+        Drop cached days that have left the look-back window
+
+        Args:
+            window_start: First day still in the window
+        """
+        for day in [day for day in self._days if day < window_start]:
+            del self._days[day]
+
+        try:
+            file_names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+
+        for file_name in file_names:
+            try:
+                day = date.fromisoformat(file_name[:-len(".pkl")])
+            except ValueError:
+                continue
+            if file_name.endswith(".pkl") and day < window_start:
+                try:
+                    os.remove(os.path.join(self.cache_dir, file_name))
+                except OSError:
+                    pass
@@ -10,9 +10,105 @@ import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict, Any, Optional
 import logging
+import time
+
+from analysis._njit import njit
 
 logger = logging.getLogger(__name__)
 
+# JIT-compiled recurrence kernels (plain NumPy loops when Numba is absent).
+# Each returns an all-NaN array when there is not enough data, matching the
+# NaN fallback of the public wrappers below.
+@njit(cache=True)
+def _ema_kernel(values: np.ndarray, period: int) -> np.ndarray:
+    n = values.shape[0]
+    ema = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return ema
+    
+    multiplier = 2.0 / (period + 1)
+    ema[period - 1] = values[:period].mean()
+    for i in range(period, n):
+        ema[i] = (values[i] * multiplier) + (ema[i - 1] * (1 - multiplier))
+    return ema
+
+@njit(cache=True)
+def _rsi_kernel(values: np.ndarray, period: int) -> np.ndarray:
+    n = values.shape[0]
+    rsi = np.full(n, np.nan)
+    if period < 1 or n <= period:
+        return rsi
+    
+    deltas = np.diff(values)
+    up = 0.0
+    down = 0.0
+    for delta in deltas[:period + 1]:
+        if delta >= 0:
+            up += delta
+        elif delta < 0:
+            down -= delta
+    up /= period
+    down /= period
+    
+    rsi[period] = 100.0 if down == 0 else 100.0 - (100.0 / (1.0 + up / down))
+    
+    for i in range(period + 1, n):
+        delta = deltas[i - 1]
+        if delta > 0:
+            upval = delta
+            downval = 0.0
+        else:
+            upval = 0.0
+            downval = -delta
+        
+        up = (up * (period - 1) + upval) / period
+        down = (down * (period - 1) + downval) / period
+        
+        rsi[i] = 100.0 if down == 0 else 100.0 - (100.0 / (1.0 + up / down))
+    return rsi
+
+@njit(cache=True)
+def _atr_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    n = high.shape[0]
+    atr = np.full(n, np.nan)
+    if period < 1 or n < period:
+        return atr
+    
+    tr = np.zeros(n)
+    tr[0] = high[0] - low[0]
+    for i in range(1, n):
+        tr[i] = max(
+            high[i] - low[i],
+            abs(high[i] - close[i - 1]),
+            abs(low[i] - close[i - 1])
+        )
+    
+    atr[period - 1] = tr[:period].mean()
+    for i in range(period, n):
+        atr[i] = ((period - 1) * atr[i - 1] + tr[i]) / period
+    return atr
+
+def warm_up_kernels() -> Dict[str, float]:
+    """
+    Compile (or load from the Numba cache) the indicator kernels ahead of real use
+    
+    Returns:
+        Dict mapping kernel name to seconds taken by its first call
+    """
+    sample = np.linspace(1.0, 2.0, 64)
+    kernels = (
+        ('ema', lambda: _ema_kernel(sample, 14)),
+        ('rsi', lambda: _rsi_kernel(sample, 14)),
+        ('atr', lambda: _atr_kernel(sample + 0.5, sample - 0.5, sample, 14)),
+    )
+    
+    timings = {}
+    for name, call in kernels:
+        started = time.perf_counter()
+        call()
+        timings[name] = time.perf_counter() - started
+    return timings
+
 # Core Technical Indicator Calculation Functions
 def calculate_sma(data: List[float], period: int) -> List[float]:
     """
@@ -51,19 +147,7 @@ def calculate_ema(data: List[float], period: int) -> List[float]:
         List of EMA values
     """
     try:
-        data_array = np.array(data)
-        ema = np.full_like(data_array, np.nan)
-        
-        # Calculate multiplier
-        multiplier = 2 / (period + 1)
-        
-        # Initial SMA
-        ema[period-1] = np.mean(data_array[:period])
-        
-        # Calculate EMA
-        for i in range(period, len(data_array)):
-            ema[i] = (data_array[i] * multiplier) + (ema[i-1] * (1 - multiplier))
-            
+        ema = _ema_kernel(np.asarray(data, dtype=np.float64), period)
         return ema.tolist()
     except Exception as e:
         logger.error(f"Error calculating EMA: {str(e)}")
@@ -81,45 +165,7 @@ def calculate_rsi(data: List[float], period: int = 14) -> List[float]:
         List of RSI values
     """
     try:
-        data_array = np.array(data)
-        rsi = np.full_like(data_array, np.nan)
-        
-        # Calculate price changes
-        deltas = np.diff(data_array)
-        seed = deltas[:period+1]
-        
-        # Calculate initial average gains and losses
-        up = seed[seed >= 0].sum() / period
-        down = -seed[seed < 0].sum() / period
-        
-        if down == 0:
-            # Avoid division by zero
-            rsi[period] = 100
-        else:
-            rs = up / down
-            rsi[period] = 100 - (100 / (1 + rs))
-            
-        # Calculate RSI values
-        for i in range(period + 1, len(data_array)):
-            delta = deltas[i - 1]
-            
-            if delta > 0:
-                upval = delta
-                downval = 0
-            else:
-                upval = 0
-                downval = -delta
-                
-            up = (up * (period - 1) + upval) / period
-            down = (down * (period - 1) + downval) / period
-            
-            if down == 0:
-                # Avoid division by zero
-                rsi[i] = 100
-            else:
-                rs = up / down
-                rsi[i] = 100 - (100 / (1 + rs))
-                
+        rsi = _rsi_kernel(np.asarray(data, dtype=np.float64), period)
         return rsi.tolist()
     except Exception as e:
         logger.error(f"Error calculating RSI: {str(e)}")
@@ -203,33 +249,12 @@ def calculate_atr(high: List[float], low: List[float], close: List[float], perio
         List of ATR values
     """
     try:
-        high_array = np.array(high)
-        low_array = np.array(low)
-        close_array = np.array(close)
-        
-        # Calculate true range
-        tr = np.zeros(len(high_array))
-        
-        for i in range(1, len(tr)):
-            tr[i] = max(
-                high_array[i] - low_array[i],
-                abs(high_array[i] - close_array[i-1]),
-                abs(low_array[i] - close_array[i-1])
-            )
-            
-        # First value uses high - low
-        tr[0] = high_array[0] - low_array[0]
-        
-        # Calculate ATR using EMA
-        atr = np.full_like(tr, np.nan)
-        
-        # Initial ATR (simple average of first period true ranges)
-        atr[period-1] = np.mean(tr[:period])
-        
-        # Calculate ATR using smoothing formula
-        for i in range(period, len(tr)):
-            atr[i] = ((period - 1) * atr[i-1] + tr[i]) / period
-            
+        atr = _atr_kernel(
+            np.asarray(high, dtype=np.float64),
+            np.asarray(low, dtype=np.float64),
+            np.asarray(close, dtype=np.float64),
+            period
+        )
         return atr.tolist()
     except Exception as e:
         logger.error(f"Error calculating ATR: {str(e)}")
@@ -1,19 +1,37 @@
 # database/repository/trade_repository.py
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from sqlalchemy import func, desc, and_
+from collections import namedtuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, desc, and_, insert
 from database.models.trade import Trade, TradeStatus, TradeSide
 
 logger = logging.getLogger(__name__)
 
+# Positional trade record in add_trade argument order, used for buffered bulk inserts
+TradeRow = namedtuple('TradeRow', [
+    'user_id', 'strategy_name', 'symbol', 'side', 'entry_price', 'quantity',
+    'take_profit', 'stop_loss', 'trade_id', 'timestamp'
+])
+
 class TradeRepository:
     """
     Repository for Trade model
     """
+    # Bumped on every committed write through any instance in this process,
+    # so callers can tell whether data they derived earlier may be stale
+    _revision = 0
+    
     def __init__(self, db):
         self.db = db
         
+    @classmethod
+    def revision(cls) -> int:
+        """
+        Get the write revision of the trades table as seen by this process
+        """
+        return cls._revision
+        
     def add_trade(self, user_id: int, strategy_name: str, symbol: str, side: str, 
                  entry_price: float, quantity: float, take_profit: float = None, 
                  stop_loss: float = None, trade_id: str = None, timestamp: int = None) -> Trade:
@@ -49,6 +67,7 @@ class TradeRepository:
             
             session.add(trade)
             session.commit()
+            TradeRepository._revision += 1
             logger.info(f"Added new trade with ID {trade.id} for user {user_id}")
             return trade
             
@@ -59,6 +78,63 @@ class TradeRepository:
         finally:
             session.close()
             
+    def add_trades_bulk(self, trades: List[Sequence[Any]]) -> int:
+        """
+        Add many trades with a single multi-row INSERT
+        
+        Args:
+            trades: TradeRow tuples (or plain sequences in the same order, the
+                positional arguments of add_trade)
+            
+        Returns:
+            Number of trades inserted; 0 if the batch failed and was rolled back
+        """
+        if not trades:
+            return 0
+            
+        rows = []
+        for (user_id, strategy_name, symbol, side, entry_price, quantity,
+             take_profit, stop_loss, trade_id, timestamp) in trades:
+            try:
+                trade_side = TradeSide(side.lower())
+            except ValueError:
+                logger.error(f"Invalid trade side: {side}")
+                continue
+                
+            rows.append({
+                'user_id': user_id,
+                'strategy': strategy_name,
+                'symbol': symbol,
+                'side': trade_side,
+                'price': entry_price,
+                'quantity': quantity,
+                'amount': entry_price * quantity,
+                'stop_loss': stop_loss,
+                'take_profit': take_profit,
+                'exchange_trade_id': trade_id,
+                'created_at': datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+            })
+            
+        if not rows:
+            return 0
+            
+        session = self.db.get_session()
+        try:
+            # A list of parameter sets runs as one executemany, which the
+            # psycopg2 dialect sends as batched multi-row VALUES statements
+            session.execute(insert(Trade), rows)
+            session.commit()
+            TradeRepository._revision += 1
+            logger.info(f"Added {len(rows)} trades in bulk")
+            return len(rows)
+            
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error adding trades in bulk: {str(e)}")
+            return 0
+        finally:
+            session.close()
+            
     def get_trade_by_id(self, trade_id: int) -> Optional[Trade]:
         """
         Get trade by ID
@@ -91,6 +167,65 @@ class TradeRepository:
         finally:
             session.close()
             
+    def has_other_profitable_trade(self, user_id: int, exclude_trade_id: int) -> bool:
+        """
+        Check whether a user has any profitable trade other than the given one
+        
+        Args:
+            user_id: User ID
+            exclude_trade_id: Trade ID to ignore
+            
+        Returns:
+            True if such a trade exists
+        """
+        session = self.db.get_session()
+        try:
+            query = session.query(Trade.id).filter(
+                Trade.user_id == user_id,
+                Trade.profit > 0,
+                Trade.id != exclude_trade_id
+            )
+            return session.query(query.exists()).scalar()
+        except Exception as e:
+            logger.error(f"Error checking profitable trades for user {user_id}: {str(e)}")
+            raise
+        finally:
+            session.close()
+            
+    def get_profitable_trade_summary(self, user_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        """
+        Get the number of profitable trades per user, with the lowest such trade ID
+        
+        A user has a profitable trade other than trade T exactly when their count
+        is above one, or is one and the reported ID is not T.
+        
+        Args:
+            user_ids: User IDs
+            
+        Returns:
+            Dict mapping user ID to (profitable_trade_count, min_profitable_trade_id);
+            users without profitable trades are omitted
+        """
+        if not user_ids:
+            return {}
+            
+        session = self.db.get_session()
+        try:
+            rows = session.query(
+                Trade.user_id,
+                func.count(Trade.id),
+                func.min(Trade.id)
+            ).filter(
+                Trade.user_id.in_(list(user_ids)),
+                Trade.profit > 0
+            ).group_by(Trade.user_id).all()
+            return {user_id: (trade_count, min_trade_id) for user_id, trade_count, min_trade_id in rows}
+        except Exception as e:
+            logger.error(f"Error getting profitable trade summary: {str(e)}")
+            raise
+        finally:
+            session.close()
+            
     def get_open_trades_by_user(self, user_id: int) -> List[Trade]:
         """
         Get open trades by user ID
@@ -162,6 +297,7 @@ class TradeRepository:
                     setattr(trade, key, value)
                     
             session.commit()
+            TradeRepository._revision += 1
             logger.info(f"Updated trade with ID {trade_id}")
             return True
             
@@ -334,6 +470,112 @@ class TradeRepository:
         finally:
             session.close()
             
+    def get_strategy_metrics_since_days(self, days: int = 30) -> Dict[str, Dict[str, float]]:
+        """
+        Get win rate, average profit and trade count per strategy in a single query
+        
+        Args:
+            days: Look-back window in days
+            
+        Returns:
+            Dict mapping strategy name to win_rate (%), avg_profit (%) and trade_count,
+            over trades with a recorded profit percentage
+        """
+        session = self.db.get_session()
+        try:
+            since = datetime.utcnow() - timedelta(days=days)
+            rows = session.query(
+                Trade.strategy,
+                func.count(Trade.id),
+                func.count(Trade.id).filter(Trade.profit_percentage > 0),
+                func.avg(Trade.profit_percentage)
+            ).filter(
+                Trade.created_at >= since,
+                Trade.profit_percentage.isnot(None)
+            ).group_by(Trade.strategy).all()
+            
+            return {
+                strategy: {
+                    'win_rate': win_count / trade_count * 100,
+                    'avg_profit': float(avg_profit),
+                    'trade_count': trade_count
+                }
+                for strategy, trade_count, win_count, avg_profit in rows
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting strategy metrics: {str(e)}")
+            return {}
+        finally:
+            session.close()
+            
+    def get_strategy_daily_totals(self, start: datetime, end: Optional[datetime] = None) -> Optional[List[Tuple[date, str, int, int, float]]]:
+        """
+        Get per-day, per-strategy trade totals for trades created in a time range
+        
+        Args:
+            start: Inclusive lower bound on trade creation time
+            end: Exclusive upper bound on trade creation time (optional)
+            
+        Returns:
+            List of (day, strategy, trade_count, win_count, profit_percentage_sum) tuples,
+            over trades with a recorded profit percentage, or None if the query failed
+        """
+        session = self.db.get_session()
+        try:
+            day = func.date(Trade.created_at)
+            query = session.query(
+                day,
+                Trade.strategy,
+                func.count(Trade.id),
+                func.count(Trade.id).filter(Trade.profit_percentage > 0),
+                func.sum(Trade.profit_percentage)
+            ).filter(
+                Trade.created_at >= start,
+                Trade.profit_percentage.isnot(None)
+            )
+            if end is not None:
+                query = query.filter(Trade.created_at < end)
+                
+            return [
+                # SQLite returns DATE() as an ISO string, PostgreSQL as a date
+                (date.fromisoformat(trade_day) if isinstance(trade_day, str) else trade_day,
+                 strategy, trade_count, win_count, float(profit_sum))
+                for trade_day, strategy, trade_count, win_count, profit_sum
+                in query.group_by(day, Trade.strategy).all()
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error getting strategy daily totals: {str(e)}")
+            return None
+        finally:
+            session.close()
+            
+    def get_trade_days_updated_since(self, since: datetime) -> Optional[List[date]]:
+        """
+        Get the creation days of trades modified since a point in time
+        
+        Args:
+            since: Modification time lower bound
+            
+        Returns:
+            List of distinct creation days, or None if the query failed
+        """
+        session = self.db.get_session()
+        try:
+            day = func.date(Trade.created_at)
+            rows = session.query(day).filter(Trade.updated_at >= since).distinct().all()
+            return [
+                date.fromisoformat(trade_day) if isinstance(trade_day, str) else trade_day
+                for trade_day, in rows
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error getting updated trade days: {str(e)}")
+            return None
+        finally:
+            session.close()
+            
     def mark_fee_collected(self, trade_id: int, fee_amount: float, referral_fee_amount: float = 0) -> bool:
         """
         Mark trade fee as collected
@@ -64,6 +64,7 @@ class User(Base):
     # Referral data
     referrer_id = Column(Integer, ForeignKey('users.id'), nullable=True)
     referral_code = Column(String(20), unique=True, nullable=True)
+    first_profit_recorded = Column(Boolean, default=False)  # Set after a referred user's first fee-recorded profit
    
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
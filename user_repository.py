@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy import or_, text, inspect
 from datetime import datetime
 from database.models.user import User, RiskLevel, TradingMode
+from database.models.api_key import ApiKey
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,7 @@ class UserRepository:
             
             # Cache column existence for future queries
             for col_name in ["is_admin", "is_active", "is_paused", "kyc_verified", 
-                            "trading_mode", "risk_level"]:
+                            "trading_mode", "risk_level", "first_profit_recorded"]:
                 self._column_cache[col_name] = col_name in columns
                 
                 if col_name not in columns:
@@ -155,6 +156,25 @@ class UserRepository:
         finally:
             session.close()
     
+    def get_users_by_ids(self, user_ids: List[int]) -> List[User]:
+        """
+        Get many users by ID in a single query
+        """
+        if not self.db:
+            logger.error("Database manager not initialized")
+            return []
+        if not user_ids:
+            return []
+        
+        session = self.db.get_session()
+        try:
+            return session.query(User).filter(User.id.in_(list(user_ids))).all()
+        except Exception as e:
+            logger.error(f"Error getting users by IDs: {str(e)}")
+            return []
+        finally:
+            session.close()
+    
     def get_all_users(self) -> List[User]:
         """
         Get all users with comprehensive error handling
@@ -192,7 +212,7 @@ class UserRepository:
             for key, value in kwargs.items():
                 if hasattr(user, key):
                     # Skip updating columns that don't exist in database
-                    if key not in ["is_admin", "is_active", "is_paused"] or self._has_column(key):
+                    if key not in ["is_admin", "is_active", "is_paused", "first_profit_recorded"] or self._has_column(key):
                         setattr(user, key, value)
                     
             session.commit()
@@ -705,5 +725,45 @@ class UserRepository:
         except Exception as e:
             logger.error(f"Error getting users with trading settings: {str(e)}")
             return []
+        finally:
+            session.close()
+            
+    def get_users_with_keys(self, user_ids: List[int]) -> List[Tuple[int, Optional[str], str, str]]:
+        """
+        Get preferred exchange and encrypted API credentials for many users at once
+        
+        Users and their configured API keys are joined in a single query instead
+        of one user lookup plus one key lookup per user.
+        
+        Args:
+            user_ids: User IDs to look up
+            
+        Returns:
+            List of (user_id, preferred_exchange, encrypted_api_key, encrypted_api_secret)
+            tuples; users without a configured API key are omitted
+        """
+        if not self.db:
+            logger.error("Database manager not initialized")
+            return []
+        if not user_ids:
+            return []
+            
+        session = self.db.get_session()
+        try:
+            rows = session.query(
+                User.id,
+                User.preferred_exchange,
+                ApiKey.encrypted_api_key,
+                ApiKey.encrypted_api_secret
+            ).join(
+                ApiKey, ApiKey.id == User.api_key_id
+            ).filter(
+                User.id.in_(list(user_ids))
+            ).all()
+            
+            return [tuple(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error getting users with API keys: {str(e)}")
+            return []
         finally:
             session.close()
\ No newline at end of file
@@ -5,6 +5,15 @@ from typing import Dict, Any, Optional
 class UserTradingManager:
     """Manages user trading settings including mode switching"""
     
+    # Settings used when a user has no user_trading_settings record
+    DEFAULT_SETTINGS = {
+        'trading_mode': 'paper',
+        'risk_level': 'medium',
+        'is_paused': False,
+        'max_open_positions': 5,
+        'max_position_size': 0.1
+    }
+    
     def __init__(self, db):
         self.db = db
         self.logger = logging.getLogger(__name__)
@@ -185,22 +194,10 @@ class UserTradingManager:
             result = cursor.fetchone()
             
             if result:
-                return {
-                    'trading_mode': result[0],
-                    'risk_level': result[1],
-                    'is_paused': result[2],
-                    'max_open_positions': result[3],
-                    'max_position_size': result[4]
-                }
+                return self._settings_from_row(result)
             else:
                 # Return default settings if no record exists
-                return {
-                    'trading_mode': 'paper',
-                    'risk_level': 'medium',
-                    'is_paused': False,
-                    'max_open_positions': 5,
-                    'max_position_size': 0.1
-                }
+                return dict(self.DEFAULT_SETTINGS)
                 
         except Exception as e:
             self.logger.error(f"Error getting trading settings: {e}")
@@ -211,6 +208,50 @@ class UserTradingManager:
             if 'conn' in locals() and conn:
                 self.db.release_connection(conn)
     
+    def get_trading_settings_bulk(self, user_ids):
+        """Get trading settings for many users in a single query"""
+        if not user_ids:
+            return {}
+            
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT user_id, trading_mode, risk_level, is_paused, max_open_positions, max_position_size
+                FROM user_trading_settings
+                WHERE user_id = ANY(%s)
+            """, (list(user_ids),))
+            
+            settings = {row[0]: self._settings_from_row(row[1:]) for row in cursor.fetchall()}
+            
+            # Users without a record get the default settings
+            for user_id in user_ids:
+                if user_id not in settings:
+                    settings[user_id] = dict(self.DEFAULT_SETTINGS)
+                    
+            return settings
+                
+        except Exception as e:
+            self.logger.error(f"Error getting bulk trading settings: {e}")
+            return None
+        finally:
+            if 'cursor' in locals() and cursor:
+                cursor.close()
+            if 'conn' in locals() and conn:
+                self.db.release_connection(conn)
+    
+    @staticmethod
+    def _settings_from_row(row):
+        """Map a (trading_mode, risk_level, is_paused, max_open_positions, max_position_size) row"""
+        return {
+            'trading_mode': row[0],
+            'risk_level': row[1],
+            'is_paused': row[2],
+            'max_open_positions': row[3],
+            'max_position_size': row[4]
+        }
+    
     def update_position_limits(self, user_id, max_positions=None, max_size=None):
         """Update position limits for a user"""
         try: